@@ -0,0 +1,42 @@
+"""Deterministic local stand-ins for the embedding model and LLM used by the benchmarks."""
+
+import hashlib
+import math
+from collections import Counter
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import FakeListChatModel
+
+from src.vector_store.bm25_index import tokenize
+
+
+class HashingEmbedding(Embeddings):
+    """Bag-of-words feature hashing into a fixed number of dimensions.
+
+    Unlike a random fake embedding, texts sharing words get similar vectors,
+    so recall measured with it reflects the retrieval pipeline rather than noise.
+    """
+
+    def __init__(self, size: int = 256):
+        self.size = size
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed(text)
+
+    def _embed(self, text):
+        vector = [0.0] * self.size
+        for token, count in Counter(tokenize(text)).items():
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self.size
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[index] += sign * (1.0 + math.log(count))
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+
+def stub_chat_model() -> FakeListChatModel:
+    """Chat model that streams a canned answer without any network access."""
+    return FakeListChatModel(responses=["This is a canned benchmark answer about the Technology Radar."])
@@ -0,0 +1,239 @@
+"""Offline benchmark of ingestion, retrieval and the chat path.
+
+Uses the radar PDFs in the data directory, a deterministic hashing embedding
+and a stub LLM, so it needs no network access and repeated runs on the same
+machine are comparable. Measures PDF loading with and without the text
+cache, chunking throughput of both processors, seeding throughput into a
+temporary VectorStore, and retrieval latency and recall@k for every retrieval mode against the labelled questions
+in benchmarks/questions.json. Results are written to a JSON file; pass
+--baseline to print the change against an earlier run.
+
+Run using this command:
+    python -m benchmarks.offline_benchmark --repeat 3 --k 4
+"""
+
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.fakes import HashingEmbedding, stub_chat_model
+from config import RAW_DATA_DIR, RERANK_FETCH_K, ROOT_DIR
+from src.data_ingestion.doc_processor_with_metadata import DocProcessorWithMetadata
+from src.data_ingestion.document_loader import DocumentLoader
+from src.data_ingestion.document_processor import DocumentProcessor
+from src.retrieval.reranker import LexicalScorer, RerankingRetriever
+from src.utils.logger import logger
+from src.vector_store.blip_index import normalize_name
+from src.vector_store.ingest_manifest import iter_chunk_ids
+from src.vector_store.vector_store import VectorStore
+
+QUESTIONS_PATH = Path(__file__).with_name("questions.json")
+RESULTS_DIR = Path(__file__).with_name("results")
+
+
+def timed(func):
+    """Return (result, elapsed milliseconds) of calling `func`."""
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def summarize(samples_ms):
+    samples = np.asarray(samples_ms)
+    return {
+        "mean_ms": round(float(samples.mean()), 3),
+        "p50_ms": round(float(np.percentile(samples, 50)), 3),
+        "p95_ms": round(float(np.percentile(samples, 95)), 3),
+    }
+
+
+def benchmark_loading(repeat):
+    """Time cold loads, parsing every PDF, and warm loads served from the PDF text cache."""
+    loader = DocumentLoader(str(RAW_DATA_DIR), text_cache_dir=None)
+    results = {}
+    for mode, parallel in (("serial", False), ("parallel", True)):
+        samples = [timed(lambda parallel=parallel: loader.load_radar_files(parallel=parallel))[1] for _ in range(repeat)]
+        results[mode] = summarize(samples)
+    with tempfile.TemporaryDirectory() as text_cache_dir:
+        cached_loader = DocumentLoader(str(RAW_DATA_DIR), text_cache_dir=text_cache_dir)
+        cached_loader.load_radar_files()
+        results["cached"] = summarize([timed(cached_loader.load_radar_files)[1] for _ in range(repeat)])
+    docs = loader.load_radar_files()
+    results["documents"] = len(docs)
+    results["characters"] = sum(len(doc.page_content) for doc in docs)
+    return docs, results
+
+
+def benchmark_chunking(docs, repeat):
+    results = {}
+    for processor_type, processor in (
+        ("vector_basic", DocumentProcessor()),
+        ("vector_with_metadata", DocProcessorWithMetadata()),
+    ):
+        samples = []
+        for _ in range(repeat):
+            chunks, elapsed_ms = timed(lambda processor=processor: processor.chunk_pdfs(docs))
+            samples.append(elapsed_ms)
+        results[processor_type] = {
+            **summarize(samples),
+            "chunks": len(chunks),
+            "chunks_per_second": round(len(chunks) / (np.median(samples) / 1000), 1),
+        }
+    return results
+
+
+def benchmark_seeding(store, chunks):
+    ingest_params = {"processor_type": "vector_with_metadata", "chunk_size": 1000, "chunk_overlap": 200}
+    _, create_ms = timed(lambda: store.create(iter_chunk_ids(chunks, **ingest_params), **ingest_params))
+    _, noop_sync_ms = timed(lambda: store.sync(iter_chunk_ids(chunks, **ingest_params), **ingest_params))
+    return {
+        "chunks": len(chunks),
+        "create_ms": round(create_ms, 1),
+        "chunks_per_second": round(len(chunks) / (create_ms / 1000), 1),
+        "noop_sync_ms": round(noop_sync_ms, 1),
+    }
+
+
+def is_relevant(doc, question):
+    """A chunk is relevant when it mentions the expected blip in the expected volume."""
+    name = f" {normalize_name(question['expected'])} "
+    return name in f" {normalize_name(doc.page_content)} " and doc.metadata.get("volume") in ("", question["volume"])
+
+
+def benchmark_retriever(retriever, questions, k, repeat):
+    samples, hits, reciprocal_ranks = [], 0, []
+    for question in questions:
+        for _ in range(repeat):
+            docs, elapsed_ms = timed(lambda question=question: retriever.invoke(question["question"]))
+            samples.append(elapsed_ms)
+        ranks = [rank for rank, doc in enumerate(docs[:k], start=1) if is_relevant(doc, question)]
+        hits += bool(ranks)
+        reciprocal_ranks.append(1 / ranks[0] if ranks else 0.0)
+    return {
+        **summarize(samples),
+        f"recall@{k}": round(hits / len(questions), 3),
+        "mrr": round(float(np.mean(reciprocal_ranks)), 3),
+    }
+
+
+def benchmark_retrieval(store, questions, k, repeat):
+    retrievers = {
+        "vector": lambda: store.get_retriever(mode=VectorStore.VECTOR, k=k),
+        "hybrid": lambda: store.get_retriever(mode=VectorStore.HYBRID, k=k),
+        "rerank": lambda: RerankingRetriever(
+            base_retriever=store.get_retriever(mode=VectorStore.VECTOR, k=RERANK_FETCH_K),
+            scorer=LexicalScorer(),
+            k=k,
+        ),
+    }
+    results = {}
+    for backend in (VectorStore.CHROMA, VectorStore.NUMPY):
+        store.backend = backend
+        for mode, build in retrievers.items():
+            results[f"{backend}/{mode}"] = benchmark_retriever(build(), questions, k, repeat)
+    store.backend = VectorStore.CHROMA
+    return results
+
+
+def benchmark_chat(store, questions, repeat):
+    # Imported here so the rest of the suite runs without the UI dependencies.
+    from src.chat.chatbot import ChatBot  # noqa: PLC0415
+
+    chatbot = ChatBot(vector_store=store, llm=stub_chat_model())
+    chatbot.query_router = None
+    chatbot.answer_cache = None
+    samples = [
+        timed(lambda question=question: chatbot.chat(question["question"], []))[1]
+        for question in questions
+        for _ in range(repeat)
+    ]
+    return summarize(samples)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def flatten(results, prefix=""):
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, int | float) and not isinstance(value, bool):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(results, baseline_path):
+    baseline = flatten(json.loads(Path(baseline_path).read_text(encoding="utf-8")))
+    logger.info(f"Change against {baseline_path}:")
+    for key, value in flatten({k: v for k, v in results.items() if k != "params"}).items():
+        previous = baseline.get(key)
+        if previous:
+            logger.info(f"    {key:<55} {previous:>12g} -> {value:<12g} ({(value - previous) / previous:+.1%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="iterations per measurement")
+    parser.add_argument("--k", type=int, default=4, help="chunks retrieved per question")
+    parser.add_argument("--output", type=Path, help="results file (default: benchmarks/results/offline_<time>.json)")
+    parser.add_argument("--baseline", type=Path, help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    questions = json.loads(QUESTIONS_PATH.read_text(encoding="utf-8"))
+    started_at = datetime.now(UTC)
+    logging.disable(logging.INFO)
+    try:
+        docs, loading = benchmark_loading(args.repeat)
+        chunking = benchmark_chunking(docs, args.repeat)
+        with tempfile.TemporaryDirectory() as persist_directory:
+            store = VectorStore(
+                collection_name="benchmark",
+                persist_directory=persist_directory,
+                embedding_model=HashingEmbedding(),
+            )
+            seeding = benchmark_seeding(store, DocProcessorWithMetadata().chunk_pdfs(docs))
+            retrieval = benchmark_retrieval(store, questions, args.k, args.repeat)
+            chat = benchmark_chat(store, questions, args.repeat)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    results = {
+        "started_at": started_at.isoformat(),
+        "git_commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "params": {"repeat": args.repeat, "k": args.k, "questions": len(questions)},
+        "loading": loading,
+        "chunking": chunking,
+        "seeding": seeding,
+        "retrieval": retrieval,
+        "chat": chat,
+    }
+    output = args.output or RESULTS_DIR / f"offline_{started_at:%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    logger.info(json.dumps(results, indent=2))
+    logger.info(f"Wrote benchmark results to {output}")
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Micro-benchmark of radar PDF parsing in DocProcessorWithMetadata.
+
+Times cleanup, blip metadata extraction, splitting and the full chunk_pdfs
+call for every volume in the data directory. PDF extraction is done once up
+front and is not part of the measurement.
+
+Run using this command:
+    python -m benchmarks.parse_benchmark --repeat 20
+"""
+
+import argparse
+import logging
+import time
+
+from config import RAW_DATA_DIR
+from src.data_ingestion.doc_processor_with_metadata import DocProcessorWithMetadata
+from src.data_ingestion.document_loader import DocumentLoader
+from src.utils.logger import logger
+
+
+def time_ms(func, repeat):
+    logging.disable(logging.INFO)
+    try:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - start) / repeat * 1000
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def benchmark_volume(processor, doc, repeat):
+    base_metadata = processor._process_base_metadata(doc.metadata)
+    cleaned = processor._cleanup_page_content(doc.page_content)
+    return {
+        "volume": base_metadata["volume"],
+        "characters": len(doc.page_content),
+        "blips": len(processor._process_metadata(cleaned, base_metadata)),
+        "cleanup_ms": time_ms(lambda: processor._cleanup_page_content(doc.page_content), repeat),
+        "metadata_ms": time_ms(lambda: processor._process_metadata(cleaned, base_metadata), repeat),
+        "split_ms": time_ms(lambda: processor.split_using_lib(cleaned), repeat),
+        "chunk_pdfs_ms": time_ms(lambda: processor.chunk_pdfs([doc]), repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="iterations per measurement")
+    args = parser.parse_args()
+
+    docs = DocumentLoader(str(RAW_DATA_DIR)).load_radar_files()
+    processor = DocProcessorWithMetadata()
+    processor.chunk_pdfs(docs[:1])  # warm up the splitter
+
+    logger.info("volume  chars    blips  cleanup  metadata  split    chunk_pdfs (ms)")
+    for doc in docs:
+        result = benchmark_volume(processor, doc, args.repeat)
+        logger.info(
+            "%-6s  %-7d  %-5d  %-7.2f  %-8.2f  %-7.2f  %.2f",
+            result["volume"], result["characters"], result["blips"], result["cleanup_ms"],
+            result["metadata_ms"], result["split_ms"], result["chunk_pdfs_ms"],
+        )
+
+
+if __name__ == "__main__":
+    main()
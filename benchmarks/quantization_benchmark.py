@@ -0,0 +1,126 @@
+"""Recall against memory of the quantized numpy index on the bundled radar PDFs.
+
+Chunks the radar PDFs in the data directory, embeds them with a deterministic
+hashing embedding (or the configured model with --real-embeddings), and
+exports one numpy index per quantization mode. Every labelled question in
+benchmarks/questions.json, plus a sample of chunk texts, is searched in each
+index; recall@k is measured against exact float32 search, next to the bytes
+the scoring pass keeps resident and the search latency. Results are written
+to a JSON file.
+
+Run using this command:
+    python -m benchmarks.quantization_benchmark --k 4 --rescore-factors 1 2 4 8
+"""
+
+import argparse
+import json
+import logging
+import random
+import tempfile
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+from benchmarks.fakes import HashingEmbedding
+from benchmarks.offline_benchmark import (
+    QUESTIONS_PATH,
+    RESULTS_DIR,
+    git_commit,
+    summarize,
+)
+from config import RAW_DATA_DIR
+from src.data_ingestion.doc_processor_with_metadata import DocProcessorWithMetadata
+from src.data_ingestion.document_loader import DocumentLoader
+from src.utils.logger import logger
+from src.vector_store.numpy_store import NumpyVectorStore
+
+
+def search_ids(store, query_vectors, k):
+    """Return the IDs found for each query and the search latencies in milliseconds."""
+    found, samples = [], []
+    for vector in query_vectors:
+        start = time.perf_counter()
+        results = store.similarity_search_by_vector_with_score(vector, k=k)
+        samples.append((time.perf_counter() - start) * 1000)
+        found.append([doc.id for doc, _ in results])
+    return found, samples
+
+
+def benchmark_store(store, query_vectors, exact, k, rescore_factors):
+    if store.quantizer is None:
+        _, samples = search_ids(store, query_vectors, k)
+        return {"scoring_bytes": int(store.matrix.nbytes), **summarize(samples)}
+
+    results = {"scoring_bytes": int(store.quantizer.nbytes)}
+    for factor in rescore_factors:
+        store.rescore_factor = factor
+        found, samples = search_ids(store, query_vectors, k)
+        hits = sum(len(set(ids) & set(truth)) for ids, truth in zip(found, exact, strict=True))
+        results[f"rescore_x{factor}"] = {
+            f"recall@{k}": round(hits / sum(len(truth) for truth in exact), 3),
+            **summarize(samples),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--k", type=int, default=4, help="chunks retrieved per query")
+    parser.add_argument("--rescore-factors", type=int, nargs="+", default=[1, 2, 4, 8], help="shortlist sizes as multiples of k")
+    parser.add_argument("--sample-queries", type=int, default=200, help="chunk texts used as extra queries")
+    parser.add_argument("--real-embeddings", action="store_true", help="embed with the configured model instead of hashing")
+    parser.add_argument("--output", type=Path, help="results file (default: benchmarks/results/quantization_<time>.json)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.real_embeddings:
+        # Imported here so the default run needs no model download or API key.
+        from src.llm.model_manager import LLMModelManager  # noqa: PLC0415
+
+        embedding = LLMModelManager().get_embedding_model()
+    else:
+        embedding = HashingEmbedding()
+    started_at = datetime.now(UTC)
+    random.seed(args.seed)
+    logging.disable(logging.INFO)
+    try:
+        chunks = DocProcessorWithMetadata().chunk_pdfs(DocumentLoader(str(RAW_DATA_DIR)).load_radar_files())
+        texts = [chunk.page_content for chunk in chunks]
+        queries = [question["question"] for question in json.loads(QUESTIONS_PATH.read_text(encoding="utf-8"))]
+        queries += random.sample(texts, min(args.sample_queries, len(texts)))
+        vectors = embedding.embed_documents(texts)
+        query_vectors = [embedding.embed_query(query) for query in queries]
+        ids = [f"chunk-{i}" for i in range(len(chunks))]
+        metadatas = [chunk.metadata for chunk in chunks]
+
+        results = {}
+        with tempfile.TemporaryDirectory() as root:
+            for mode in ("none", "int8", "pq"):
+                directory = Path(root) / mode
+                NumpyVectorStore.export(directory, ids, texts, metadatas, vectors)
+                NumpyVectorStore.quantize(directory, mode)
+                store = NumpyVectorStore.load(directory, embedding)
+                if mode == "none":
+                    exact, _ = search_ids(store, query_vectors, args.k)
+                results[mode] = benchmark_store(store, query_vectors, exact, args.k, args.rescore_factors)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    results = {
+        "started_at": started_at.isoformat(),
+        "git_commit": git_commit(),
+        "params": {
+            "k": args.k, "chunks": len(chunks), "dimensions": len(vectors[0]), "queries": len(queries),
+            "embedding": type(embedding).__name__,
+        },
+        **results,
+    }
+    output = args.output or RESULTS_DIR / f"quantization_{started_at:%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    logger.info(json.dumps(results, indent=2))
+    logger.info(f"Wrote benchmark results to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Tail latency of one chat backend against hedged routing across two.
+
+Starts a local OpenAI-compatible stub server with two backends: "primary",
+whose latency has a heavy tail and which fails a share of requests, and
+"backup", which is a little slower but steady. The same requests are sent
+through ChatLiteLLM to the primary alone and through a RoutedChatModel over
+both, and the latency quantiles, errors, hedges and failovers are compared.
+Needs no network access or API keys.
+
+Run using this command:
+    python -m benchmarks.routing_benchmark --requests 200 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from src.llm.model_router import (
+    FAILOVERS,
+    HEDGED_REQUESTS,
+    ModelRouter,
+    RoutedChatModel,
+)
+from src.utils.logger import logger
+
+# (median seconds, tail probability, tail seconds, error rate) per backend
+BACKENDS = {
+    "primary": (0.05, 0.04, 1.0, 0.05),
+    "backup": (0.08, 0.0, 0.0, 0.0),
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers POST /<backend>/chat/completions like an OpenAI-compatible server."""
+
+    def do_POST(self):
+        backend = self.path.strip("/").split("/")[0]
+        median, tail_probability, tail, error_rate = BACKENDS[backend]
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(random.lognormvariate(0, 0.25) * median + (tail if random.random() < tail_probability else 0))  # noqa: S311
+        if random.random() < error_rate:  # noqa: S311
+            self._reply(503, {"error": {"message": f"{backend} overloaded", "type": "server_error"}})
+            return
+        self._reply(200, {
+            "id": "stub", "object": "chat.completion", "created": int(time.time()), "model": backend,
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": f"answer from {backend}"}}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 3, "total_tokens": 13},
+        })
+
+    def _reply(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the router cancelled this request after a hedge won
+
+    def log_message(self, *_args):
+        pass
+
+
+def stub_model(port, backend):
+    # Imported here so the stub server starts without paying litellm's import cost first.
+    from langchain_litellm import ChatLiteLLM  # noqa: PLC0415
+
+    return ChatLiteLLM(
+        model=f"openai/{backend}",
+        api_base=f"http://127.0.0.1:{port}/{backend}",
+        api_key="stub",
+        max_retries=0,
+    )
+
+
+async def run(llm, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def one(i):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await llm.ainvoke(f"question {i}")
+            except Exception:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    samples = np.asarray(latencies) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(samples, 50)), 1),
+        "p95_ms": round(float(np.percentile(samples, 95)), 1),
+        "p99_ms": round(float(np.percentile(samples, 99)), 1),
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="requests per configuration")
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight at once")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    logging.disable(logging.WARNING)
+    try:
+        primary = stub_model(port, "primary")
+        routed = RoutedChatModel(router=ModelRouter({"primary": primary, "backup": stub_model(port, "backup")}))
+        # Warm the router's latency window so hedging uses measured deadlines.
+        asyncio.run(run(routed, 50, args.concurrency))
+        hedges, failovers = HEDGED_REQUESTS.value, FAILOVERS.value
+        results = {
+            "primary_only": asyncio.run(run(primary, args.requests, args.concurrency)),
+            "routed": asyncio.run(run(routed, args.requests, args.concurrency)),
+        }
+        results["routed"]["hedged_requests"] = int(HEDGED_REQUESTS.value - hedges)
+        results["routed"]["failovers"] = int(FAILOVERS.value - failovers)
+        results["routed"]["router_status"] = routed.router.status()
+    finally:
+        logging.disable(logging.NOTSET)
+        server.shutdown()
+    logger.info(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
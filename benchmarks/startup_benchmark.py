@@ -0,0 +1,83 @@
+"""Cold-start import time of the application entry points.
+
+Runs every entry point's import in a fresh interpreter under
+`python -X importtime` and reports the median total import time together with
+the slowest top-level imports. Pass --max-ms to fail when an entry point
+regresses past a budget.
+
+Run using this command:
+    python -m benchmarks.startup_benchmark --repeat 3 --max-ms 4000
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+from config import ROOT_DIR
+from src.utils.logger import logger
+
+ENTRY_POINTS = {
+    "main": "import main",
+    "seed-vector-basic": "from src.scripts.db_management import vector_migrate_and_seed",
+    "seed-vector-metadata": "from src.scripts.db_management import vector_metadata_migrate_and_seed",
+}
+
+
+def import_times(statement):
+    """Return the total import time of `statement` and the time of each module it imports directly.
+
+    Times are cumulative microseconds as reported by `-X importtime`.
+    """
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total, direct_imports = 0, {}
+    for line in result.stderr.splitlines():
+        _, _, fields = line.partition("import time:")
+        parts = fields.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        cumulative, name = int(parts[1]), parts[2]
+        # importtime indents each nesting level by two spaces after one leading space
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0:
+            total += cumulative
+        elif depth == 1:
+            direct_imports[name.strip()] = cumulative
+    return total, direct_imports
+
+
+def benchmark_entry_point(statement, repeat):
+    runs = [import_times(statement) for _ in range(repeat)]
+    total_ms = statistics.median(total for total, _ in runs) / 1000
+    slowest = sorted(runs[-1][1].items(), key=lambda item: item[1], reverse=True)[:5]
+    return total_ms, slowest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per entry point")
+    parser.add_argument("--max-ms", type=float, help="fail if any entry point imports slower than this")
+    args = parser.parse_args()
+
+    regressions = []
+    for entry_point, statement in ENTRY_POINTS.items():
+        total_ms, slowest = benchmark_entry_point(statement, args.repeat)
+        logger.info(f"{entry_point:<22} {total_ms:8.0f} ms")
+        for module, micros in slowest:
+            logger.info(f"    {module:<40} {micros / 1000:8.0f} ms")
+        if args.max_ms is not None and total_ms > args.max_ms:
+            regressions.append(entry_point)
+
+    if regressions:
+        logger.error(f"Import time above {args.max_ms:.0f} ms for: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,16 +17,115 @@ RAW_DATA_DIR = ROOT_DIR / "data"
 # Config path
 LLM_CONFIG_FILE = ROOT_DIR / "config" / "llm_config.yaml"
 
+# Local cache directory
+CACHE_DIR = Path(os.getenv("CACHE_DIR", ROOT_DIR / ".cache"))
+
 # Vector database
 CHROMA_PATH = os.getenv("CHROMA_PATH", "chroma_db")
 COLLECTION_NAME = os.getenv("COLLECTION_NAME", "tech_radar_store")
 TEXT_EMBEDDING_MODEL = os.getenv("TEXT_EMBEDDING_MODEL", "nomic-embed-text")
+VECTOR_STORE_BACKEND = os.getenv("VECTOR_STORE_BACKEND", "chroma")
+# Compact codes exported with the numpy index: "none", "int8" or "pq" (product quantization)
+VECTOR_QUANTIZATION = os.getenv("VECTOR_QUANTIZATION", "none")
+QUANTIZED_RESCORE_FACTOR = int(os.getenv("QUANTIZED_RESCORE_FACTOR", "4"))
+PQ_SUBSPACES = int(os.getenv("PQ_SUBSPACES", "16"))
+PQ_TRAIN_ITERATIONS = int(os.getenv("PQ_TRAIN_ITERATIONS", "20"))
+BLIP_INDEX_PATH = Path(os.getenv("BLIP_INDEX_PATH", Path(CHROMA_PATH) / "blip_index.json"))
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "vector")
+RETRIEVER_K = int(os.getenv("RETRIEVER_K", "4"))
+HYBRID_FETCH_K = int(os.getenv("HYBRID_FETCH_K", "20"))
+RRF_K = int(os.getenv("RRF_K", "60"))
+RERANK_ENABLED = os.getenv("RERANK_ENABLED", "true").lower() == "true"
+RERANK_SCORER = os.getenv("RERANK_SCORER", "lexical")
+RERANK_FETCH_K = int(os.getenv("RERANK_FETCH_K", "20"))
+RERANK_MIN_SCORE = float(os.getenv("RERANK_MIN_SCORE", "0.0"))
+RERANK_DEDUP_THRESHOLD = float(os.getenv("RERANK_DEDUP_THRESHOLD", "0.8"))
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
+INCREMENTAL_INGEST = os.getenv("INCREMENTAL_INGEST", "true").lower() == "true"
+
+# One collection per radar volume, searched in parallel
+SHARD_BY_VOLUME = os.getenv("SHARD_BY_VOLUME", "false").lower() == "true"
+SHARD_SEARCH_MAX_WORKERS = int(os.getenv("SHARD_SEARCH_MAX_WORKERS", "8"))
+
+# Embedding pipeline used while seeding
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+EMBEDDING_MAX_CONCURRENCY = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "4"))
+EMBEDDING_MAX_RETRIES = int(os.getenv("EMBEDDING_MAX_RETRIES", "3"))
+EMBEDDING_RETRY_BACKOFF = float(os.getenv("EMBEDDING_RETRY_BACKOFF", "1.0"))
+
+# Embedding cache
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_PATH = Path(os.getenv("EMBEDDING_CACHE_PATH", CACHE_DIR / "embeddings.sqlite3"))
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+
+# Shared keep-alive HTTP pool for LLM and embedding providers
+HTTP_POOL_MAX_CONNECTIONS = int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "20"))
+HTTP_POOL_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_POOL_KEEPALIVE_EXPIRY", "30"))
+
+# Routing across chat models: extra aliases to hedge and fail over to, in order
+FALLBACK_MODELS = [alias.strip() for alias in os.getenv("FALLBACK_MODELS", "").split(",") if alias.strip()]
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "true").lower() == "true"
+HEDGE_MAX_IN_FLIGHT = int(os.getenv("HEDGE_MAX_IN_FLIGHT", "2"))
+HEDGE_QUANTILE = float(os.getenv("HEDGE_QUANTILE", "0.95"))
+HEDGE_MIN_DELAY_SECONDS = float(os.getenv("HEDGE_MIN_DELAY_SECONDS", "0.5"))
+HEDGE_DEFAULT_DELAY_SECONDS = float(os.getenv("HEDGE_DEFAULT_DELAY_SECONDS", "10"))
+ROUTER_WINDOW_SIZE = int(os.getenv("ROUTER_WINDOW_SIZE", "100"))
+ROUTER_MIN_SAMPLES = int(os.getenv("ROUTER_MIN_SAMPLES", "10"))
+ROUTER_MAX_ERROR_RATE = float(os.getenv("ROUTER_MAX_ERROR_RATE", "0.5"))
+ROUTER_MAX_CONSECUTIVE_FAILURES = int(os.getenv("ROUTER_MAX_CONSECUTIVE_FAILURES", "3"))
+ROUTER_COOLDOWN_SECONDS = float(os.getenv("ROUTER_COOLDOWN_SECONDS", "30"))
 
 # Basic application settings
 DEBUG = False
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+LOG_FILE = os.getenv("LOG_FILE", "tech_radar_chat.log")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+
+# Chat server settings
+CHAT_CONCURRENCY_LIMIT = int(os.getenv("CHAT_CONCURRENCY_LIMIT", "16"))
+CHAT_QUEUE_MAX_SIZE = int(os.getenv("CHAT_QUEUE_MAX_SIZE", "64"))
+
+# Load the indexes and call every model at startup; /ready answers 503 until they are warm
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+WARMUP_QUERY = os.getenv("WARMUP_QUERY", "Which techniques are in the Adopt ring?")
+WARMUP_PROMPT = "Reply with OK."
+# Failed warm-ups are retried in the background, doubling the delay up to the maximum
+WARMUP_RETRY_BACKOFF_SECONDS = float(os.getenv("WARMUP_RETRY_BACKOFF_SECONDS", "1.0"))
+WARMUP_RETRY_MAX_DELAY_SECONDS = float(os.getenv("WARMUP_RETRY_MAX_DELAY_SECONDS", "60"))
+
+# Concurrent LLM calls of the ask-batch command
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "8"))
+
+# Served alongside the chat UI; defaults match gradio's launch()
+SERVER_NAME = os.getenv("GRADIO_SERVER_NAME", "127.0.0.1")
+SERVER_PORT = int(os.getenv("GRADIO_SERVER_PORT", "7860"))
+
+# In-process metrics exposed at /metrics in the Prometheus text format
+METRICS_PREFIX = os.getenv("METRICS_PREFIX", "tech_radar_")
+METRICS_WINDOW_SIZE = int(os.getenv("METRICS_WINDOW_SIZE", "1024"))
+METRICS_DUMP_PATH = os.getenv("METRICS_DUMP_PATH", "")
+
+# Answer ring/quadrant lookups from the blip index instead of the LLM
+STRUCTURED_ROUTING_ENABLED = os.getenv("STRUCTURED_ROUTING_ENABLED", "true").lower() == "true"
+
+# Conversation memory: follow-up rewriting, bounded history and per-session context cache
+CONVERSATION_MEMORY_ENABLED = os.getenv("CONVERSATION_MEMORY_ENABLED", "true").lower() == "true"
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "800"))
+HISTORY_SUMMARY_TOKEN_BUDGET = int(os.getenv("HISTORY_SUMMARY_TOKEN_BUDGET", "200"))
+CONVERSATION_MAX_SESSIONS = int(os.getenv("CONVERSATION_MAX_SESSIONS", "1000"))
+CONVERSATION_TTL_SECONDS = int(os.getenv("CONVERSATION_TTL_SECONDS", "3600"))
+SESSION_CONTEXT_CACHE_SIZE = int(os.getenv("SESSION_CONTEXT_CACHE_SIZE", "8"))
+# Alias of a small chat model for follow-ups the heuristics cannot resolve; empty to disable
+REWRITE_MODEL = os.getenv("REWRITE_MODEL", "")
+
+# Semantic answer cache
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+SEMANTIC_CACHE_SIMILARITY_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_SIMILARITY_THRESHOLD", "0.95"))
+SEMANTIC_CACHE_TTL_SECONDS = int(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "3600"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "512"))
 
 # Document validation settings
 TECH_RADAR_FILENAME_PATTERN = r"tr_technology_radar"
@@ -34,6 +133,11 @@ PDF_FILE_PATTERN = "*.pdf"
 REQUIRED_METADATA_FIELDS = ["creationdate"]
 REGEX_PATTERN = r'\d{1,3}\. [^"\n]+\n(?:Adopt|Trial|Hold|Assess)'
 
+# Document loading settings
+PDF_TEXT_CACHE_ENABLED = os.getenv("PDF_TEXT_CACHE_ENABLED", "true").lower() == "true"
+PDF_TEXT_CACHE_DIR = Path(os.getenv("PDF_TEXT_CACHE_DIR", CACHE_DIR / "pdf_text"))
+PDF_LOADER_MAX_WORKERS = int(os.getenv("PDF_LOADER_MAX_WORKERS", str(min(4, os.cpu_count() or 1))))
+
 SYSTEM_PROMPT = """You are an assistant for question-answering queries related to ThoughtWorks TechRadar.
 Use the following pieces of retrieved context to answer the question. If you don't know the answer,
 just say that you don't know. Use ten sentences maximum and keep the answer concise.
@@ -42,3 +146,12 @@ Context: {context}
 
 Answer:
 """
+
+REWRITE_PROMPT = """Rewrite the follow-up question as a standalone question about the ThoughtWorks
+Technology Radar, naming the blip and radar volume it refers to. Reply with the question only.
+
+Conversation:
+{conversation}
+
+Follow-up question: {question}
+"""
@@ -1,47 +1,77 @@
-import gradio as gr
-from dotenv import load_dotenv
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnablePassthrough
-
-from config import SYSTEM_PROMPT
-from src.llm.model_manager import LLMModelManager
-from src.vector_store.vector_store import VectorStore
-
-
-class ChatBot:
-    def __init__(self):
-        self.rag_chain = self._setup_rag_chain()
-
-    def _setup_rag_chain(self):
-        llm = LLMModelManager().get_chat_model()
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", SYSTEM_PROMPT),
-            ("human", "{question}"),
-        ])
+import atexit
 
-        retriever = VectorStore().load().as_retriever()
+from dotenv import load_dotenv
 
-        return (
-            {"context": retriever, "question": RunnablePassthrough()}
-            | prompt
-            | llm
-            | StrOutputParser()
-        )
+from config import (
+    CHAT_CONCURRENCY_LIMIT,
+    CHAT_QUEUE_MAX_SIZE,
+    METRICS_DUMP_PATH,
+    SERVER_NAME,
+    SERVER_PORT,
+    WARMUP_ENABLED,
+)
+from src.chat.chatbot import ChatBot
+from src.utils.metrics import metrics
 
-    def chat(self, message, history):
-        return self.rag_chain.invoke(str(message))
 
 def main():
     """Initialize and launch the Gradio chat interface."""
+    # Imported here so headless users of ChatBot do not pay gradio's import cost.
+    import gradio as gr  # noqa: PLC0415
+    import uvicorn  # noqa: PLC0415
+
     load_dotenv()
 
     chatbot = ChatBot()
+    if WARMUP_ENABLED:
+        # The server starts right away; /ready answers 503 until the warm-up is done.
+        chatbot.warm_up(background=True)
+
+    async def respond(message, history, request: gr.Request):
+        # Gradio's session hash keys the server-side conversation memory.
+        async for answer in chatbot.astream_chat(message, history, session_id=request.session_hash):
+            yield answer
+
     app = gr.ChatInterface(
-        fn=chatbot.chat,
+        fn=respond,
         type="messages",
+        concurrency_limit=CHAT_CONCURRENCY_LIMIT,
     )
-    app.launch()
+    app.queue(max_size=CHAT_QUEUE_MAX_SIZE)
+    if METRICS_DUMP_PATH:
+        atexit.register(metrics.dump, METRICS_DUMP_PATH)
+    uvicorn.run(gr.mount_gradio_app(create_server(chatbot), app, path="/"), host=SERVER_NAME, port=SERVER_PORT)
+
+
+def create_server(chatbot=None):
+    """Create the HTTP app that serves /metrics, /health and /ready next to the mounted chat UI.
+
+    /health answers as long as the process serves requests. /ready answers 503
+    until the chatbot's components have warmed up, or while every routed
+    model is ejected, so load balancers only send traffic to a warm server.
+    """
+    from fastapi import FastAPI  # noqa: PLC0415
+    from fastapi.responses import JSONResponse, PlainTextResponse  # noqa: PLC0415
+
+    server = FastAPI()
+
+    @server.get("/metrics", response_class=PlainTextResponse)
+    def prometheus_metrics():
+        return metrics.render()
+
+    @server.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    @server.get("/ready")
+    def ready():
+        status = chatbot.readiness.status() if chatbot else {"ready": True, "components": {}}
+        if router := getattr(chatbot and chatbot.llm, "router", None):
+            status["models"] = router.status()
+            status["ready"] &= any(model["healthy"] for model in status["models"].values())
+        return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+    return server
 
 if __name__ == "__main__":
     main()
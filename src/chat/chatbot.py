@@ -0,0 +1,320 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from operator import itemgetter
+
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableLambda
+
+from config import (
+    BLIP_INDEX_PATH,
+    CONVERSATION_MEMORY_ENABLED,
+    RERANK_ENABLED,
+    RERANK_FETCH_K,
+    RERANK_SCORER,
+    RETRIEVER_K,
+    REWRITE_MODEL,
+    SEMANTIC_CACHE_ENABLED,
+    STRUCTURED_ROUTING_ENABLED,
+    SYSTEM_PROMPT,
+    WARMUP_PROMPT,
+    WARMUP_QUERY,
+)
+from src.chat.conversation import ConversationMemory, ConversationStore, QueryRewriter
+from src.chat.query_router import QueryRouter
+from src.chat.semantic_cache import SemanticCache
+from src.llm.embedding_cache import CachedEmbeddings
+from src.llm.model_manager import LLMModelManager
+from src.retrieval.reranker import RerankingRetriever, build_scorer, format_context
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.utils.readiness import Readiness
+from src.utils.token_counter import estimate_tokens
+from src.vector_store.blip_index import BlipIndex
+from src.vector_store.sharded_store import open_vector_store
+
+REQUESTS = metrics.counter("chat_requests_total", "Chat requests received")
+ROUTER_ANSWERS = metrics.counter("chat_router_answers_total", "Requests answered from the blip index")
+CONTEXT_CACHE_HITS = metrics.counter("chat_context_cache_hits_total", "Follow-ups answered with context cached in the session")
+RETRIEVAL_LATENCY = metrics.histogram("chat_retrieval_seconds", "Retrieval, reranking and context formatting time")
+PROMPT_BUILD_LATENCY = metrics.histogram("chat_prompt_build_seconds", "Prompt formatting time")
+FIRST_TOKEN_LATENCY = metrics.histogram("chat_time_to_first_token_seconds", "Time from request to first streamed token")
+GENERATION_LATENCY = metrics.histogram("chat_generation_seconds", "Time from request to complete LLM answer")
+PROMPT_TOKENS = metrics.histogram("chat_prompt_tokens", "Estimated prompt tokens sent per LLM request")
+COMPLETION_TOKENS = metrics.histogram("chat_completion_tokens", "Estimated completion tokens per LLM answer")
+
+
+class ChatBot:
+    def __init__(self, vector_store=None, llm=None):
+        """Set up the chat pipeline.
+
+        Args:
+            vector_store: Store to retrieve from; the configured (possibly sharded) store by default.
+            llm: Chat model to answer with; the configured model by default.
+        """
+        self.vector_store = vector_store or open_vector_store()
+        self.llm = llm or LLMModelManager().get_chat_model()
+        self.retriever = self._setup_retriever()
+        self.prompt = ChatPromptTemplate.from_messages([
+            ("system", SYSTEM_PROMPT),
+            MessagesPlaceholder("history", optional=True),
+            ("human", "{question}"),
+        ])
+        self.rag_chain = self._setup_rag_chain()
+        self.blip_index = BlipIndex.load(BLIP_INDEX_PATH) if BLIP_INDEX_PATH.exists() else None
+        self.query_router = self._setup_query_router()
+        self.rewriter = QueryRewriter(self.blip_index, self._setup_rewrite_model())
+        self.conversations = ConversationStore(rewriter=self.rewriter) if CONVERSATION_MEMORY_ENABLED else None
+        self.answer_cache = None
+        if SEMANTIC_CACHE_ENABLED:
+            self.answer_cache = SemanticCache(
+                self.vector_store.embedding_model,
+                self.vector_store.collection_version,
+            )
+        self.readiness = Readiness()
+        self._register_cache_metrics()
+
+    def _setup_rag_chain(self):
+        """Build the chain answering {"question", "query", "history", "memory"} inputs.
+
+        Context is retrieved for the standalone `query`, while the model sees the
+        session `history` and the question as asked.
+        """
+        return (
+            {
+                "context": RunnableLambda(self._retrieve_context, afunc=self._aretrieve_context),
+                "question": itemgetter("question"),
+                "history": itemgetter("history"),
+            }
+            | RunnableLambda(self._build_prompt, afunc=self._abuild_prompt)
+            | self.llm
+            | StrOutputParser()
+        )
+
+    def _setup_retriever(self):
+        if not RERANK_ENABLED:
+            return self.vector_store.get_retriever(k=RETRIEVER_K)
+        return RerankingRetriever(
+            base_retriever=self.vector_store.get_retriever(k=RERANK_FETCH_K),
+            scorer=build_scorer(RERANK_SCORER, self.vector_store.embedding_model),
+            k=RETRIEVER_K,
+        )
+
+    def _retrieve_context(self, inputs):
+        key, memory = self._context_key(inputs["query"]), inputs["memory"]
+        if (context := memory.cached_context(key)) is not None:
+            CONTEXT_CACHE_HITS.inc()
+            return context
+        with RETRIEVAL_LATENCY.time():
+            context = format_context(self.retriever.invoke(inputs["query"]))
+        memory.cache_context(key, context)
+        return context
+
+    async def _aretrieve_context(self, inputs):
+        key, memory = self._context_key(inputs["query"]), inputs["memory"]
+        if (context := memory.cached_context(key)) is not None:
+            CONTEXT_CACHE_HITS.inc()
+            return context
+        with RETRIEVAL_LATENCY.time():
+            context = format_context(await self.retriever.ainvoke(inputs["query"]))
+        memory.cache_context(key, context)
+        return context
+
+    def _context_key(self, query):
+        # Reseeding the store invalidates context cached before it.
+        return f"{self.vector_store.collection_version()}|{self.rewriter.context_key(query)}"
+
+    def _build_prompt(self, inputs):
+        with PROMPT_BUILD_LATENCY.time():
+            prompt_value = self.prompt.invoke(inputs)
+        tokens = estimate_tokens(prompt_value.to_string())
+        PROMPT_TOKENS.observe(tokens)
+        logger.info("Prompt tokens sent: ~%d", tokens)
+        return prompt_value
+
+    async def _abuild_prompt(self, inputs):
+        return self._build_prompt(inputs)
+
+    def warm_up(self, background=False):
+        """Pay the cold-start costs before the first request does.
+
+        The embedding model is called and the retriever run, which opens the
+        collection and loads its index, while every chat model answers a short
+        prompt and the prompt template is rendered once. `self.readiness`
+        records how long each component took; one warmed chat model is enough
+        when several are routed. With `background` the warm-up runs on a
+        thread, which retries failed components with backoff until ready, and
+        this returns at once.
+        """
+        models = self._warm_up_models()
+        self.readiness.expect(["prompt", "embedding_model", "vector_store"])
+        self.readiness.expect(models, group="llm")
+        if background:
+            threading.Thread(target=self._warm_up, args=(models, True), name="warm-up", daemon=True).start()
+        else:
+            self._warm_up(models)
+
+    def _warm_up(self, models, retry=False):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(models) + 1, thread_name_prefix="warm-up") as pool:
+            futures = [
+                pool.submit(self.readiness.check, name, lambda model=model: model.invoke(WARMUP_PROMPT))
+                for name, model in models.items()
+            ]
+            futures.append(pool.submit(self._warm_up_retrieval))
+            self.readiness.check("prompt", lambda: self.prompt.invoke({"question": WARMUP_QUERY, "context": "", "history": []}))
+            wait(futures)
+        status = "ready" if self.readiness.ready else "not ready"
+        logger.info(f"Warm-up finished in {time.perf_counter() - start:.2f}s, {status}")
+        if retry:
+            self.readiness.retry_until_ready()
+
+    def _warm_up_retrieval(self):
+        embedding_model = self.vector_store.embedding_model
+        # Go past the embedding cache, which would answer without waking the model.
+        if isinstance(embedding_model, CachedEmbeddings):
+            embedding_model = embedding_model.embeddings
+        self.readiness.check("embedding_model", lambda: embedding_model.embed_query(WARMUP_QUERY))
+        self.readiness.check("vector_store", lambda: self.retriever.invoke(WARMUP_QUERY))
+
+    def _warm_up_models(self):
+        """Return the chat models to warm by readiness name: each routed model, or the one model."""
+        if router := getattr(self.llm, "router", None):
+            return {f"llm:{alias}": model for alias, model in router.models.items()}
+        return {"llm": self.llm}
+
+    def _register_cache_metrics(self):
+        if self.answer_cache:
+            metrics.register_callback("semantic_cache_hits_total", "Answers served from the semantic cache", lambda: self.answer_cache.hits)
+            metrics.register_callback("semantic_cache_misses_total", "Semantic cache lookups that missed", lambda: self.answer_cache.misses)
+        metrics.register_callback("ready", "1 once every component has warmed up", lambda: self.readiness.ready, kind="gauge")
+        if cache := getattr(self.vector_store.embedding_model, "cache", None):
+            metrics.register_callback("embedding_cache_hits_total", "Texts served from the embedding cache", lambda: cache.hits)
+            metrics.register_callback("embedding_cache_misses_total", "Texts sent to the embedding provider", lambda: cache.misses)
+
+    @staticmethod
+    def _record_answer(start, answer):
+        GENERATION_LATENCY.observe(time.perf_counter() - start)
+        COMPLETION_TOKENS.observe(estimate_tokens(answer))
+
+    def _setup_query_router(self):
+        if not STRUCTURED_ROUTING_ENABLED or self.blip_index is None:
+            return None
+        return QueryRouter(self.blip_index)
+
+    @staticmethod
+    def _setup_rewrite_model():
+        if not CONVERSATION_MEMORY_ENABLED or not REWRITE_MODEL:
+            return None
+        return LLMModelManager(model_alias=REWRITE_MODEL).get_chat_model()
+
+    def _open_turn(self, message, history, session_id):
+        """Return the session memory, the question and the standalone query to answer it with."""
+        question = str(message)
+        if self.conversations is None:
+            return ConversationMemory(), question, question
+        memory = self.conversations.get(session_id, history)
+        return memory, question, self.rewriter.rewrite(question, memory)
+
+    async def _aopen_turn(self, message, history, session_id):
+        question = str(message)
+        if self.conversations is None:
+            return ConversationMemory(), question, question
+        memory = self.conversations.get(session_id, history)
+        return memory, question, await self.rewriter.arewrite(question, memory)
+
+    @staticmethod
+    def _chain_inputs(question, query, memory):
+        return {"question": question, "query": query, "history": memory.messages(), "memory": memory}
+
+    def _route(self, question):
+        """Answer factual blip lookups from the structured index, skipping the RAG chain."""
+        REQUESTS.inc()
+        if self.query_router and (answer := self.query_router.route(question)):
+            logger.info("Answered from blip index: %s", question)
+            ROUTER_ANSWERS.inc()
+            return answer
+        return None
+
+    def chat(self, message, history, session_id=None):
+        memory, question, query = self._open_turn(message, history, session_id)
+        if routed := self._route(query):
+            memory.add_turn(question, routed)
+            return routed
+        if self.answer_cache and (cached := self.answer_cache.lookup(query)):
+            memory.add_turn(question, cached)
+            return cached
+        start = time.perf_counter()
+        answer = self.rag_chain.invoke(self._chain_inputs(question, query, memory))
+        self._record_answer(start, answer)
+        memory.add_turn(question, answer)
+        if self.answer_cache:
+            self.answer_cache.store(query, answer)
+        return answer
+
+    def stream_chat(self, message, history, session_id=None):
+        """Yield the answer as it grows so the UI can render tokens as they arrive."""
+        memory, question, query = self._open_turn(message, history, session_id)
+        if routed := self._route(query):
+            memory.add_turn(question, routed)
+            yield routed
+            return
+        if self.answer_cache and (cached := self.answer_cache.lookup(query)):
+            memory.add_turn(question, cached)
+            yield cached
+            return
+        start = time.perf_counter()
+        answer = ""
+        for token in self.rag_chain.stream(self._chain_inputs(question, query, memory)):
+            if not answer and token:
+                FIRST_TOKEN_LATENCY.observe(time.perf_counter() - start)
+                logger.info("Time to first token: %.3fs", time.perf_counter() - start)
+            answer += token
+            yield answer
+        self._record_answer(start, answer)
+        logger.info("Total response time: %.3fs", time.perf_counter() - start)
+        memory.add_turn(question, answer)
+        if self.answer_cache:
+            self.answer_cache.store(query, answer)
+
+    async def achat(self, message, history, session_id=None):
+        memory, question, query = await self._aopen_turn(message, history, session_id)
+        if routed := self._route(query):
+            memory.add_turn(question, routed)
+            return routed
+        if self.answer_cache and (cached := await self.answer_cache.alookup(query)):
+            memory.add_turn(question, cached)
+            return cached
+        start = time.perf_counter()
+        answer = await self.rag_chain.ainvoke(self._chain_inputs(question, query, memory))
+        self._record_answer(start, answer)
+        memory.add_turn(question, answer)
+        if self.answer_cache:
+            await self.answer_cache.astore(query, answer)
+        return answer
+
+    async def astream_chat(self, message, history, session_id=None):
+        """Async variant of `stream_chat`; runs on the event loop without a worker thread."""
+        memory, question, query = await self._aopen_turn(message, history, session_id)
+        if routed := self._route(query):
+            memory.add_turn(question, routed)
+            yield routed
+            return
+        if self.answer_cache and (cached := await self.answer_cache.alookup(query)):
+            memory.add_turn(question, cached)
+            yield cached
+            return
+        start = time.perf_counter()
+        answer = ""
+        async for token in self.rag_chain.astream(self._chain_inputs(question, query, memory)):
+            if not answer and token:
+                FIRST_TOKEN_LATENCY.observe(time.perf_counter() - start)
+                logger.info("Time to first token: %.3fs", time.perf_counter() - start)
+            answer += token
+            yield answer
+        self._record_answer(start, answer)
+        logger.info("Total response time: %.3fs", time.perf_counter() - start)
+        memory.add_turn(question, answer)
+        if self.answer_cache:
+            await self.answer_cache.astore(query, answer)
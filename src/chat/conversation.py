@@ -0,0 +1,257 @@
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from config import (
+    CONVERSATION_MAX_SESSIONS,
+    CONVERSATION_TTL_SECONDS,
+    HISTORY_SUMMARY_TOKEN_BUDGET,
+    HISTORY_TOKEN_BUDGET,
+    REWRITE_PROMPT,
+    SESSION_CONTEXT_CACHE_SIZE,
+)
+from src.utils.logger import logger
+from src.utils.token_counter import estimate_tokens, truncate_to_tokens
+from src.vector_store.blip_index import VOLUME_PATTERN, BlipIndex, normalize_name
+
+FOLLOW_UP_PREFIX_PATTERN = re.compile(r"^\s*(?:and|also|so|then|what about|how about)\b", re.IGNORECASE)
+POSSESSIVE_PATTERN = re.compile(r"\b(?:its|their)\s+(\w+)", re.IGNORECASE)
+PRONOUN_PATTERN = re.compile(r"\b(?:it|they|them)\b|\b(?:this|that)\b(?=\s*[?.!,]|\s*$)", re.IGNORECASE)
+RELATIVE_VOLUME_PATTERN = re.compile(
+    r"\b(?:in\s+)?(?:the\s+)?(?:last|previous|prior|earlier)\s+(?:vol(?:ume)?|radar|edition)\b",
+    re.IGNORECASE,
+)
+SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?])\s")
+SUMMARY_ANSWER_TOKENS = 40
+
+
+def summarize_turn(question: str, answer: str) -> str:
+    """Condense a turn to the question and the first sentence of its answer."""
+    first_sentence = SENTENCE_END_PATTERN.split(answer.strip(), maxsplit=1)[0]
+    return f"- Q: {question.strip()} A: {truncate_to_tokens(first_sentence, SUMMARY_ANSWER_TOKENS)}"
+
+
+class ConversationMemory:
+    """History of one chat session, kept under a token budget.
+
+    Recent turns are kept verbatim. Once they exceed `token_budget`, the oldest
+    are folded into a rolling extractive summary, itself capped at
+    `summary_budget` tokens, so the history sent with each prompt stays bounded
+    however long the session runs. The memory also tracks the last standalone
+    query with the blip and volume it was about, and caches retrieved context.
+    """
+
+    def __init__(
+        self,
+        token_budget=HISTORY_TOKEN_BUDGET,
+        summary_budget=HISTORY_SUMMARY_TOKEN_BUDGET,
+        context_cache_size=SESSION_CONTEXT_CACHE_SIZE,
+    ):
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.context_cache_size = context_cache_size
+        self.turns = deque()
+        self.summary = deque()
+        self.subject = None
+        self.volume = None
+        self.last_query = None
+        self.last_used = time.monotonic()
+        self._contexts = OrderedDict()
+
+    def add_turn(self, question: str, answer: str):
+        self.turns.append((question, answer))
+        while len(self.turns) > 1 and self._turn_tokens() > self.token_budget:
+            self.summary.append(summarize_turn(*self.turns.popleft()))
+            while len(self.summary) > 1 and estimate_tokens("\n".join(self.summary)) > self.summary_budget:
+                self.summary.popleft()
+
+    def messages(self) -> list:
+        """Return the history as chat messages: the summary first, then the recent turns."""
+        messages = []
+        if self.summary:
+            messages.append(SystemMessage(content="Earlier in this conversation:\n" + "\n".join(self.summary)))
+        for question, answer in self.turns:
+            messages.extend([HumanMessage(content=question), AIMessage(content=answer)])
+        return messages
+
+    def transcript(self, turns: int = 2) -> str:
+        return "\n".join(f"User: {question}\nAssistant: {answer}" for question, answer in list(self.turns)[-turns:])
+
+    def cached_context(self, key: str) -> str | None:
+        context = self._contexts.get(key)
+        if context is not None:
+            self._contexts.move_to_end(key)
+        return context
+
+    def cache_context(self, key: str, context: str):
+        self._contexts[key] = context
+        self._contexts.move_to_end(key)
+        while len(self._contexts) > self.context_cache_size:
+            self._contexts.popitem(last=False)
+
+    def _turn_tokens(self):
+        return sum(estimate_tokens(question) + estimate_tokens(answer) for question, answer in self.turns)
+
+
+class ConversationStore:
+    """Conversation memories by session, dropping idle and least recently used sessions."""
+
+    def __init__(self, max_sessions=CONVERSATION_MAX_SESSIONS, ttl_seconds=CONVERSATION_TTL_SECONDS, rewriter=None):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.rewriter = rewriter
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str | None, history=()) -> ConversationMemory:
+        """Return the memory of `session_id`, seeded from the UI's `history` when it is new.
+
+        Without a session ID a throwaway memory is built from `history` alone.
+        """
+        if session_id is None:
+            return self._seed(ConversationMemory(), history)
+        now = time.monotonic()
+        with self._lock:
+            for stale_id in [key for key, memory in self._sessions.items() if now - memory.last_used > self.ttl_seconds]:
+                del self._sessions[stale_id]
+            memory = self._sessions.get(session_id)
+            if memory is None:
+                memory = self._sessions[session_id] = self._seed(ConversationMemory(), history)
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            self._sessions.move_to_end(session_id)
+            memory.last_used = now
+        return memory
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _seed(self, memory, history):
+        for question, answer in history_turns(history):
+            if self.rewriter:
+                self.rewriter.observe(memory, question)
+            memory.add_turn(question, answer)
+        return memory
+
+
+def history_turns(history) -> list[tuple[str, str]]:
+    """Pair up a Gradio chat history, given as role/content messages or as [user, bot] pairs."""
+    turns, question = [], None
+    for item in history or ():
+        if isinstance(item, dict):
+            content = item.get("content")
+            if not isinstance(content, str):
+                continue
+            if item.get("role") == "user":
+                question = content
+            elif item.get("role") == "assistant" and question is not None:
+                turns.append((question, content))
+                question = None
+        elif len(item) == 2 and all(isinstance(part, str) for part in item):
+            turns.append(tuple(item))
+    return turns
+
+
+class QueryRewriter:
+    """Turns follow-up questions into standalone retrieval queries.
+
+    Cheap heuristics resolve "it"/"its" to the blip last discussed and "last
+    volume" to the radar before the one last discussed. A follow-up they
+    cannot resolve is rewritten by `llm` when given, otherwise prefixed with the
+    previous standalone query.
+    """
+
+    def __init__(self, blip_index: BlipIndex | None = None, llm=None):
+        self.blip_index = blip_index
+        self.llm = llm
+
+    def rewrite(self, question: str, memory: ConversationMemory) -> str:
+        query = self._rewrite(question, memory)
+        if query is None:
+            query = self._llm_rewrite(question, memory)
+        return self._accept(question, query, memory)
+
+    async def arewrite(self, question: str, memory: ConversationMemory) -> str:
+        query = self._rewrite(question, memory)
+        if query is None:
+            query = await self._allm_rewrite(question, memory)
+        return self._accept(question, query, memory)
+
+    def _accept(self, question, query, memory):
+        if query != question:
+            logger.info(f"Rewrote follow-up {question!r} as {query!r}")
+        self.observe(memory, query)
+        memory.last_query = query
+        return query
+
+    def observe(self, memory: ConversationMemory, query: str):
+        """Remember the blip and volume a standalone query is about."""
+        if self.blip_index and (subject := self.blip_index.find_mentioned(query)):
+            memory.subject = subject
+        if volume_match := VOLUME_PATTERN.search(query):
+            memory.volume = volume_match.group(1)
+
+    def context_key(self, query: str) -> str:
+        """Key retrieved context by the blip and volume a query names, so rephrased follow-ups share it."""
+        subject = self.blip_index.find_mentioned(query) if self.blip_index else None
+        if subject is None:
+            return normalize_name(query)
+        volume_match = VOLUME_PATTERN.search(query)
+        return f"blip:{subject}|{volume_match.group(1) if volume_match else ''}"
+
+    def _rewrite(self, question, memory):
+        """Return the heuristic rewrite, or None for a follow-up that needs the model."""
+        query = RELATIVE_VOLUME_PATTERN.sub(lambda _: self._previous_volume(memory), question)
+        if self.blip_index and self.blip_index.find_mentioned(query):
+            return query
+        if not (POSSESSIVE_PATTERN.search(query) or PRONOUN_PATTERN.search(query)):
+            return query if query != question or not FOLLOW_UP_PREFIX_PATTERN.search(query) else None
+        if memory.subject is None:
+            return None
+        subject = self._display_name(memory.subject)
+        query = POSSESSIVE_PATTERN.sub(lambda match: f"the {match.group(1)} of {subject}", query, count=1)
+        if query.count(subject) == 0:
+            query = PRONOUN_PATTERN.sub(subject, query, count=1)
+        return query
+
+    def _previous_volume(self, memory):
+        volumes = self.blip_index.volumes() if self.blip_index else []
+        current = memory.volume or (volumes[-1] if volumes else None)
+        if current is None:
+            return "in the previous volume"
+        older = [volume for volume in volumes if volume and int(volume) < int(current)]
+        return f"in Vol {older[-1] if older else int(current) - 1}"
+
+    def _display_name(self, subject):
+        blips = self.blip_index.lookup(subject) if self.blip_index else []
+        return blips[0]["name"] if blips else subject
+
+    def _llm_rewrite(self, question, memory):
+        if self.llm is None or not memory.turns:
+            return self._fallback(question, memory)
+        try:
+            return self.llm.invoke(self._prompt(question, memory)).content.strip() or question
+        except Exception as e:
+            logger.warning(f"Follow-up rewrite failed, using the previous question instead: {e!s}")
+            return self._fallback(question, memory)
+
+    async def _allm_rewrite(self, question, memory):
+        if self.llm is None or not memory.turns:
+            return self._fallback(question, memory)
+        try:
+            return (await self.llm.ainvoke(self._prompt(question, memory))).content.strip() or question
+        except Exception as e:
+            logger.warning(f"Follow-up rewrite failed, using the previous question instead: {e!s}")
+            return self._fallback(question, memory)
+
+    @staticmethod
+    def _prompt(question, memory):
+        return REWRITE_PROMPT.format(conversation=memory.transcript(), question=question)
+
+    @staticmethod
+    def _fallback(question, memory):
+        previous = memory.last_query or (memory.turns[-1][0] if memory.turns else None)
+        return f"{previous} {question}" if previous else question
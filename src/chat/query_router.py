@@ -0,0 +1,93 @@
+import re
+
+from src.vector_store.blip_index import VOLUME_PATTERN, BlipIndex, normalize_name
+
+RINGS = ["Adopt", "Trial", "Assess", "Hold"]
+QUADRANTS = {
+    "technique": "Techniques",
+    "tool": "Tools",
+    "platform": "Platforms",
+    "language": "Languages and Frameworks",
+    "framework": "Languages and Frameworks",
+}
+
+RING_PATTERN = re.compile(r"\b(adopt|trial|assess|hold)\b", re.IGNORECASE)
+QUADRANT_PATTERN = re.compile(r"\b(technique|tool|platform|language|framework)s?\b", re.IGNORECASE)
+LIST_INTENT_PATTERN = re.compile(r"^\s*(?:list|show|enumerate|what are|which are)\b", re.IGNORECASE)
+RING_INTENT_PATTERN = re.compile(r"\b(?:which|what)\s+ring\b|\bring\s+of\b", re.IGNORECASE)
+LOOKUP_PREFIX_PATTERN = re.compile(
+    r"^\s*(?:which|what)\s+ring\s+(?:is|was)\s+(?P<name>.+?)"
+    r"(?:\s+(?:in|on|placed|at)\b.*)?\s*\??\s*$",
+    re.IGNORECASE,
+)
+# Words a lookup may contain besides the blip, ring, quadrant and volume it asks about;
+# any other word makes it an open-ended question for the RAG chain.
+FILLER_WORDS = frozenset({
+    "a", "about", "all", "and", "any", "are", "blip", "blips", "can", "current", "currently", "does",
+    "enumerate", "every", "give", "in", "is", "it", "latest", "list", "me", "now", "of", "on", "please",
+    "placed", "radar", "ring", "show", "tech", "technology", "tell", "the", "there", "was", "what", "which", "you",
+})
+
+
+class QueryRouter:
+    """Answers factual ring/quadrant lookups straight from the blip index.
+
+    `route` returns None for anything that is not a recognised lookup so the
+    caller can fall back to the RAG chain.
+    """
+
+    def __init__(self, blip_index: BlipIndex):
+        self.blip_index = blip_index
+
+    def route(self, question: str) -> str | None:
+        volume_match = VOLUME_PATTERN.search(question)
+        volume = volume_match.group(1) if volume_match else None
+        text = VOLUME_PATTERN.sub(" ", question)
+
+        if RING_INTENT_PATTERN.search(text):
+            return self._answer_ring_lookup(text, volume)
+        if LIST_INTENT_PATTERN.search(text):
+            return self._answer_listing(text, volume)
+        return None
+
+    def _answer_ring_lookup(self, text, volume):
+        name = self.blip_index.find_mentioned(text)
+        if name is None and (match := LOOKUP_PREFIX_PATTERN.match(text)):
+            name = match.group("name")
+        elif name is None or not _is_filler(f" {normalize_name(text)} ".replace(f" {name} ", " ")):
+            return None
+        blips = self.blip_index.lookup(name, volume)
+        if not blips:
+            return None
+        return "\n".join(
+            f"{blip['name']} is in {blip['ring']} for {blip['quadrant']} in {blip['title']}."
+            for blip in sorted(blips, key=lambda blip: int(blip["volume"] or 0), reverse=True)
+        )
+
+    def _answer_listing(self, text, volume):
+        ring_match = RING_PATTERN.search(text)
+        quadrant_match = QUADRANT_PATTERN.search(text)
+        if not ring_match and not quadrant_match:
+            return None
+        if not _is_filler(QUADRANT_PATTERN.sub(" ", RING_PATTERN.sub(" ", text))):
+            return None
+        ring = ring_match.group(1).capitalize() if ring_match else None
+        quadrant = QUADRANTS[quadrant_match.group(1).lower()] if quadrant_match else None
+        volumes = self.blip_index.volumes()
+        if not volumes:
+            return None
+        volume = volume or volumes[-1]
+
+        blips = self.blip_index.filter(quadrant=quadrant, ring=ring, volume=volume)
+        scope = " ".join(part for part in [ring, quadrant] if part) or "All"
+        if not blips:
+            return f"There are no {scope} blips in Technology Radar Vol {volume}."
+        lines = [f"{scope} blips in {blips[0]['title']}:"]
+        for blip in blips:
+            details = [blip[field] for field, given in (("ring", ring), ("quadrant", quadrant)) if not given]
+            lines.append(f"- {blip['name']}" + (f" ({', '.join(details)})" if details else ""))
+        return "\n".join(lines)
+
+
+def _is_filler(text: str) -> bool:
+    return set(normalize_name(text).split()) <= FILLER_WORDS
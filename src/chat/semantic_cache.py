@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from config import (
+    SEMANTIC_CACHE_MAX_ENTRIES,
+    SEMANTIC_CACHE_SIMILARITY_THRESHOLD,
+    SEMANTIC_CACHE_TTL_SECONDS,
+)
+from src.utils.logger import logger
+
+
+class SemanticCache:
+    """In-process cache of answers keyed by the embedding of the question.
+
+    A question is answered from the cache when a previous question is at least
+    `similarity_threshold` cosine-similar to it. Entries expire after
+    `ttl_seconds`, the least recently used entry is evicted beyond `max_entries`
+    and the whole cache is cleared whenever `version_fn` reports a new vector
+    store collection version.
+    """
+
+    def __init__(
+        self,
+        embedding_model,
+        version_fn=lambda: "",
+        similarity_threshold=SEMANTIC_CACHE_SIMILARITY_THRESHOLD,
+        ttl_seconds=SEMANTIC_CACHE_TTL_SECONDS,
+        max_entries=SEMANTIC_CACHE_MAX_ENTRIES,
+    ):
+        self.embedding_model = embedding_model
+        self.version_fn = version_fn
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._matrix = None
+        self._keys = []
+        self._version = None
+        self._lock = threading.Lock()
+
+    def lookup(self, question: str) -> str | None:
+        return self._lookup(self.embedding_model.embed_query(question))
+
+    async def alookup(self, question: str) -> str | None:
+        return self._lookup(await self.embedding_model.aembed_query(question))
+
+    def store(self, question: str, answer: str):
+        self._store(question, self.embedding_model.embed_query(question), answer)
+
+    async def astore(self, question: str, answer: str):
+        self._store(question, await self.embedding_model.aembed_query(question), answer)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+
+    def _lookup(self, vector):
+        query = self._normalize(vector)
+        with self._lock:
+            self._check_version()
+            self._expire()
+            if self._entries:
+                if self._matrix is None:
+                    self._keys = list(self._entries)
+                    self._matrix = np.stack([self._entries[key][0] for key in self._keys])
+                scores = self._matrix @ query
+                best = int(np.argmax(scores))
+                if scores[best] >= self.similarity_threshold:
+                    key = self._keys[best]
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    logger.info(f"Semantic cache hit (similarity {scores[best]:.3f}) for: {key}")
+                    return self._entries[key][1]
+            self.misses += 1
+            return None
+
+    def _store(self, question, vector, answer):
+        with self._lock:
+            self._check_version()
+            self._entries[question] = (self._normalize(vector), answer, time.monotonic())
+            self._entries.move_to_end(question)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._matrix = None
+
+    def _check_version(self):
+        version = self.version_fn()
+        if version != self._version:
+            if self._entries:
+                logger.info("Vector store collection changed, clearing semantic cache")
+            self._entries.clear()
+            self._matrix = None
+            self._version = version
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.ttl_seconds
+        expired = [key for key, (_, _, created_at) in self._entries.items() if created_at < cutoff]
+        for key in expired:
+            del self._entries[key]
+        if expired:
+            self._matrix = None
+
+    @staticmethod
+    def _normalize(vector):
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
@@ -3,81 +3,156 @@ import re
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+from config import REGEX_PATTERN
 from src.utils.logger import logger
 
+# Page furniture removed before parsing. Each pattern starts with a literal, which
+# lets the regex engine skip ahead quickly; one alternation would be tried at
+# every position of the document instead.
+CLEANUP_PATTERNS = [
+    re.compile(r"Hold\s+HoldAssess\s+AssessTrial\s+TrialAdopt\s+Adopt\s*\n(?:\s*\d+(?:\s+\d+)*\s*\n?)*", re.MULTILINE),
+    re.compile(r"©\s*Thoughtworks,\s*Inc\.\s*All\s*Rights\s*Reserved\.(?:\s*\n\s*\d+)?"),
+    re.compile(r"New\s+Moved\s+in/out\s+No\s+change"),
+]
+CHUNK_TITLE_PATTERN = re.compile(r'\d{1,3}\. [^"\n]+')
+ITEM_START_PATTERN = re.compile(r"\d+\.")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+QUADRANT_TITLES = ["Techniques", "Platforms", "Tools", "Languages and \nFrameworks"]
+RING_TITLES = ["Adopt", "Trial", "Assess", "Hold"]
+ADOPT_PATTERN = re.compile(r"Adopt")
+QUADRANT_HEADING_PATTERN = re.compile(rf"({'|'.join(map(re.escape, QUADRANT_TITLES))})\s*\n\s*\Z")
+QUADRANT_HEADING_WINDOW = 64
+
 
 class DocProcessorWithMetadata:
     def __init__(self, chunk_size=1000, chunk_overlap=200):
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self._splitter = None
 
     def split_using_lib(self, docs):
-        pattern = r'\d{1,3}\. [^"\n]+\n(?:Adopt|Trial|Hold|Assess)'
-        splitter = RecursiveCharacterTextSplitter(chunk_size=1000, is_separator_regex=True, separators=[pattern])
-        return splitter.split_text(docs)
+        if self._splitter is None:
+            self._splitter = RecursiveCharacterTextSplitter(chunk_size=1000, is_separator_regex=True, separators=[REGEX_PATTERN])
+        return self._splitter.split_text(docs)
 
     def chunk_pdfs(self, loaded_docs):
         """Process each document and split into chunks at title boundaries."""
-        chunked_docs = []
         logger.info(f"Chunking documents...{len(loaded_docs)}")
+        return list(self.iter_chunks(loaded_docs))
+
+    def iter_chunks(self, loaded_docs, blips=None):
+        """Lazily split each document into chunks as it arrives.
+
+        When a `blips` list is given, the blip records parsed for the chunk
+        metadata are appended to it as well, see `extract_blips`.
+        """
         for doc_dict in loaded_docs:
             base_metadata = self._process_base_metadata(doc_dict.metadata)
             cleaned_page_content = self._cleanup_page_content(doc_dict.page_content)
             final_metadata = self._process_metadata(cleaned_page_content, base_metadata)
-            chunks = self.split_using_lib(cleaned_page_content)
-            for chunk in chunks:
-                chunk_title_response = re.match(r'\d{1,3}\. [^"\n]+', chunk)
+            if blips is not None:
+                blips.extend(self._blip_records(final_metadata))
+            for chunk in self.split_using_lib(cleaned_page_content):
+                chunk_title_response = CHUNK_TITLE_PATTERN.match(chunk)
                 if chunk_title_response:
                     chunk_title = chunk_title_response.group(0).strip()
-                    chunked_docs.extend([Document(page_content=chunk, metadata=final_metadata.get(chunk_title, base_metadata)) ])
+                    yield Document(page_content=chunk, metadata=final_metadata.get(chunk_title, base_metadata))
                 else:
-                    chunked_docs.extend([Document(page_content=chunk, metadata=base_metadata) ])
-        return chunked_docs
+                    yield Document(page_content=chunk, metadata=base_metadata)
+
+    def extract_blips(self, loaded_docs):
+        """Return one record per blip with its number, name, quadrant, ring and volume."""
+        blips = []
+        for doc_dict in loaded_docs:
+            base_metadata = self._process_base_metadata(doc_dict.metadata)
+            cleaned_page_content = self._cleanup_page_content(doc_dict.page_content)
+            blips.extend(self._blip_records(self._process_metadata(cleaned_page_content, base_metadata)))
+        return blips
+
+    @staticmethod
+    def _blip_records(final_metadata):
+        for title, metadata in final_metadata.items():
+            number, _, name = title.partition(". ")
+            yield {
+                "number": int(number),
+                "name": name.strip(),
+                "quadrant": WHITESPACE_PATTERN.sub(" ", metadata["quadrant"]),
+                "ring": metadata["ring"],
+                "volume": metadata["volume"],
+                "title": metadata["title"],
+            }
 
     def _cleanup_page_content(self, raw_page_content):
-        mega_pattern = (
-            r"(Hold\s+HoldAssess\s+AssessTrial\s+TrialAdopt\s+Adopt\s*\n(?:\s*\d+(?:\s+\d+)*\s*\n?)*)"
-            r"|(©\s*Thoughtworks,\s*Inc\.\s*All\s*Rights\s*Reserved\.(?:\s*\n\s*\d+)?)"
-            r"|(?:New\s+Moved\s+in/out\s+No\s+change)"
-        )
-        cleaned = re.sub(mega_pattern, "", raw_page_content, flags=re.MULTILINE)
+        cleaned = raw_page_content
+        for pattern in CLEANUP_PATTERNS:
+            cleaned = pattern.sub("", cleaned)
         return cleaned.strip()
 
     def _process_metadata(self, cleaned_text, base_metadata):
+        """Collect the blips listed under each quadrant's rings in one scan of the text.
+
+        A quadrant listing starts at the quadrant title followed by an "Adopt"
+        line and ends at the first blank line after its "Hold" ring. Only the
+        first listing of each quadrant is used.
+        """
         result = {}
-        for quadrant_title in ["Techniques", "Platforms", "Tools", "Languages and \nFrameworks"]:
-            quadrant_search_response = self._extract_whole_quadrant(quadrant_title, cleaned_text)
-
-            if quadrant_search_response:
-                quadrant_data = quadrant_search_response.group(0)
-                ring_ends = {
-                    "Adopt": "Trial",
-                    "Trial": "Assess",
-                    "Assess": "Hold",
-                    "Hold": r"\s*\n|\Z",
-                }
-                for ring_title in ["Adopt", "Trial", "Assess", "Hold"]:
-                    ring_search_response = self._extract_ring(ring_title, ring_ends[ring_title], quadrant_data)
-                    if ring_search_response:
-                        ring_data = ring_search_response.group(0)
-                        for searched_ring_item in re.findall(r"\d+\..*?(?=\n\d+\.|\n*$)", ring_data, re.DOTALL):
-                            ring_item = searched_ring_item.strip()
-                            if ring_item and re.match(r"\d+\.", ring_item):
-                                cleaned_item = re.sub(r"\s+", " ", ring_item).strip()
-                                result[cleaned_item] = {
-                                    **base_metadata,
-                                    "quadrant": quadrant_title,
-                                    "ring": ring_title,
-                                }
+        seen_quadrants = set()
+        # "Adopt" is a literal the regex engine finds quickly; the quadrant title
+        # is then only checked in the short window before each occurrence.
+        for match in ADOPT_PATTERN.finditer(cleaned_text):
+            window_start = max(0, match.start() - QUADRANT_HEADING_WINDOW)
+            heading = QUADRANT_HEADING_PATTERN.search(cleaned_text, window_start, match.start())
+            if not heading or heading.group(1) in seen_quadrants:
+                continue
+            quadrant = heading.group(1)
+            seen_quadrants.add(quadrant)
+            lines = self._listing_lines(cleaned_text, match.start())
+            for title, ring in self._parse_listing(lines):
+                result[title] = {**base_metadata, "quadrant": quadrant, "ring": ring}
+            if len(seen_quadrants) == len(QUADRANT_TITLES):
+                break
         return result
 
-    def _extract_whole_quadrant(self, quadrant_name, cleaned_text):
-        quadrant_pattern = rf"{quadrant_name}\s*\n\s*Adopt(.*?Trial.*?Assess.*?Hold.*?)(?=\n\s*\n|$)"
-        return re.search(quadrant_pattern, cleaned_text, re.DOTALL)
+    @staticmethod
+    def _listing_lines(text, start):
+        """Yield lines from `start` up to the first blank line after the "Hold" ring."""
+        seen_hold = False
+        while start < len(text):
+            end = text.find("\n", start)
+            end = len(text) if end == -1 else end
+            line = text[start:end].strip()
+            if seen_hold and not line:
+                return
+            seen_hold = seen_hold or line == "Hold"
+            yield line
+            start = end + 1
 
-    def _extract_ring(self, ring_title, next_ring_title, quadrant_data):
-        ring_pattern = rf"{ring_title}\s*\n(.*?)(?=\n{next_ring_title})"
-        return re.search(ring_pattern, quadrant_data, re.DOTALL)
+    @staticmethod
+    def _parse_listing(lines):
+        """Yield (blip title, ring) pairs; a blip may span several lines."""
+        ring = None
+        next_rings = iter(RING_TITLES)
+        next_ring = next(next_rings)
+        item_lines = []
+        for line in lines:
+            if line == next_ring:
+                if item_lines:
+                    yield WHITESPACE_PATTERN.sub(" ", " ".join(item_lines)).strip(), ring
+                    item_lines = []
+                ring = line
+                next_ring = next(next_rings, None)
+            elif ring is None:
+                continue
+            elif item_lines and ITEM_START_PATTERN.match(line):
+                yield WHITESPACE_PATTERN.sub(" ", " ".join(item_lines)).strip(), ring
+                item_lines = [line]
+            elif item_lines:
+                item_lines.append(line)
+            elif item_start := ITEM_START_PATTERN.search(line):
+                item_lines = [line[item_start.start():]]
+        if item_lines:
+            yield WHITESPACE_PATTERN.sub(" ", " ".join(item_lines)).strip(), ring
 
     def _process_base_metadata(self, metadata):
         source = metadata.get("source")
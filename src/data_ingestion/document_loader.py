@@ -1,89 +1,221 @@
+import multiprocessing
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from langchain.docstore.document import Document
 from langchain_community.document_loaders import PyPDFLoader
-from pypdf import PdfReader
 
 from config import (
     PDF_FILE_PATTERN,
+    PDF_LOADER_MAX_WORKERS,
+    PDF_TEXT_CACHE_DIR,
+    PDF_TEXT_CACHE_ENABLED,
     TECH_RADAR_FILENAME_PATTERN,
 )
-from src.utils.logger import logger
+from src.data_ingestion.pdf_text_cache import PdfTextCache
+from src.utils.logger import logger, process_pool_logging
+
+DEFAULT_TEXT_CACHE_DIR = PDF_TEXT_CACHE_DIR if PDF_TEXT_CACHE_ENABLED else None
 
 
 class DocumentLoader:
     """Handles loading and validation of PDF documents."""
 
-    def __init__(self, folder_path: str):
+    def __init__(
+        self,
+        folder_path: str,
+        max_workers: int = PDF_LOADER_MAX_WORKERS,
+        text_cache_dir: str | Path | None = DEFAULT_TEXT_CACHE_DIR,
+    ):
         self.folder_path = Path(folder_path)
+        self.max_workers = max_workers
+        self.text_cache = PdfTextCache(text_cache_dir) if text_cache_dir else None
+
+    def load_radar_files(self, parallel: bool = False) -> list[Document]:
+        """Load every Tech Radar PDF in the folder.
+
+        Args:
+            parallel: Extract the files across a process pool of `max_workers`.
+
+        Returns:
+            The loaded documents, ordered by file name.
+        """
+        result_docs = list(self.iter_radar_files(parallel))
+        logger.info(f"Successfully loaded {len(result_docs)} Tech Radar PDF files")
+        return result_docs
+
+    def iter_radar_files(self, parallel: bool = False):
+        """Lazily load the Tech Radar PDFs in the folder, one file at a time.
 
-    def load_radar_files(self) -> list[Document]:
-        result_docs = []
+        Each file's documents are yielded as soon as that file is parsed, so
+        downstream stages can start before the last PDF is read.
+
+        Args:
+            parallel: Extract the files across a process pool of `max_workers`.
+
+        Yields:
+            The loaded documents, ordered by file name.
+        """
+        loaded_any = False
 
         try:
-            pdf_files = list(self.folder_path.glob(PDF_FILE_PATTERN))
+            pdf_files = sorted(self.folder_path.glob(PDF_FILE_PATTERN))
             if not pdf_files:
                 logger.warning(f"No PDF files found in directory: {self.folder_path}")
                 raise ValueError(f"No PDF files found in directory: {self.folder_path}")
 
-            for filepath in pdf_files:
-                try:
-                    logger.info(f"Loading {filepath}...")
-                    if self._isvalid_pdf(filepath):
-                        loader = PyPDFLoader(str(filepath), mode="single")
-                        doc = loader.load()
-                        result_docs.extend(doc)
-                        logger.info(f"Successfully loaded {filepath.name}")
-                    else:
-                        logger.warning(f"Skipping {filepath.name} as it is not a valid Tech Radar PDF file.")
-                except Exception as e:
-                    logger.error(f"Error processing file {filepath.name}: {e!s}")
-                    continue
+            for docs in self._load_files(pdf_files, parallel):
+                if docs:
+                    loaded_any = True
+                    yield from docs
 
         except Exception as e:
             logger.error(f"Facing exception while loading pdf files from {self.folder_path}: {e!s}")
             raise RuntimeError(f"Error accessing folder {self.folder_path}: {e!s}")
 
-        if not result_docs:
+        if not loaded_any:
             logger.error("Looks like loading pdf files is not successful")
             raise ValueError("Looks like loading pdf files is not successful")
 
-        logger.info(f"Successfully loaded {len(result_docs)} Tech Radar PDF files")
-        return result_docs
+    def _load_files(self, pdf_files, parallel):
+        """Yield the loaded documents per file, in the order of `pdf_files`.
+
+        Valid files found in the text cache are served from it; only the rest
+        are parsed, and their text is cached for the next run. Invalid or
+        unreadable files yield None.
+        """
+        if self.text_cache is None:
+            yield from self._parse_files(pdf_files, parallel)
+            return
+
+        keys = {filepath: self._cache_key(filepath) for filepath in pdf_files}
+        misses = [filepath for filepath, key in keys.items() if key and not self.text_cache.contains(key)]
+        parsed = self._parse_files(misses, parallel)
+        for filepath, key in keys.items():
+            if key is None:
+                yield None
+                continue
+            docs = None if filepath in misses else self.text_cache.get(filepath, key)
+            if docs is not None:
+                logger.info(f"Loaded {filepath.name} from the PDF text cache")
+            else:
+                # An unreadable cache entry falls back to parsing in this process.
+                docs = next(parsed) if filepath in misses else load_radar_file(filepath)
+                if docs:
+                    self.text_cache.put(key, docs)
+            yield docs
+
+    def _cache_key(self, filepath):
+        """Return the text cache key of a valid Tech Radar PDF, or None when the file is skipped."""
+        try:
+            if not _isvalid_radar_file(filepath):
+                logger.warning(f"Skipping {filepath.name} as it is not a valid Tech Radar PDF file.")
+                return None
+            return self.text_cache.key(filepath)
+        except Exception as e:
+            logger.error(f"Error processing file {filepath.name}: {e!s}")
+            return None
+
+    def _parse_files(self, pdf_files, parallel):
+        """Yield the parsed documents per file, in the order of `pdf_files`.
+
+        In parallel at most `max_workers` files are parsed ahead of the
+        consumer, so parsed files do not pile up when it reads slowly.
+        """
+        if not parallel or self.max_workers <= 1 or len(pdf_files) <= 1:
+            for filepath in pdf_files:
+                yield load_radar_file(filepath)
+            return
+
+        workers = min(self.max_workers, len(pdf_files))
+        logger.info(f"Loading {len(pdf_files)} PDF files with {workers} workers")
+        context = _pool_context()
+        with process_pool_logging(context) as (initializer, initargs), ProcessPoolExecutor(
+            max_workers=workers, mp_context=context, initializer=initializer, initargs=initargs,
+        ) as pool:
+            in_flight = deque((filepath, pool.submit(load_radar_file, filepath)) for filepath in pdf_files[:workers])
+            queued = iter(pdf_files[workers:])
+            while in_flight:
+                filepath, future = in_flight.popleft()
+                try:
+                    docs = future.result()
+                except Exception as e:
+                    logger.error(f"Error processing file {filepath.name}: {e!s}")
+                    docs = None
+                if (next_file := next(queued, None)) is not None:
+                    in_flight.append((next_file, pool.submit(load_radar_file, next_file)))
+                yield docs
 
-    def _isvalid_pdf(self, filepath: Path) -> bool:
-        if filepath.suffix.lower() != ".pdf":
-            logger.error(f"Not a PDF file: {filepath}")
-            return False
 
-        if filepath.stat().st_size == 0:
-            logger.error(f"Empty file: {filepath}")
-            return False
+def _pool_context():
+    """Return a start method that does not fork this process, which runs threads by now.
 
-        try:
-            with filepath.open("rb") as f:
-                pdf = PdfReader(f)
+    A forkserver is preferred where available: its workers fork from a server
+    that has already imported this module, so they start without re-importing it.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([__name__])
+    return context
 
-                # # Check if it's a Tech Radar PDF
-                # if pdf.metadata["author"] == TECH_RADAR_AUTHOR and pdf.metadata["title"] == TECH_RADAR_TITLE:
-                #     logger.error(f"PDF metadata: {filepath}")
-                #     return False
 
-                # Check filename pattern
-                if not re.search(TECH_RADAR_FILENAME_PATTERN, filepath.name.lower()):
-                    logger.error(f"Not a Tech Radar PDF based on filename: {filepath}")
-                    return False
+def load_radar_file(filepath: Path) -> list[Document] | None:
+    """Validate and extract a single Tech Radar PDF.
 
-                # Check required metadata fields
-                # for field in REQUIRED_METADATA_FIELDS:
-                #     if field not in pdf.metadata:
-                #         logger.error(f"Missing required metadata field '{field}': {filepath}")
-                #         return False
+    The file is parsed exactly once; a PDF that cannot be parsed is treated as
+    invalid. Kept at module level so it can be pickled into a process pool.
 
-                logger.debug(f"PDF metadata: {pdf.metadata}")
-                return True
+    Returns:
+        The extracted documents, or None when the file is skipped or fails.
+    """
+    try:
+        logger.info(f"Loading {filepath}...")
+        if not _isvalid_radar_file(filepath):
+            logger.warning(f"Skipping {filepath.name} as it is not a valid Tech Radar PDF file.")
+            return None
 
+        try:
+            docs = PyPDFLoader(str(filepath), mode="single").load()
         except Exception as e:
             logger.error(f"Error validating PDF {filepath}: {e!s}")
-            return False
+            logger.warning(f"Skipping {filepath.name} as it is not a valid Tech Radar PDF file.")
+            return None
+
+        for doc in docs:
+            logger.debug(f"PDF metadata: {doc.metadata}")
+        logger.info(f"Successfully loaded {filepath.name}")
+    except Exception as e:
+        logger.error(f"Error processing file {filepath.name}: {e!s}")
+        return None
+    return docs
+
+
+def _isvalid_radar_file(filepath: Path) -> bool:
+    if filepath.suffix.lower() != ".pdf":
+        logger.error(f"Not a PDF file: {filepath}")
+        return False
+
+    if filepath.stat().st_size == 0:
+        logger.error(f"Empty file: {filepath}")
+        return False
+
+    # # Check if it's a Tech Radar PDF
+    # if pdf.metadata["author"] == TECH_RADAR_AUTHOR and pdf.metadata["title"] == TECH_RADAR_TITLE:
+    #     logger.error(f"PDF metadata: {filepath}")
+    #     return False
+
+    # Check filename pattern
+    if not re.search(TECH_RADAR_FILENAME_PATTERN, filepath.name.lower()):
+        logger.error(f"Not a Tech Radar PDF based on filename: {filepath}")
+        return False
+
+    # Check required metadata fields
+    # for field in REQUIRED_METADATA_FIELDS:
+    #     if field not in pdf.metadata:
+    #         logger.error(f"Missing required metadata field '{field}': {filepath}")
+    #         return False
+
+    return True
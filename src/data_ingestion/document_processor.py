@@ -2,6 +2,8 @@
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+from config import REGEX_PATTERN
+from src.data_ingestion.doc_processor_with_metadata import DocProcessorWithMetadata
 from src.utils.logger import logger
 
 
@@ -9,17 +11,26 @@ class DocumentProcessor:
     def __init__(self, chunk_size=1000, chunk_overlap=200):
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self._splitter = None
 
     def split_using_lib(self, docs):
-        pattern = r'\d{1,3}\. [^"\n]+\n(?:Adopt|Trial|Hold|Assess)'
-        splitter = RecursiveCharacterTextSplitter(chunk_size=1000, is_separator_regex=True, separators=[pattern])
-        return splitter.split_text(docs)
+        if self._splitter is None:
+            self._splitter = RecursiveCharacterTextSplitter(chunk_size=1000, is_separator_regex=True, separators=[REGEX_PATTERN])
+        return self._splitter.split_text(docs)
 
     def chunk_pdfs(self, loaded_docs):
         """Process each document and split into chunks at title boundaries."""
-        chunked_docs = []
         logger.info("Chunking documents...")
+        return list(self.iter_chunks(loaded_docs))
+
+    def iter_chunks(self, loaded_docs, blips=None):
+        """Lazily split each document into chunks as it arrives.
+
+        When a `blips` list is given, the blips each document lists are appended to it.
+        """
+        extractor = DocProcessorWithMetadata() if blips is not None else None
         for doc_dict in loaded_docs:
-            chunks = self.split_using_lib(doc_dict.page_content)
-            [ chunked_docs.extend([Document(page_content=chunk, metadata=doc_dict.metadata) ]) for chunk in chunks ]
-        return chunked_docs
+            if extractor:
+                blips.extend(extractor.extract_blips([doc_dict]))
+            for chunk in self.split_using_lib(doc_dict.page_content):
+                yield Document(page_content=chunk, metadata=doc_dict.metadata)
@@ -0,0 +1,62 @@
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pypdf
+from langchain_core.documents import Document
+
+from src.utils.logger import logger
+
+# Bump when the stored layout or the extraction mode changes.
+CACHE_FORMAT = "single-v1"
+
+
+class PdfTextCache:
+    """On-disk cache of text extracted from PDFs, keyed by file content and pypdf version.
+
+    Each entry is a gzipped JSON list of page text and metadata, so an unchanged
+    PDF is never parsed twice, whatever processor or chunk size is used later.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    @staticmethod
+    def key(filepath: Path) -> str:
+        digest = hashlib.sha256()
+        with Path(filepath).open("rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        digest.update(f"\0{pypdf.__version__}\0{CACHE_FORMAT}".encode())
+        return digest.hexdigest()
+
+    def contains(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def get(self, filepath: Path, key: str) -> list[Document] | None:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            pages = json.loads(gzip.decompress(path.read_bytes()))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable PDF text cache entry {path}: {e!s}")
+            return None
+        # The source path is re-pointed at the file as found now; it may have moved.
+        return [
+            Document(page_content=page["page_content"], metadata={**page["metadata"], "source": str(filepath)})
+            for page in pages
+        ]
+
+    def put(self, key: str, docs: list[Document]):
+        pages = [{"page_content": doc.page_content, "metadata": doc.metadata} for doc in docs]
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(gzip.compress(json.dumps(pages, default=str).encode("utf-8")))
+        tmp_path.replace(path)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json.gz"
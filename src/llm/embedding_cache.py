@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from array import array
+from functools import cache
+from pathlib import Path
+
+from langchain_core.embeddings import Embeddings
+
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+EMBEDDING_LATENCY = metrics.histogram("embedding_request_seconds", "Embedding provider latency on cache misses")
+
+class EmbeddingCache:
+    """Size-bounded SQLite store of embedding vectors kept as float32 rows.
+
+    Entries are keyed by embedding model alias and text hash and evicted least
+    recently used first once `max_entries` is exceeded. Cache hits do not write:
+    their use times are collected in memory and written `touch_batch_size` at a
+    time or with the next insert, and the entry count is kept in memory.
+    """
+
+    def __init__(self, path, max_entries=200_000, touch_batch_size=256):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.touch_batch_size = touch_batch_size
+        self.hits = 0
+        self.misses = 0
+        self._touched = {}
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used INTEGER NOT NULL)",
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON embeddings (last_used)")
+        self._conn.commit()
+        (self._entries,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+
+    @staticmethod
+    def key(model_alias: str, text: str) -> str:
+        return hashlib.sha256(f"{model_alias}\0{text}".encode()).hexdigest()
+
+    def get_many(self, model_alias: str, texts: list[str]) -> list[list[float] | None]:
+        keys = [self.key(model_alias, text) for text in texts]
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",  # noqa: S608
+                    batch,
+                ).fetchall()
+                found.update(rows)
+            now = time.time_ns()
+            self._touched.update(dict.fromkeys(found, now))
+            if len(self._touched) >= self.touch_batch_size:
+                self._write_touches()
+                self._conn.commit()
+            hits = sum(1 for key in keys if key in found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return [array("f", found[key]).tolist() if key in found else None for key in keys]
+
+    def put_many(self, model_alias: str, texts: list[str], vectors: list[list[float]]):
+        now = time.time_ns()
+        rows = [
+            (self.key(model_alias, text), array("f", vector).tobytes(), now)
+            for text, vector in zip(texts, vectors, strict=True)
+        ]
+        with self._lock:
+            # A key already stored holds the same model's vector for the same text; only its use time changes.
+            inserted = self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                rows,
+            ).rowcount
+            self._entries += inserted
+            self._touched.update((key, now) for key, _, _ in rows)
+            self._write_touches()
+            self._evict()
+            self._conn.commit()
+
+    def _write_touches(self):
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                [(last_used, key) for key, last_used in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self):
+        overflow = self._entries - self.max_entries
+        if overflow > 0:
+            self._entries -= self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                (overflow,),
+            ).rowcount
+            logger.debug(f"Evicted {overflow} entries from embedding cache {self.path}")
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": self._entries}
+
+
+@cache
+def get_embedding_cache(path: str, max_entries: int) -> EmbeddingCache:
+    """Return the process-wide cache instance for `path`."""
+    return EmbeddingCache(path, max_entries)
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that serves previously embedded texts from an EmbeddingCache."""
+
+    def __init__(self, embeddings: Embeddings, model_alias: str, cache: EmbeddingCache):
+        self.embeddings = embeddings
+        self.model_alias = model_alias
+        self.cache = cache
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        vectors = self.cache.get_many(self.model_alias, texts)
+        missing = self._missing_texts(texts, vectors)
+        if missing:
+            with EMBEDDING_LATENCY.time():
+                missing_vectors = self.embeddings.embed_documents(missing)
+            self._fill(vectors, texts, missing, missing_vectors)
+        return vectors
+
+    def embed_query(self, text: str) -> list[float]:
+        (vector,) = self.cache.get_many(self.model_alias, [text])
+        if vector is None:
+            with EMBEDDING_LATENCY.time():
+                vector = self.embeddings.embed_query(text)
+            self.cache.put_many(self.model_alias, [text], [vector])
+        return vector
+
+    # The async variants run the SQLite work on a worker thread to keep it off the event loop.
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        vectors = await asyncio.to_thread(self.cache.get_many, self.model_alias, texts)
+        missing = self._missing_texts(texts, vectors)
+        if missing:
+            with EMBEDDING_LATENCY.time():
+                missing_vectors = await self.embeddings.aembed_documents(missing)
+            await asyncio.to_thread(self._fill, vectors, texts, missing, missing_vectors)
+        return vectors
+
+    async def aembed_query(self, text: str) -> list[float]:
+        (vector,) = await asyncio.to_thread(self.cache.get_many, self.model_alias, [text])
+        if vector is None:
+            with EMBEDDING_LATENCY.time():
+                vector = await self.embeddings.aembed_query(text)
+            await asyncio.to_thread(self.cache.put_many, self.model_alias, [text], [vector])
+        return vector
+
+    @staticmethod
+    def _missing_texts(texts, vectors):
+        return list(dict.fromkeys(text for text, vector in zip(texts, vectors, strict=True) if vector is None))
+
+    def _fill(self, vectors, texts, missing, missing_vectors):
+        self.cache.put_many(self.model_alias, missing, missing_vectors)
+        computed = dict(zip(missing, missing_vectors, strict=True))
+        for i, text in enumerate(texts):
+            if vectors[i] is None:
+                vectors[i] = computed[text]
@@ -1,38 +1,145 @@
+import importlib
+import json
 import os
-from typing import Any
+import threading
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, ClassVar
 
-import litellm
+import httpx
 from dotenv import load_dotenv
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from langchain_litellm import ChatLiteLLM
-from langchain_ollama import OllamaEmbeddings
-from langchain_openai import OpenAIEmbeddings
-from litellm import completion
 
 from config import (
     DEFAULT_EMBEDDING_MODEL,
     DEFAULT_MODEL,
+    EMBEDDING_CACHE_ENABLED,
+    EMBEDDING_CACHE_MAX_ENTRIES,
+    EMBEDDING_CACHE_PATH,
     EMBEDDING_MODELS_CONFIG,
+    FALLBACK_MODELS,
     GEMINI,
+    HTTP_POOL_KEEPALIVE_EXPIRY,
+    HTTP_POOL_MAX_CONNECTIONS,
     LLM_COMMON_PARAMETERS,
     MODELS_CONFIG,
     OLLAMA,
     OPENAI,
 )
+from src.llm.embedding_cache import CachedEmbeddings, get_embedding_cache
+from src.llm.model_router import ModelRouter, RoutedChatModel
 from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+if TYPE_CHECKING:
+    from langchain_litellm import ChatLiteLLM
+
+LLM_LATENCY = metrics.histogram("llm_request_seconds", "LLM provider call latency reported by litellm")
+LLM_ERRORS = metrics.counter("llm_request_errors_total", "Failed LLM provider calls")
+
+# Provider SDKs are slow to import, so each one is loaded the first time it is
+# used and entry points only pay for the provider that is configured.
+_LAZY_IMPORTS = {
+    "litellm": ("litellm", None),
+    "completion": ("litellm", "completion"),
+    "acompletion": ("litellm", "acompletion"),
+    "ChatLiteLLM": ("langchain_litellm", "ChatLiteLLM"),
+    "OpenAIEmbeddings": ("langchain_openai", "OpenAIEmbeddings"),
+    "GoogleGenerativeAIEmbeddings": ("langchain_google_genai", "GoogleGenerativeAIEmbeddings"),
+    "OllamaEmbeddings": ("langchain_ollama", "OllamaEmbeddings"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_IMPORTS[name]
+    value = importlib.import_module(module_name)
+    if attribute:
+        value = getattr(value, attribute)
+    globals()[name] = value
+    return value
+
+
+def _lazy(name: str) -> Any:
+    """Return a provider symbol, preferring one already bound (or patched) on the module."""
+    return globals()[name] if name in globals() else __getattr__(name)
+
+
+def _http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=HTTP_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_POOL_MAX_CONNECTIONS,
+        keepalive_expiry=HTTP_POOL_KEEPALIVE_EXPIRY,
+    )
 
 
 class LLMModelManager:
-    def __init__(self):
-        load_dotenv()
+    """Resolves the configured chat and embedding models.
+
+    Clients are kept in a process-wide registry keyed by kind and resolved
+    parameters, so constructing the manager repeatedly is cheap and every caller
+    shares the same instances and keep-alive HTTP connections.
+    """
+
+    _clients: ClassVar[dict[str, Any]] = {}
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+    _http_client: ClassVar[httpx.Client | None] = None
+    _initialized: ClassVar[bool] = False
+    _litellm_configured: ClassVar[bool] = False
+
+    def __init__(self, model_alias=None):
         self._setup_environment()
-        self.model_alias = os.getenv("MODEL_NAME") or DEFAULT_MODEL
+        self.model_alias = model_alias or os.getenv("MODEL_NAME") or DEFAULT_MODEL
         self.embedding_model_alias = os.getenv("EMBEDDING_MODEL_NAME") or DEFAULT_EMBEDDING_MODEL
 
-    def _setup_environment(self):
-        """Setup litellm configuration."""
-        litellm.success_callback = [self._log_success]
-        litellm.failure_callback = [self._log_failure]
+    @classmethod
+    def _setup_environment(cls):
+        """Load the environment once per process."""
+        if cls._initialized:
+            return
+        with cls._lock:
+            if not cls._initialized:
+                load_dotenv()
+                cls._initialized = True
+
+    @classmethod
+    def _setup_litellm(cls):
+        """Import and configure litellm the first time a chat model is needed."""
+        if cls._litellm_configured:
+            return
+        with cls._lock:
+            if cls._litellm_configured:
+                return
+            litellm = _lazy("litellm")
+            litellm.success_callback = [cls._log_success]
+            litellm.failure_callback = [cls._log_failure]
+            litellm.client_session = cls._get_http_client()
+            cls._litellm_configured = True
+
+    @classmethod
+    def _get_http_client(cls) -> httpx.Client:
+        """Return the pooled keep-alive HTTP client shared by all providers."""
+        if cls._http_client is None:
+            cls._http_client = httpx.Client(limits=_http_limits(), timeout=httpx.Timeout(600.0, connect=10.0))
+        return cls._http_client
+
+    @classmethod
+    def clear_clients(cls):
+        """Drop every registered client, e.g. after the configuration changed."""
+        with cls._lock:
+            cls._clients.clear()
+
+    @classmethod
+    def _get_or_create(cls, kind: str, params: dict, factory: Callable[[], Any]) -> Any:
+        key = f"{kind}:{json.dumps(params, sort_keys=True, default=str)}"
+        client = cls._clients.get(key)
+        if client is None:
+            with cls._lock:
+                client = cls._clients.get(key)
+                if client is None:
+                    logger.info(f"Creating {kind} client for {params.get('model_alias', params.get('model'))}")
+                    client = factory()
+                    cls._clients[key] = client
+        return client
 
     def chat_completion(
         self,
@@ -49,31 +156,72 @@ class LLMModelManager:
         Returns:
             Completion response from the model
         """
+        self._setup_litellm()
+        params = self._prepare_chat_model_params()
+        params.update(kwargs)
+        return _lazy("completion")(
+            messages=messages,
+            drop_params=True,
+            **params,
+        )
+
+    async def achat_completion(
+        self,
+        messages: list[dict[str, str]],
+        **kwargs,
+    ) -> dict[str, Any]:
+        """Async variant of `chat_completion` using litellm's async completion."""
+        self._setup_litellm()
         params = self._prepare_chat_model_params()
         params.update(kwargs)
-        return completion(
+        return await _lazy("acompletion")(
             messages=messages,
             drop_params=True,
             **params,
         )
 
-    def get_chat_model(self, **kwargs) -> ChatLiteLLM:
+    def get_chat_model(self, **kwargs) -> "ChatLiteLLM | RoutedChatModel":
         """Get a chat model instance based on the configured provider.
 
+        When FALLBACK_MODELS lists further aliases, the configured model and
+        those are wrapped in a RoutedChatModel that hedges and fails over across them.
+
         Args:
             **kwargs: Additional parameters to override the default configuration.
 
         Returns:
             An instance of the appropriate chat model class.
         """
-        params = self._prepare_chat_model_params()
-        params.update(kwargs)
-        return ChatLiteLLM(**params)
+        self._setup_litellm()
+        if FALLBACK_MODELS:
+            return self._get_routed_chat_model(kwargs)
+        return self._get_single_chat_model(self.model_alias, kwargs)
+
+    def _get_single_chat_model(self, model_alias: str, overrides: dict) -> "ChatLiteLLM":
+        params = self._prepare_chat_model_params(model_alias)
+        params.update(overrides)
+        return self._get_or_create("chat", params, lambda: _lazy("ChatLiteLLM")(**params))
 
-    def get_embedding_model(self, **kwargs) -> Any:
+    def _get_routed_chat_model(self, overrides: dict) -> RoutedChatModel:
+        known_aliases = {model_config["model_alias"] for model_config in MODELS_CONFIG}
+        aliases = []
+        for alias in dict.fromkeys([self.model_alias, *FALLBACK_MODELS]):
+            if alias in known_aliases:
+                aliases.append(alias)
+            else:
+                logger.warning(f"Ignoring unknown model alias {alias} in FALLBACK_MODELS")
+        models = {alias: self._get_single_chat_model(alias, overrides) for alias in aliases}
+        return self._get_or_create(
+            "routed_chat",
+            {"model_alias": aliases, **overrides},
+            lambda: RoutedChatModel(router=ModelRouter(models)),
+        )
+
+    def get_embedding_model(self, cached: bool = EMBEDDING_CACHE_ENABLED, **kwargs) -> Any:
         """Get an embedding model instance based on the configured provider.
 
         Args:
+            cached: Serve previously embedded texts from the on-disk embedding cache.
             **kwargs: Additional parameters to override the default configuration.
 
         Returns:
@@ -81,25 +229,41 @@ class LLMModelManager:
         """
         params = self._prepare_embedding_model_params()
         params.update(kwargs)
+        embedding_model = self._get_or_create("embedding", params, lambda: self._create_embedding_model(params))
+        if not cached:
+            return embedding_model
+        return self._get_or_create(
+            "cached_embedding",
+            params,
+            lambda: CachedEmbeddings(
+                embedding_model,
+                self.embedding_model_alias,
+                get_embedding_cache(str(EMBEDDING_CACHE_PATH), EMBEDDING_CACHE_MAX_ENTRIES),
+            ),
+        )
+
+    def _create_embedding_model(self, params: dict) -> Any:
+        params = params.copy()
         provider = params.get("provider").lower()
 
         if provider == str(OPENAI).lower():
-            return OpenAIEmbeddings(**params)
+            return _lazy("OpenAIEmbeddings")(http_client=self._get_http_client(), **params)
         if provider == str(GEMINI).lower():
             params["google_api_key"] = os.environ["GEMINI_API_KEY"]
-            return GoogleGenerativeAIEmbeddings(**params)
+            return _lazy("GoogleGenerativeAIEmbeddings")(**params)
         if provider == str(OLLAMA).lower():
             model = params.get("model")
             base_url = params.get("api_base")
-            return OllamaEmbeddings(model=model, base_url=base_url)
+            return _lazy("OllamaEmbeddings")(model=model, base_url=base_url, client_kwargs={"limits": _http_limits()})
         error_msg = f"Unsupported provider: {provider}. Must be one of: openai, google, ollama"
         raise ValueError(error_msg)
 
-    def _prepare_chat_model_params(self):
+    def _prepare_chat_model_params(self, model_alias=None):
         params = LLM_COMMON_PARAMETERS.copy()
+        model_alias = model_alias or self.model_alias
 
         for model_config in MODELS_CONFIG:
-            if model_config["model_alias"] == self.model_alias:
+            if model_config["model_alias"] == model_alias:
                 params.update(model_config)
                 break
         return params
@@ -113,16 +277,29 @@ class LLMModelManager:
                 break
         return params
 
-    def _log_success(self, kwargs, _, start_time, end_time):
-        """Callback for successful API calls."""
-        logger.info("LITELLM: in success callback function")
-        logger.info("kwargs %s", kwargs["litellm_call_id"])
-        logger.info("start_time %s", start_time)
-        logger.info("end_time %s", end_time)
-
-    def _log_failure(self, _, error_response, start_time, end_time):
-        """Callback for failed API calls."""
-        logger.error("LITELLM: in failure callback function")
-        logger.error("error_response %s", error_response)
-        logger.error("start_time %s", start_time)
-        logger.error("end_time %s", end_time)
+    @staticmethod
+    def _log_success(kwargs, completion_response, start_time, end_time):
+        """Callback for successful API calls; logs one structured record per call."""
+        usage = getattr(completion_response, "usage", None)
+        record = _call_record(kwargs, start_time, end_time)
+        record["prompt_tokens"] = getattr(usage, "prompt_tokens", None)
+        record["completion_tokens"] = getattr(usage, "completion_tokens", None)
+        LLM_LATENCY.observe(record["duration_ms"] / 1000)
+        logger.info("llm_call %s", json.dumps(record))
+
+    @staticmethod
+    def _log_failure(kwargs, error_response, start_time, end_time):
+        """Callback for failed API calls; logs one structured record per call."""
+        record = _call_record(kwargs, start_time, end_time)
+        record["error"] = str(error_response)
+        LLM_ERRORS.inc()
+        logger.error("llm_call %s", json.dumps(record))
+
+
+def _call_record(kwargs, start_time, end_time) -> dict[str, Any]:
+    return {
+        "call_id": kwargs.get("litellm_call_id"),
+        "model": kwargs.get("model"),
+        "stream": bool(kwargs.get("stream")),
+        "duration_ms": round((end_time - start_time).total_seconds() * 1000, 1),
+    }
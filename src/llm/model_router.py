@@ -0,0 +1,346 @@
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from functools import partial
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import ConfigDict
+
+from config import (
+    HEDGE_DEFAULT_DELAY_SECONDS,
+    HEDGE_ENABLED,
+    HEDGE_MAX_IN_FLIGHT,
+    HEDGE_MIN_DELAY_SECONDS,
+    HEDGE_QUANTILE,
+    HTTP_POOL_MAX_CONNECTIONS,
+    ROUTER_COOLDOWN_SECONDS,
+    ROUTER_MAX_CONSECUTIVE_FAILURES,
+    ROUTER_MAX_ERROR_RATE,
+    ROUTER_MIN_SAMPLES,
+    ROUTER_WINDOW_SIZE,
+)
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+HEDGED_REQUESTS = metrics.counter("llm_hedged_requests_total", "Duplicate LLM requests sent after the hedge deadline")
+FAILOVERS = metrics.counter("llm_failovers_total", "LLM requests retried on the next model after a failure")
+
+# Latency is tracked separately for complete responses and for the first streamed chunk.
+RESPONSE = "response"
+FIRST_CHUNK = "first_chunk"
+
+
+class ProviderStats:
+    """Rolling latency and error window of one model alias, with a circuit breaker.
+
+    A model is ejected for `cooldown` seconds after `max_consecutive_failures`
+    failures in a row, or when more than `max_error_rate` of the recent window
+    failed. Once the cooldown passes it is tried again.
+    """
+
+    def __init__(self, alias: str, window_size: int = ROUTER_WINDOW_SIZE):
+        self.alias = alias
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self._latencies = {RESPONSE: deque(maxlen=window_size), FIRST_CHUNK: deque(maxlen=window_size)}
+        self._outcomes = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+
+    def record_success(self, kind: str, latency: float):
+        with self._lock:
+            self._latencies[kind].append(latency)
+            self._outcomes.append(True)
+            self.consecutive_failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._outcomes.append(False)
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= ROUTER_MAX_CONSECUTIVE_FAILURES or (
+                len(self._outcomes) >= ROUTER_MIN_SAMPLES and self._error_rate() > ROUTER_MAX_ERROR_RATE
+            ):
+                self.ejected_until = time.monotonic() + ROUTER_COOLDOWN_SECONDS
+                logger.warning(
+                    f"Ejecting model {self.alias} for {ROUTER_COOLDOWN_SECONDS:g}s: "
+                    f"{self.consecutive_failures} consecutive failures, error rate {self._error_rate():.0%}",
+                )
+
+    def is_healthy(self) -> bool:
+        return time.monotonic() >= self.ejected_until
+
+    def error_rate(self) -> float:
+        with self._lock:
+            return self._error_rate()
+
+    def _error_rate(self):
+        return self._outcomes.count(False) / len(self._outcomes) if self._outcomes else 0.0
+
+    def latency_quantile(self, kind: str, q: float = 0.95) -> float | None:
+        """Return the nearest-rank quantile of recent latencies, or None with too few samples."""
+        with self._lock:
+            window = sorted(self._latencies[kind])
+        if len(window) < ROUTER_MIN_SAMPLES:
+            return None
+        return window[min(len(window) - 1, math.ceil(q * len(window)) - 1)]
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "healthy": self.is_healthy(),
+            "error_rate": round(self.error_rate(), 3),
+            "p95_seconds": self.latency_quantile(RESPONSE),
+            "first_chunk_p95_seconds": self.latency_quantile(FIRST_CHUNK),
+        }
+
+
+class ModelRouter:
+    """Routes each LLM call across several chat models.
+
+    Calls go to the first healthy model in configured order. If it has not
+    answered by its hedge deadline (the HEDGE_QUANTILE of its recent latencies,
+    p95 by default, or HEDGE_DEFAULT_DELAY_SECONDS until enough samples exist)
+    a duplicate request is sent to the next model, up to `max_in_flight` at
+    once, and the first answer wins. A failed call fails over to the next model; the last error is
+    raised once every model has failed.
+    """
+
+    def __init__(
+        self,
+        models: dict[str, BaseChatModel],
+        hedge: bool = HEDGE_ENABLED,
+        max_in_flight: int = HEDGE_MAX_IN_FLIGHT,
+    ):
+        self.models = models
+        self.stats = {alias: ProviderStats(alias) for alias in models}
+        self.hedge = hedge
+        self.max_in_flight = max_in_flight
+        self._pool = ThreadPoolExecutor(max_workers=HTTP_POOL_MAX_CONNECTIONS, thread_name_prefix="llm-router")
+
+    def candidates(self) -> list[str]:
+        """Return the aliases in try order: healthy models first, ejected ones as a last resort."""
+        healthy = [alias for alias in self.models if self.stats[alias].is_healthy()]
+        return healthy + [alias for alias in self.models if alias not in healthy]
+
+    def deadline(self, alias: str, kind: str = RESPONSE) -> float:
+        """Return the seconds to wait on `alias` before hedging."""
+        latency = self.stats[alias].latency_quantile(kind, HEDGE_QUANTILE)
+        return HEDGE_DEFAULT_DELAY_SECONDS if latency is None else max(HEDGE_MIN_DELAY_SECONDS, latency)
+
+    def status(self) -> dict[str, dict[str, Any]]:
+        return {alias: stats.status() for alias, stats in self.stats.items()}
+
+    def invoke(self, call: Callable[[BaseChatModel], Any], kind: str = RESPONSE, discard: Callable | None = None) -> Any:
+        """Return `call(model)` from the first model to answer, hedging and failing over as needed.
+
+        Calls that lose the race cannot be interrupted; `discard`, if given, is
+        called with each of their results once they finish.
+        """
+        remaining = self.candidates()
+        pending, errors = {}, []
+        latest = self._submit(pending, remaining, call, kind)
+        try:
+            while pending:
+                timeout = self._hedge_timeout(latest, kind, pending, remaining)
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    latest = self._hedge(pending, remaining, latest, kind, lambda: self._submit(pending, remaining, call, kind))
+                    continue
+                for future in done:
+                    alias = pending.pop(future)
+                    if future.exception() is None:
+                        return future.result()
+                    errors.append((alias, future.exception()))
+                if not pending and remaining:
+                    latest = self._failover(errors, lambda: self._submit(pending, remaining, call, kind))
+        finally:
+            for future in pending:
+                future.cancel()
+                if discard:
+                    future.add_done_callback(partial(_discard_result, discard))
+        raise self._exhausted(errors)
+
+    async def ainvoke(self, call: Callable[[BaseChatModel], Any], kind: str = RESPONSE, discard: Callable | None = None) -> Any:
+        """Async variant of `invoke`; `call(model)` and `discard(result)` return awaitables."""
+        remaining = self.candidates()
+        pending, errors = {}, []
+        latest = self._start(pending, remaining, call, kind)
+        try:
+            while pending:
+                timeout = self._hedge_timeout(latest, kind, pending, remaining)
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    latest = self._hedge(pending, remaining, latest, kind, lambda: self._start(pending, remaining, call, kind))
+                    continue
+                for task in done:
+                    alias = pending.pop(task)
+                    if task.exception() is None:
+                        return task.result()
+                    errors.append((alias, task.exception()))
+                if not pending and remaining:
+                    latest = self._failover(errors, lambda: self._start(pending, remaining, call, kind))
+        finally:
+            # Tasks that finished together with the winner are still pending and keep their result.
+            for task in pending:
+                task.cancel()
+            results = await asyncio.gather(*pending, return_exceptions=True)
+            if discard:
+                for result in results:
+                    if not isinstance(result, BaseException):
+                        await discard(result)
+        raise self._exhausted(errors)
+
+    def stream(self, call: Callable[[BaseChatModel], Any]):
+        """Yield the chunks of `call(model)`, racing the models on their first chunk.
+
+        Errors after the first chunk are raised, as the partial answer has already been sent.
+        """
+
+        def open_stream(model):
+            iterator = iter(call(model))
+            try:
+                return iterator, next(iterator, None)
+            except BaseException:
+                _close(iterator)
+                raise
+
+        iterator, first = self.invoke(open_stream, kind=FIRST_CHUNK, discard=lambda opened: _close(opened[0]))
+        try:
+            if first is not None:
+                yield first
+            yield from iterator
+        finally:
+            _close(iterator)
+
+    async def astream(self, call: Callable[[BaseChatModel], Any]):
+        """Async variant of `stream`; `call(model)` returns an async iterator."""
+
+        async def open_stream(model):
+            iterator = aiter(call(model))
+            try:
+                return iterator, await anext(iterator, None)
+            except BaseException:
+                await _aclose(iterator)
+                raise
+
+        iterator, first = await self.ainvoke(open_stream, kind=FIRST_CHUNK, discard=lambda opened: _aclose(opened[0]))
+        try:
+            if first is not None:
+                yield first
+            async for chunk in iterator:
+                yield chunk
+        finally:
+            await _aclose(iterator)
+
+    def _hedge_timeout(self, latest, kind, pending, remaining):
+        if self.hedge and remaining and len(pending) < self.max_in_flight:
+            return self.deadline(latest, kind)
+        return None
+
+    @staticmethod
+    def _hedge(pending, remaining, latest, kind, launch):
+        HEDGED_REQUESTS.inc()
+        logger.info(f"Hedging {kind} request to {remaining[0]}: {latest} is past its deadline, {len(pending)} in flight")
+        return launch()
+
+    @staticmethod
+    def _failover(errors, launch):
+        FAILOVERS.inc()
+        alias, error = errors[-1]
+        logger.warning(f"Model {alias} failed, failing over: {error!s}")
+        return launch()
+
+    @staticmethod
+    def _exhausted(errors):
+        alias, error = errors[-1]
+        error.add_note(f"Every routed model failed: {', '.join(failed for failed, _ in errors)}")
+        logger.error(f"Every routed model failed; last error from {alias}: {error!s}")
+        return error
+
+    def _submit(self, pending, remaining, call, kind):
+        alias = remaining.pop(0)
+        pending[self._pool.submit(copy_context().run, self._call, alias, call, kind)] = alias
+        return alias
+
+    def _start(self, pending, remaining, call, kind):
+        alias = remaining.pop(0)
+        pending[asyncio.ensure_future(self._acall(alias, call, kind))] = alias
+        return alias
+
+    def _call(self, alias, call, kind):
+        start = time.perf_counter()
+        try:
+            result = call(self.models[alias])
+        except Exception:
+            self.stats[alias].record_failure()
+            raise
+        self.stats[alias].record_success(kind, time.perf_counter() - start)
+        return result
+
+    async def _acall(self, alias, call, kind):
+        start = time.perf_counter()
+        try:
+            result = await call(self.models[alias])
+        except Exception:
+            self.stats[alias].record_failure()
+            raise
+        self.stats[alias].record_success(kind, time.perf_counter() - start)
+        return result
+
+
+def _discard_result(discard, future):
+    if not future.cancelled() and future.exception() is None:
+        discard(future.result())
+
+
+def _close(iterator):
+    if close := getattr(iterator, "close", None):
+        close()
+
+
+async def _aclose(iterator):
+    if aclose := getattr(iterator, "aclose", None):
+        await aclose()
+
+
+class RoutedChatModel(BaseChatModel):
+    """Chat model that sends every call through a ModelRouter."""
+
+    router: ModelRouter
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @property
+    def _llm_type(self) -> str:
+        return "routed"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"models": list(self.router.models)}
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:  # noqa: ARG002
+        message = self.router.invoke(lambda model: model.invoke(messages, stop=stop, **kwargs))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:  # noqa: ARG002
+        message = await self.router.ainvoke(lambda model: model.ainvoke(messages, stop=stop, **kwargs))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        for chunk in self.router.stream(lambda model: model.stream(messages, stop=stop, **kwargs)):
+            generation = ChatGenerationChunk(message=chunk)
+            if run_manager:
+                run_manager.on_llm_new_token(generation.text, chunk=generation)
+            yield generation
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        async for chunk in self.router.astream(lambda model: model.astream(messages, stop=stop, **kwargs)):
+            generation = ChatGenerationChunk(message=chunk)
+            if run_manager:
+                await run_manager.on_llm_new_token(generation.text, chunk=generation)
+            yield generation
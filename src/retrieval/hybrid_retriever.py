@@ -0,0 +1,53 @@
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+
+from config import HYBRID_FETCH_K, RETRIEVER_K, RRF_K
+from src.vector_store.bm25_index import BM25Index
+
+
+def reciprocal_rank_fusion(rankings: list[list[Document]], k: int, rrf_k: int = RRF_K) -> list[Document]:
+    """Merge ranked document lists by summing 1 / (rrf_k + rank) per document ID."""
+    scores = {}
+    documents = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, start=1):
+            key = doc.id or doc.page_content
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+            documents.setdefault(key, doc)
+    ranked_keys = sorted(scores, key=scores.get, reverse=True)
+    return [documents[key] for key in ranked_keys[:k]]
+
+
+class HybridRetriever(BaseRetriever):
+    """Fuses vector similarity and BM25 keyword rankings with reciprocal rank fusion.
+
+    `vector_retriever` should already be configured to return `fetch_k`
+    candidates; the fused list is trimmed to `k`.
+    """
+
+    vector_retriever: BaseRetriever
+    bm25_index: BM25Index
+    k: int = RETRIEVER_K
+    fetch_k: int = HYBRID_FETCH_K
+    rrf_k: int = RRF_K
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> list[Document]:
+        vector_docs = self.vector_retriever.invoke(query, config={"callbacks": run_manager.get_child()})
+        return self._fuse(query, vector_docs)
+
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun,
+    ) -> list[Document]:
+        vector_docs = await self.vector_retriever.ainvoke(query, config={"callbacks": run_manager.get_child()})
+        return self._fuse(query, vector_docs)
+
+    def _fuse(self, query, vector_docs):
+        keyword_docs = [doc for doc, _ in self.bm25_index.search(query, self.fetch_k)]
+        return reciprocal_rank_fusion([vector_docs, keyword_docs], self.k, self.rrf_k)
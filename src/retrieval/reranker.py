@@ -0,0 +1,176 @@
+import math
+from collections import Counter
+from typing import Any, Protocol
+
+import numpy as np
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+
+from config import (
+    CONTEXT_TOKEN_BUDGET,
+    RERANK_DEDUP_THRESHOLD,
+    RERANK_MIN_SCORE,
+    RETRIEVER_K,
+)
+from src.utils.logger import logger
+from src.utils.token_counter import estimate_tokens, truncate_to_tokens
+from src.vector_store.bm25_index import BM25Index, tokenize
+
+CONTEXT_HEADER_FIELDS = ["title", "quadrant", "ring"]
+
+
+class Scorer(Protocol):
+    def score(self, query: str, documents: list[Document]) -> list[float]: ...
+
+    async def ascore(self, query: str, documents: list[Document]) -> list[float]: ...
+
+
+class LexicalScorer:
+    """BM25 score of each candidate, with term statistics taken over the candidates only."""
+
+    def score(self, query: str, documents: list[Document]) -> list[float]:
+        query_terms = set(tokenize(query))
+        term_counts = [Counter(tokenize(doc.page_content)) for doc in documents]
+        if not query_terms or not documents:
+            return [0.0] * len(documents)
+
+        lengths = [sum(counts.values()) for counts in term_counts]
+        avg_length = sum(lengths) / len(lengths) or 1.0
+        idf = {}
+        for term in query_terms:
+            doc_freq = sum(term in counts for counts in term_counts)
+            if doc_freq:
+                idf[term] = math.log(1 + (len(documents) - doc_freq + 0.5) / (doc_freq + 0.5))
+
+        scores = []
+        for counts, length in zip(term_counts, lengths, strict=True):
+            norm = BM25Index.K1 * (1 - BM25Index.B + BM25Index.B * length / avg_length)
+            scores.append(sum(
+                weight * counts[term] * (BM25Index.K1 + 1) / (counts[term] + norm)
+                for term, weight in idf.items()
+                if counts[term]
+            ))
+        return scores
+
+    async def ascore(self, query: str, documents: list[Document]) -> list[float]:
+        return self.score(query, documents)
+
+
+class EmbeddingScorer:
+    """Cosine similarity between the query and candidate embeddings."""
+
+    def __init__(self, embedding_model):
+        self.embedding_model = embedding_model
+
+    def score(self, query: str, documents: list[Document]) -> list[float]:
+        if not documents:
+            return []
+        query_vector = self.embedding_model.embed_query(query)
+        doc_vectors = self.embedding_model.embed_documents([doc.page_content for doc in documents])
+        return _cosine(query_vector, doc_vectors)
+
+    async def ascore(self, query: str, documents: list[Document]) -> list[float]:
+        if not documents:
+            return []
+        query_vector = await self.embedding_model.aembed_query(query)
+        doc_vectors = await self.embedding_model.aembed_documents([doc.page_content for doc in documents])
+        return _cosine(query_vector, doc_vectors)
+
+
+def _cosine(query_vector, doc_vectors) -> list[float]:
+    query = np.asarray(query_vector, dtype=np.float32)
+    matrix = np.asarray(doc_vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1.0)
+    return (matrix @ query / np.where(norms == 0, 1.0, norms)).tolist()
+
+
+def build_scorer(name: str, embedding_model=None) -> Scorer:
+    """Create the scorer named by RERANK_SCORER: "lexical" or "embedding"."""
+    if name == "lexical":
+        return LexicalScorer()
+    if name == "embedding":
+        return EmbeddingScorer(embedding_model)
+    raise ValueError(f"Unsupported reranking scorer: {name}. Must be one of: lexical, embedding")
+
+
+def format_document(doc: Document) -> str:
+    """Render a chunk for the prompt, prefixed with its radar title, quadrant and ring."""
+    header = " | ".join(str(doc.metadata[field]) for field in CONTEXT_HEADER_FIELDS if doc.metadata.get(field))
+    return f"[{header}]\n{doc.page_content}" if header else doc.page_content
+
+
+def format_context(docs: list[Document]) -> str:
+    return "\n\n".join(format_document(doc) for doc in docs)
+
+
+def _jaccard(left: set, right: set) -> float:
+    union = len(left | right)
+    return len(left & right) / union if union else 1.0
+
+
+class RerankingRetriever(BaseRetriever):
+    """Reranks over-fetched candidates and trims them to a prompt token budget.
+
+    `base_retriever` should return more candidates than `k`. They are scored
+    with `scorer`, near-duplicates are dropped and the best chunks are kept
+    until `k` chunks or `token_budget` tokens of formatted context are reached.
+    The best chunk is always kept, truncated if it alone exceeds the budget.
+    """
+
+    base_retriever: BaseRetriever
+    scorer: Any
+    k: int = RETRIEVER_K
+    token_budget: int = CONTEXT_TOKEN_BUDGET
+    min_score: float = RERANK_MIN_SCORE
+    dedup_threshold: float = RERANK_DEDUP_THRESHOLD
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> list[Document]:
+        candidates = self.base_retriever.invoke(query, config={"callbacks": run_manager.get_child()})
+        return self.rerank(query, candidates)
+
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun,
+    ) -> list[Document]:
+        candidates = await self.base_retriever.ainvoke(query, config={"callbacks": run_manager.get_child()})
+        return self._select(candidates, await self.scorer.ascore(query, candidates))
+
+    def rerank(self, query: str, candidates: list[Document]) -> list[Document]:
+        """Rerank candidates fetched elsewhere, such as by a batch search."""
+        return self._select(candidates, self.scorer.score(query, candidates))
+
+    def _select(self, candidates, scores):
+        ranked = sorted(zip(scores, candidates, strict=True), key=lambda pair: pair[0], reverse=True)
+        selected, selected_terms, seen_ids = [], [], set()
+        used_tokens = 0
+        for score, doc in ranked:
+            if len(selected) == self.k or (selected and score < self.min_score):
+                break
+            terms = set(tokenize(doc.page_content))
+            if (doc.id and doc.id in seen_ids) or any(
+                _jaccard(terms, other) >= self.dedup_threshold for other in selected_terms
+            ):
+                continue
+
+            page_content = doc.page_content
+            tokens = estimate_tokens(format_document(doc))
+            if used_tokens + tokens > self.token_budget:
+                if selected:
+                    continue  # a shorter, lower ranked chunk may still fit
+                header_tokens = tokens - estimate_tokens(page_content)
+                page_content = truncate_to_tokens(page_content, max(1, self.token_budget - header_tokens))
+                tokens = self.token_budget
+
+            selected.append(Document(id=doc.id, page_content=page_content, metadata={**doc.metadata, "rerank_score": score}))
+            selected_terms.append(terms)
+            seen_ids.add(doc.id)
+            used_tokens += tokens
+
+        logger.info(f"Reranked {len(candidates)} candidates to {len(selected)} chunks, ~{used_tokens} context tokens")
+        return selected
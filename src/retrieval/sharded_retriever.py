@@ -0,0 +1,94 @@
+import asyncio
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import Any
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.runnables.config import run_in_executor
+from pydantic import ConfigDict
+
+from config import HYBRID_FETCH_K, RETRIEVER_K, RRF_K, SHARD_SEARCH_MAX_WORKERS
+from src.retrieval.hybrid_retriever import reciprocal_rank_fusion
+from src.vector_store.blip_index import VOLUME_PATTERN
+from src.vector_store.bm25_index import BM25Index
+
+# Shared by every retriever; the index lookups release the GIL, so shards are searched concurrently.
+_SEARCH_POOL = ThreadPoolExecutor(max_workers=SHARD_SEARCH_MAX_WORKERS, thread_name_prefix="shard-search")
+
+
+def _top_documents(hits, n: int) -> list[Document]:
+    """Return the documents of the `n` highest scoring (document, score) pairs."""
+    return [doc for doc, _ in heapq.nlargest(n, hits, key=itemgetter(1))]
+
+
+class ShardedRetriever(BaseRetriever):
+    """Searches one store per radar volume and merges their results.
+
+    A question naming a volume ("... in Vol 31") only searches that volume's
+    shard. Otherwise the question is embedded once and every shard searched in
+    parallel; vector hits are merged by relevance score and, when BM25 indexes
+    are given, fused with the merged keyword hits by reciprocal rank fusion.
+
+    `shards` maps each volume to a store offering `relevance_search_by_vector`.
+    """
+
+    shards: dict[str, Any]
+    embedding_model: Embeddings
+    bm25_indexes: dict[str, BM25Index] | None = None
+    k: int = RETRIEVER_K
+    fetch_k: int = HYBRID_FETCH_K
+    rrf_k: int = RRF_K
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def route(self, query: str) -> list[str]:
+        """Return the volumes whose shards should be searched for `query`."""
+        match = VOLUME_PATTERN.search(query)
+        if match and match.group(1) in self.shards:
+            return [match.group(1)]
+        return list(self.shards)
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> list[Document]:  # noqa: ARG002
+        volumes = self.route(query)
+        embedding = self.embedding_model.embed_query(query)
+        if len(volumes) == 1:
+            results = [self._search_shard(volumes[0], query, embedding)]
+        else:
+            results = list(_SEARCH_POOL.map(lambda volume: self._search_shard(volume, query, embedding), volumes))
+        return self._merge(results)
+
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun,  # noqa: ARG002
+    ) -> list[Document]:
+        volumes = self.route(query)
+        embedding = await self.embedding_model.aembed_query(query)
+        results = await asyncio.gather(
+            *(run_in_executor(None, self._search_shard, volume, query, embedding) for volume in volumes),
+        )
+        return self._merge(results)
+
+    def _search_shard(self, volume, query, embedding):
+        """Return the (vector hits, keyword hits) of one shard."""
+        if not self.bm25_indexes:
+            return self.shards[volume].relevance_search_by_vector(embedding, self.k), []
+        vector_hits = self.shards[volume].relevance_search_by_vector(embedding, self.fetch_k)
+        keyword_index = self.bm25_indexes.get(volume)
+        return vector_hits, keyword_index.search(query, self.fetch_k) if keyword_index else []
+
+    def _merge(self, results):
+        vector_hits = [hit for shard_vector_hits, _ in results for hit in shard_vector_hits]
+        if not self.bm25_indexes:
+            return _top_documents(vector_hits, self.k)
+        keyword_hits = [hit for _, shard_keyword_hits in results for hit in shard_keyword_hits]
+        return reciprocal_rank_fusion(
+            [_top_documents(vector_hits, self.fetch_k), _top_documents(keyword_hits, self.fetch_k)],
+            self.k,
+            self.rrf_k,
+        )
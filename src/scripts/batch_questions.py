@@ -0,0 +1,127 @@
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from dotenv import load_dotenv
+from langchain_core.output_parsers import StrOutputParser
+
+from config import BATCH_MAX_WORKERS, RERANK_FETCH_K, RETRIEVER_K
+from src.chat.chatbot import ChatBot
+from src.retrieval.reranker import RerankingRetriever, format_context
+from src.utils.logger import logger
+
+
+def ask_batch():
+    """Answer the radar questions in a JSONL file and write the answers to JSONL."""
+    parser = argparse.ArgumentParser(description=ask_batch.__doc__)
+    parser.add_argument("questions", type=Path, help='JSONL file of {"question": ..., "id": ...} lines')
+    parser.add_argument("--output", type=Path, help="answers file (default: <questions>.answers.jsonl)")
+    parser.add_argument("--workers", type=int, default=BATCH_MAX_WORKERS, help="LLM calls in flight at once")
+    args = parser.parse_args()
+
+    load_dotenv()
+    output = args.output or args.questions.with_suffix(".answers.jsonl")
+    records = read_questions(args.questions)
+    BatchAnswerer(ChatBot(), max_workers=args.workers).run(records, output)
+
+
+def read_questions(path) -> list[dict]:
+    """Read one {"question": ...} object per line; lines without an "id" are numbered."""
+    records = []
+    with Path(path).open(encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if not isinstance(record.get("question"), str):
+                raise ValueError(f'{path}:{line_number}: expected an object with a "question" string')
+            records.append({"id": line_number, **record})
+    return records
+
+
+class BatchAnswerer:
+    """Answers many questions at once through a ChatBot's retriever, prompt and model.
+
+    Built for throughput: blip lookups are answered from the structured index,
+    the remaining questions are embedded in one batch call and searched in one
+    vectorized query, and generation fans out over `max_workers` threads.
+    Retrieval is by vector similarity, reranked when the ChatBot reranks.
+    """
+
+    def __init__(self, chatbot: ChatBot, max_workers: int = BATCH_MAX_WORKERS):
+        self.chatbot = chatbot
+        self.max_workers = max_workers
+        self.chain = chatbot.prompt | chatbot.llm | StrOutputParser()
+        self.reranker = chatbot.retriever if isinstance(chatbot.retriever, RerankingRetriever) else None
+
+    def run(self, records, output):
+        """Answer `records`, writing one JSON line per question to `output` in input order."""
+        start = time.perf_counter()
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        failed = 0
+        with output.open("w", encoding="utf-8") as f:
+            for result in self.answer(records):
+                failed += "error" in result
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"Answered {len(records) - failed}/{len(records)} questions in {elapsed:.1f}s "
+            f"({len(records) / elapsed:.2f}/s) into {output}",
+        )
+
+    def answer(self, records):
+        """Yield one result per record, in input order."""
+        routed = [self._route(record["question"]) for record in records]
+        pending = [i for i, answer in enumerate(routed) if answer is None]
+        hits = dict(zip(pending, self._search([records[i]["question"] for i in pending]), strict=True))
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ask-batch") as pool:
+            futures = [
+                pool.submit(self._answer, record, hits.get(i, []), routed[i]) for i, record in enumerate(records)
+            ]
+            for future in futures:
+                yield future.result()
+
+    def _route(self, question):
+        router = self.chatbot.query_router
+        return router.route(question) if router else None
+
+    def _search(self, questions):
+        if not questions:
+            return []
+        start = time.perf_counter()
+        embeddings = self.chatbot.vector_store.embedding_model.embed_documents(questions)
+        embedded = time.perf_counter()
+        k = RERANK_FETCH_K if self.reranker else RETRIEVER_K
+        hits = self.chatbot.vector_store.relevance_search_by_vectors(embeddings, k)
+        logger.info(
+            f"Embedded {len(questions)} questions in {(embedded - start) * 1000:.0f}ms, "
+            f"searched them in {(time.perf_counter() - embedded) * 1000:.0f}ms",
+        )
+        return hits
+
+    def _answer(self, record, hits, routed):
+        question = record["question"]
+        result = {"id": record["id"], "question": question, "answer": routed, "routed": routed is not None}
+        docs, timings = [doc for doc, _ in hits], {}
+        try:
+            start = time.perf_counter()
+            if self.reranker and docs:
+                docs = self.reranker.rerank(question, docs)
+            timings["rerank_ms"] = _elapsed_ms(start)
+            if routed is None:
+                start = time.perf_counter()
+                result["answer"] = self.chain.invoke({"question": question, "context": format_context(docs), "history": []})
+                timings["generation_ms"] = _elapsed_ms(start)
+        except Exception as e:
+            logger.error(f"Failed to answer question {record['id']}: {e!s}")
+            result["error"] = str(e)
+        result["chunk_ids"] = [doc.id for doc in docs]
+        result["timings"] = timings
+        return result
+
+
+def _elapsed_ms(start):
+    return round((time.perf_counter() - start) * 1000, 1)
@@ -1,11 +1,13 @@
 from dotenv import load_dotenv
 
-from config import RAW_DATA_DIR
+from config import BLIP_INDEX_PATH, INCREMENTAL_INGEST, RAW_DATA_DIR
 from src.data_ingestion.doc_processor_with_metadata import DocProcessorWithMetadata
 from src.data_ingestion.document_loader import DocumentLoader
 from src.data_ingestion.document_processor import DocumentProcessor
 from src.utils.logger import logger
-from src.vector_store.vector_store import VectorStore
+from src.vector_store.blip_index import BlipIndex
+from src.vector_store.ingest_manifest import iter_chunk_ids
+from src.vector_store.sharded_store import open_vector_store
 
 
 def vector_migrate_and_seed():
@@ -19,23 +21,40 @@ def vector_metadata_migrate_and_seed():
 class RAGDataManager:
     VECTOR_BASIC = "vector_basic"
     VECTOR_METADATA = "vector_with_metadata"
-    def __init__(self) -> None:
+    def __init__(self, incremental=INCREMENTAL_INGEST) -> None:
         load_dotenv()
-        self.loaded_docs = DocumentLoader(str(RAW_DATA_DIR)).load_radar_files()
+        self.incremental = incremental
+        self.loader = DocumentLoader(str(RAW_DATA_DIR))
 
     def migrate_and_seed(self, processor_type=VECTOR_BASIC):
+        """Stream PDFs through parsing, chunking and embedding into the vector store.
+
+        Every stage is a generator, so each file is chunked and its first
+        batches embedded while later files are still being parsed.
+        """
         if processor_type == RAGDataManager.VECTOR_BASIC:
             processor = DocumentProcessor()
         elif processor_type == RAGDataManager.VECTOR_METADATA:
             processor = DocProcessorWithMetadata()
 
-        chunked_docs = processor.chunk_pdfs(self.loaded_docs)
-        self._store_in_vectordb(chunked_docs)
-
-    def _store_in_vectordb(self, chunked_docs):
+        ingest_params = {
+            "processor_type": processor_type,
+            "chunk_size": processor.chunk_size,
+            "chunk_overlap": processor.chunk_overlap,
+        }
+        blips = []
+        chunks = processor.iter_chunks(self.loader.iter_radar_files(parallel=True), blips=blips)
+        items = iter_chunk_ids(chunks, **ingest_params)
+        self._store_in_vectordb(items, ingest_params)
+        BlipIndex(blips).save(BLIP_INDEX_PATH)
+
+    def _store_in_vectordb(self, items, ingest_params):
         try:
             logger.info("\nEmbedding and storing in database")
-            VectorStore().create(documents=chunked_docs)
+            if self.incremental:
+                open_vector_store().sync(items, **ingest_params)
+            else:
+                open_vector_store().create(items, **ingest_params)
             logger.info("\nOne time migration process complete!")
         except Exception as e:
             logger.error(f"Failed to store documents in vector database: {e}")
@@ -1,23 +1,75 @@
+import atexit
 import logging
+import multiprocessing
+import queue
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
-from config import LOG_FORMAT, LOG_LEVEL
+from config import LOG_BACKUP_COUNT, LOG_FILE, LOG_FORMAT, LOG_LEVEL, LOG_MAX_BYTES
 
 
 class Logger:
     _instance = None
+    _listener = None
 
     def __new__(cls):
         if cls._instance is None:
-            logging.basicConfig(
-                level=getattr(logging, LOG_LEVEL.upper()),
-                format=LOG_FORMAT,
-                handlers=[
-                    logging.StreamHandler(),
-                    logging.FileHandler("tech_radar_chat.log"),
-                ],
-            )
+            # Callers only enqueue records; a background listener thread does the
+            # console and file I/O, so request threads never block on disk writes.
+            formatter = logging.Formatter(LOG_FORMAT)
+            handlers = [
+                logging.StreamHandler(),
+                RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"),
+            ]
+            for handler in handlers:
+                handler.setFormatter(formatter)
+            log_queue = queue.SimpleQueue()
+            cls._listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+            cls._listener.start()
+            atexit.register(cls._listener.stop)
+
+            # The queue handler only merges arguments into the message; the
+            # listener's handlers apply LOG_FORMAT.
+            logging.basicConfig(level=getattr(logging, LOG_LEVEL.upper()), handlers=[_message_queue_handler(log_queue)])
             cls._instance = logging.getLogger("tech_radar")
         return cls._instance
 
+
+@contextmanager
+def process_pool_logging(context=None):
+    """Yield the (initializer, initargs) of a process pool whose workers log through this process.
+
+    Workers set up with the initializer send their records over a queue of the
+    multiprocessing `context` the pool uses, rather than to handlers of their
+    own, and they are re-emitted by this process's loggers while the block runs.
+    """
+    log_queue = (context or multiprocessing).Queue()
+    listener = QueueListener(log_queue, _ForwardingHandler())
+    listener.start()
+    try:
+        yield _init_worker_logging, (log_queue,)
+    finally:
+        listener.stop()
+        log_queue.close()
+        log_queue.join_thread()
+
+
+def _init_worker_logging(log_queue):
+    logging.getLogger().handlers = [_message_queue_handler(log_queue)]
+
+
+def _message_queue_handler(log_queue):
+    handler = QueueHandler(log_queue)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    return handler
+
+
+class _ForwardingHandler(logging.Handler):
+    """Hands records received from worker processes to the logger they were logged with."""
+
+    def emit(self, record):
+        logging.getLogger(record.name).handle(record)
+
+
 # Create singleton instance
 logger = Logger()
@@ -0,0 +1,139 @@
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+from config import METRICS_PREFIX, METRICS_WINDOW_SIZE
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Counter:
+    """Monotonically increasing value, e.g. requests or tokens sent."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str = ""):
+        self.name = name
+        self.help_text = help_text
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def samples(self) -> list[tuple[str, float]]:
+        return [(self.name, self.value)]
+
+
+class Histogram:
+    """Count and sum of all observations plus quantiles over a recent window.
+
+    Observing only appends to a bounded deque; quantiles are computed when the
+    metrics are rendered, keeping the hot path to a lock and three updates.
+    """
+
+    kind = "summary"
+
+    def __init__(self, name: str, help_text: str = "", window_size: int = METRICS_WINDOW_SIZE):
+        self.name = name
+        self.help_text = help_text
+        self.count = 0
+        self.sum = 0.0
+        self._window = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            self._window.append(value)
+
+    @contextmanager
+    def time(self):
+        """Observe the wall-clock seconds spent in the block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def quantiles(self) -> dict[float, float]:
+        """Return the nearest-rank p50/p95/p99 of the recent window (NaN when empty)."""
+        with self._lock:
+            window = sorted(self._window)
+        if not window:
+            return dict.fromkeys(QUANTILES, math.nan)
+        return {q: window[min(len(window) - 1, math.ceil(q * len(window)) - 1)] for q in QUANTILES}
+
+    def samples(self) -> list[tuple[str, float]]:
+        samples = [(f'{self.name}{{quantile="{q}"}}', value) for q, value in self.quantiles().items()]
+        return [*samples, (f"{self.name}_sum", self.sum), (f"{self.name}_count", self.count)]
+
+
+class CallbackMetric:
+    """Value read from a callback at render time, e.g. hit counts kept by a cache."""
+
+    def __init__(self, name: str, help_text: str, callback, kind: str = "counter"):
+        self.name = name
+        self.help_text = help_text
+        self.kind = kind
+        self.callback = callback
+
+    def samples(self) -> list[tuple[str, float]]:
+        return [(self.name, float(self.callback()))]
+
+
+def _format_value(value: float) -> str:
+    return "NaN" if math.isnan(value) else f"{value:g}"
+
+
+class MetricsRegistry:
+    """In-process registry rendered in the Prometheus text exposition format."""
+
+    def __init__(self, prefix: str = METRICS_PREFIX):
+        self.prefix = prefix
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str = "") -> Counter:
+        return self._get_or_create(name, lambda full_name: Counter(full_name, help_text))
+
+    def histogram(self, name: str, help_text: str = "") -> Histogram:
+        return self._get_or_create(name, lambda full_name: Histogram(full_name, help_text))
+
+    def register_callback(self, name: str, help_text: str, callback, kind: str = "counter"):
+        with self._lock:
+            self._metrics[name] = CallbackMetric(self.prefix + name, help_text, callback, kind)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            if metric.help_text:
+                lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(f"{name} {_format_value(value)}" for name, value in metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(self.render(), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def _get_or_create(self, name, factory):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, factory(self.prefix + name))
+        return metric
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
@@ -0,0 +1,87 @@
+import threading
+import time
+from typing import Any
+
+from config import WARMUP_RETRY_BACKOFF_SECONDS, WARMUP_RETRY_MAX_DELAY_SECONDS
+from src.utils.logger import logger
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+
+class Readiness:
+    """Startup state of the components a server needs before it should take traffic.
+
+    Components are registered with `expect` and marked ready by running their
+    warm-up through `check`, which records how long it took. Failed warm-ups
+    are kept so `retry_failed` can run them again. The whole is ready once
+    every expected component is, except that a group of interchangeable
+    components, such as the routed chat models, only needs one of them.
+    """
+
+    def __init__(self):
+        self._components = {}
+        self._groups = {}
+        self._failed = {}
+        self._lock = threading.Lock()
+
+    def expect(self, names, group: str | None = None):
+        """Register `names`; with a `group`, any one of them being ready is enough."""
+        with self._lock:
+            for name in names:
+                self._components[name] = {"status": PENDING}
+                if group:
+                    self._groups[name] = group
+
+    def check(self, name: str, warm_up) -> Any:
+        """Run `warm_up()` and record `name` as ready, or as failed if it raised; returns its result."""
+        start = time.perf_counter()
+        try:
+            result = warm_up()
+        except Exception as e:
+            with self._lock:
+                self._components[name] = {"status": FAILED, "seconds": _elapsed(start), "error": str(e)}
+                self._failed[name] = warm_up
+            logger.error(f"Warm-up of {name} failed after {_elapsed(start)}s: {e!s}")
+            return None
+        with self._lock:
+            self._components[name] = {"status": READY, "seconds": _elapsed(start)}
+            self._failed.pop(name, None)
+        logger.info(f"Warmed up {name} in {_elapsed(start)}s")
+        return result
+
+    def retry_failed(self) -> bool:
+        """Run every failed warm-up again; returns whether the whole is ready afterwards."""
+        with self._lock:
+            failed = dict(self._failed)
+        for name, warm_up in failed.items():
+            self.check(name, warm_up)
+        return self.ready
+
+    def retry_until_ready(self, backoff=WARMUP_RETRY_BACKOFF_SECONDS, max_delay=WARMUP_RETRY_MAX_DELAY_SECONDS):
+        """Retry failed warm-ups, doubling the delay between rounds up to `max_delay`, until ready."""
+        delay = backoff
+        while not self.ready:
+            logger.info(f"Retrying failed warm-ups in {delay:g}s")
+            time.sleep(delay)
+            self.retry_failed()
+            delay = min(delay * 2, max_delay)
+
+    @property
+    def ready(self) -> bool:
+        return self.status()["ready"]
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            components = {name: dict(component) for name, component in self._components.items()}
+            groups = dict(self._groups)
+        ready_by_group = {}
+        for name, component in components.items():
+            group = groups.get(name, name)
+            ready_by_group[group] = ready_by_group.get(group, False) or component["status"] == READY
+        return {"ready": all(ready_by_group.values()), "components": components}
+
+
+def _elapsed(start):
+    return round(time.perf_counter() - start, 3)
@@ -0,0 +1,65 @@
+import difflib
+import json
+import re
+from pathlib import Path
+
+from src.utils.logger import logger
+
+WORD_PATTERN = re.compile(r"[a-z0-9%#+]+")
+# A radar volume named in free text, e.g. "volume 32" or "vol. 31".
+VOLUME_PATTERN = re.compile(r"\bvol(?:ume)?\.?\s*(\d{1,3})\b", re.IGNORECASE)
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase a blip name and reduce it to single-space separated words."""
+    return " ".join(WORD_PATTERN.findall(name.lower()))
+
+
+class BlipIndex:
+    """Structured lookup of radar blips by name, quadrant, ring and volume."""
+
+    def __init__(self, blips):
+        self.blips = blips
+        self._by_name = {}
+        for blip in blips:
+            self._by_name.setdefault(normalize_name(blip["name"]), []).append(blip)
+        self._names_by_length = sorted(self._by_name, key=len, reverse=True)
+
+    @classmethod
+    def load(cls, path):
+        return cls(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.blips, indent=1), encoding="utf-8")
+        logger.info(f"Saved blip index with {len(self.blips)} blips to {path}")
+
+    def volumes(self) -> list[str]:
+        return sorted({blip["volume"] for blip in self.blips}, key=lambda volume: int(volume or 0))
+
+    def lookup(self, name: str, volume: str | None = None, cutoff: float = 0.85) -> list[dict]:
+        """Find a blip by exact name, falling back to the closest fuzzy match."""
+        key = normalize_name(name)
+        if key not in self._by_name:
+            matches = difflib.get_close_matches(key, self._by_name, n=1, cutoff=cutoff)
+            if not matches:
+                return []
+            key = matches[0]
+        return [blip for blip in self._by_name[key] if volume is None or blip["volume"] == volume]
+
+    def find_mentioned(self, text: str) -> str | None:
+        """Return the longest blip name that appears as whole words in `text`."""
+        padded = f" {normalize_name(text)} "
+        for name in self._names_by_length:
+            if f" {name} " in padded:
+                return name
+        return None
+
+    def filter(self, quadrant: str | None = None, ring: str | None = None, volume: str | None = None) -> list[dict]:
+        return [
+            blip for blip in self.blips
+            if (quadrant is None or blip["quadrant"].lower() == quadrant.lower())
+            and (ring is None or blip["ring"].lower() == ring.lower())
+            and (volume is None or blip["volume"] == volume)
+        ]
@@ -0,0 +1,82 @@
+import json
+import math
+import re
+from collections import Counter
+from pathlib import Path
+
+from langchain_core.documents import Document
+
+from src.utils.logger import logger
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """Okapi BM25 over an inverted index of term -> [(chunk index, term frequency)]."""
+
+    K1 = 1.5
+    B = 0.75
+
+    def __init__(self, ids, texts, metadatas, postings, doc_lengths):
+        self.ids = ids
+        self.texts = texts
+        self.metadatas = metadatas
+        self.postings = postings
+        self.doc_lengths = doc_lengths
+        self.avg_doc_length = sum(doc_lengths) / len(doc_lengths) if doc_lengths else 0.0
+
+    @classmethod
+    def build(cls, ids, texts, metadatas):
+        postings = {}
+        doc_lengths = []
+        for doc_index, text in enumerate(texts):
+            term_counts = Counter(tokenize(text))
+            doc_lengths.append(sum(term_counts.values()))
+            for term, frequency in term_counts.items():
+                postings.setdefault(term, []).append((doc_index, frequency))
+        return cls(list(ids), list(texts), [metadata or {} for metadata in metadatas], postings, doc_lengths)
+
+    @classmethod
+    def load(cls, path):
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        postings = {
+            term: list(zip(doc_indexes, frequencies, strict=True))
+            for term, (doc_indexes, frequencies) in data["postings"].items()
+        }
+        return cls(data["ids"], data["texts"], data["metadatas"], postings, data["doc_lengths"])
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "ids": self.ids,
+            "texts": self.texts,
+            "metadatas": self.metadatas,
+            "doc_lengths": self.doc_lengths,
+            "postings": {
+                term: [[doc_index for doc_index, _ in posting], [frequency for _, frequency in posting]]
+                for term, posting in self.postings.items()
+            },
+        }
+        path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+        logger.info(f"Saved BM25 index with {len(self.ids)} chunks and {len(self.postings)} terms to {path}")
+
+    def search(self, query: str, k: int = 4) -> list[tuple[Document, float]]:
+        scores = Counter()
+        doc_count = len(self.ids)
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (doc_count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc_index, frequency in posting:
+                length_norm = 1 - self.B + self.B * self.doc_lengths[doc_index] / self.avg_doc_length
+                scores[doc_index] += idf * frequency * (self.K1 + 1) / (frequency + self.K1 * length_norm)
+        return [
+            (Document(id=self.ids[doc_index], page_content=self.texts[doc_index], metadata=self.metadatas[doc_index]), score)
+            for doc_index, score in scores.most_common(k)
+        ]
@@ -0,0 +1,91 @@
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+from langchain_core.documents import Document
+
+from config import (
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_MAX_CONCURRENCY,
+    EMBEDDING_MAX_RETRIES,
+    EMBEDDING_RETRY_BACKOFF,
+)
+from src.utils.logger import logger
+
+WriteBatch = Callable[[list[str], list[Document], list[list[float]]], None]
+
+
+class EmbeddingPipeline:
+    """Embeds (id, document) pairs in batches with a bounded number of requests in flight.
+
+    Batches are pulled from the input lazily: once `max_concurrency` batches are
+    being embedded, reading stops until one of them finishes, so memory stays
+    bounded by batch size rather than corpus size. Each finished batch is handed
+    to `write_batch` straight away.
+    """
+
+    def __init__(
+        self,
+        embedding_model,
+        batch_size=EMBEDDING_BATCH_SIZE,
+        max_concurrency=EMBEDDING_MAX_CONCURRENCY,
+        max_retries=EMBEDDING_MAX_RETRIES,
+        retry_backoff=EMBEDDING_RETRY_BACKOFF,
+    ):
+        self.embedding_model = embedding_model
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+    def run(self, items: Iterable[tuple[str, Document]], write_batch: WriteBatch) -> int:
+        """Embed and write every item.
+
+        Returns:
+            The number of documents written.
+        """
+        written = 0
+        batches = self._batches(items)
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            in_flight = {}
+            for batch in batches:
+                if len(in_flight) >= self.max_concurrency:
+                    written += self._drain(in_flight, write_batch)
+                in_flight[executor.submit(self._embed_with_retry, batch)] = batch
+            while in_flight:
+                written += self._drain(in_flight, write_batch)
+        logger.info(f"Embedding pipeline stored {written} chunks")
+        return written
+
+    def _batches(self, items):
+        iterator = iter(items)
+        while batch := list(islice(iterator, self.batch_size)):
+            yield batch
+
+    def _drain(self, in_flight, write_batch):
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        written = 0
+        for future in done:
+            batch = in_flight.pop(future)
+            vectors = future.result()
+            ids = [chunk_id for chunk_id, _ in batch]
+            documents = [doc for _, doc in batch]
+            write_batch(ids, documents, vectors)
+            written += len(batch)
+            logger.info(f"Stored batch of {len(batch)} chunks")
+        return written
+
+    def _embed_with_retry(self, batch):
+        texts = [doc.page_content for _, doc in batch]
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.embedding_model.embed_documents(texts)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logger.error(f"Embedding batch failed after {attempt + 1} attempts: {e!s}")
+                    raise
+                delay = self.retry_backoff * 2 ** attempt
+                logger.warning(f"Embedding batch failed ({e!s}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+        return None
@@ -0,0 +1,60 @@
+from src.vector_store.bm25_index import BM25Index
+from src.vector_store.numpy_store import NumpyIndexWriter, NumpyVectorStore
+
+
+class IndexSnapshot:
+    """Builds the numpy and BM25 indexes kept next to a collection from the batches written to it.
+
+    Either index is optional. Chunks that were stored before are carried over
+    from the previous snapshot by `keep`, so an incremental ingest never reads
+    the whole collection back, and new embeddings are spooled to disk by the
+    numpy writer, so only the chunk texts are held for the whole corpus.
+    """
+
+    def __init__(self, numpy_directory=None, bm25_path=None):
+        self.numpy_directory = numpy_directory
+        self.bm25_path = bm25_path
+        self._chunks = ([], [], [])
+        self._kept = ([], [], [])
+        self._numpy = NumpyIndexWriter(numpy_directory) if numpy_directory else None
+
+    def exists(self) -> bool:
+        return all(path is None or path.exists() for path in (self.numpy_directory, self.bm25_path))
+
+    def add(self, ids, texts, metadatas, embeddings):
+        for chunks, values in zip(self._chunks, (ids, texts, metadatas), strict=True):
+            chunks.extend(values)
+        if self._numpy:
+            self._numpy.add(embeddings)
+
+    def keep(self, ids) -> bool:
+        """Carry the chunks in `ids` over from the previous snapshot.
+
+        Returns:
+            False when the previous snapshot is missing or does not hold every one of them.
+        """
+        if not ids:
+            return True
+        previous = self._previous()
+        if previous is None:
+            return False
+        rows = [row for row, chunk_id in enumerate(previous.ids) if chunk_id in ids]
+        if len(rows) != len(ids):
+            return False
+        for kept, values in zip(self._kept, (previous.ids, previous.texts, previous.metadatas), strict=True):
+            kept.extend(values[row] for row in rows)
+        if self._numpy:
+            self._numpy.keep(previous.matrix, rows)
+        return True
+
+    def write(self):
+        ids, texts, metadatas = (chunks + kept for chunks, kept in zip(self._chunks, self._kept, strict=True))
+        if self._numpy:
+            self._numpy.write(ids, texts, metadatas)
+        if self.bm25_path:
+            BM25Index.build(ids, texts, metadatas).save(self.bm25_path)
+
+    def _previous(self):
+        if self.numpy_directory:
+            return NumpyVectorStore.load(self.numpy_directory, None) if self.numpy_directory.exists() else None
+        return BM25Index.load(self.bm25_path) if self.bm25_path.exists() else None
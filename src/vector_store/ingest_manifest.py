@@ -0,0 +1,98 @@
+import hashlib
+import json
+from datetime import UTC, datetime
+from pathlib import Path
+
+from src.utils.logger import logger
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def chunk_source(metadata: dict) -> str:
+    """Return the file name a chunk was extracted from."""
+    source = metadata.get("source") or metadata.get("filename") or ""
+    return Path(source).name
+
+
+def iter_chunk_ids(documents, processor_type: str, chunk_size: int, chunk_overlap: int):
+    """Lazily pair every chunk with a stable ID.
+
+    The ID is derived from the source file name, the processor type, the chunk
+    parameters and a hash of the chunk content and metadata, so unchanged chunks
+    keep their ID across runs, wherever the files are loaded from. Identical chunks within one source get an
+    occurrence suffix to keep the IDs unique.
+
+    Yields:
+        (chunk ID, document) pairs.
+    """
+    seen = {}
+    for doc in documents:
+        source = chunk_source(doc.metadata)
+        # The loader records the path of the file; only its name is part of the ID.
+        metadata = {**doc.metadata, "source": source} if "source" in doc.metadata else doc.metadata
+        digest = content_hash(doc.page_content + json.dumps(metadata, sort_keys=True, default=str))
+        key = f"{source}|{processor_type}|{chunk_size}|{chunk_overlap}|{digest}"
+        occurrence = seen.get(key, 0)
+        seen[key] = occurrence + 1
+        yield content_hash(f"{key}|{occurrence}")[:32], doc
+
+
+def chunk_ids(documents, processor_type: str, chunk_size: int, chunk_overlap: int) -> list[str]:
+    """Return the stable ID of every chunk, see `iter_chunk_ids`."""
+    return [chunk_id for chunk_id, _ in iter_chunk_ids(documents, processor_type, chunk_size, chunk_overlap)]
+
+
+class IngestManifest:
+    """Record of the chunks ingested into a collection, kept next to the store."""
+
+    def __init__(self, persist_directory, collection_name):
+        self.path = Path(persist_directory) / f"{collection_name}_manifest.json"
+        self.collection_name = collection_name
+        # (file mtime, version) of the manifest last read or written
+        self._version = (None, "")
+
+    def load(self) -> dict:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable ingest manifest {self.path}: {e!s}")
+            return {}
+
+    def ids(self) -> set[str]:
+        return {chunk_id for ids in self.load().get("sources", {}).values() for chunk_id in ids}
+
+    def version(self) -> str:
+        """Return an identifier that changes whenever the collection content changes.
+
+        It is called on every chat request, so the version is kept in memory and
+        the manifest only re-read when the file's modification time changes.
+        """
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return ""
+        if mtime != self._version[0]:
+            self._version = (mtime, self.load().get("version", ""))
+        return self._version[1]
+
+    def save(self, sources: dict[str, list[str]], **ingest_params):
+        """Persist the chunk IDs ingested per source file."""
+        ids = sorted(chunk_id for source_ids in sources.values() for chunk_id in source_ids)
+        manifest = {
+            "collection": self.collection_name,
+            "version": content_hash("\n".join(ids))[:16],
+            "updated_at": datetime.now(UTC).isoformat(),
+            "chunk_count": len(ids),
+            **ingest_params,
+            "sources": sources,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        tmp_path.replace(self.path)
+        self._version = (self.path.stat().st_mtime_ns, manifest["version"])
+        return manifest
@@ -0,0 +1,250 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.runnables.config import run_in_executor
+from langchain_core.vectorstores import VectorStore as LangChainVectorStore
+
+from config import QUANTIZED_RESCORE_FACTOR, VECTOR_QUANTIZATION
+from src.utils.logger import logger
+from src.vector_store.quantization import (
+    build_quantizer,
+    load_quantizer,
+    save_quantizer,
+)
+
+EMBEDDINGS_FILE = "embeddings.npy"
+CHUNKS_FILE = "chunks.json"
+INDEXED_METADATA_FIELDS = ("quadrant", "ring", "volume")
+# Rows copied at a time when an index is written, which bounds the memory it takes.
+COPY_ROWS = 1024
+
+
+class NumpyVectorStore(LangChainVectorStore):
+    """Read-only vector index held in one contiguous float32 matrix.
+
+    Rows are L2-normalised at export time, so a single matrix-vector product
+    gives cosine similarities for every chunk. The matrix is memory-mapped from
+    disk, which makes loading effectively free. Filters use the Chroma `where`
+    syntax: `{"ring": "Hold"}`, `{"ring": {"$in": [...]}}` and `{"$and": [...]}`.
+
+    With a `quantizer` (written by `quantize`, which `export` runs when
+    VECTOR_QUANTIZATION is "int8" or "pq"), every chunk is scored approximately on its compact code and only the top
+    `k * rescore_factor` are rescored exactly, so only those rows of the
+    full-precision matrix are read from disk.
+    """
+
+    def __init__(self, embedding, ids, texts, metadatas, matrix):
+        self.embedding = embedding
+        self.ids = ids
+        self.texts = texts
+        self.metadatas = metadatas
+        self.matrix = matrix
+        self.quantizer = None
+        self.rescore_factor = QUANTIZED_RESCORE_FACTOR
+        self._columns = {
+            field: np.array([str(metadata.get(field, "")) for metadata in metadatas])
+            for field in INDEXED_METADATA_FIELDS
+        }
+
+    @property
+    def embeddings(self):
+        return self.embedding
+
+    @classmethod
+    def load(cls, directory, embedding):
+        directory = Path(directory)
+        chunks = json.loads((directory / CHUNKS_FILE).read_text(encoding="utf-8"))
+        matrix = np.load(directory / EMBEDDINGS_FILE, mmap_mode="r")
+        store = cls(embedding, chunks["ids"], chunks["texts"], chunks["metadatas"], matrix)
+        store.quantizer = load_quantizer(directory)
+        return store
+
+    @staticmethod
+    def export(directory, ids, texts, metadatas, embeddings):
+        """Write an index that `load` can memory-map, quantized as VECTOR_QUANTIZATION says."""
+        writer = NumpyIndexWriter(directory)
+        if len(ids):
+            writer.add(embeddings)
+        writer.write(ids, texts, metadatas)
+
+    @staticmethod
+    def quantize(directory, kind=VECTOR_QUANTIZATION):
+        """Write `kind` codes ("int8", "pq" or "none") for the index exported to `directory`."""
+        matrix = np.load(Path(directory) / EMBEDDINGS_FILE, mmap_mode="r")
+        quantizer = build_quantizer(kind, matrix) if len(matrix) else None
+        save_quantizer(directory, quantizer)
+        if quantizer is not None:
+            logger.info(f"Quantized numpy index {directory} to {quantizer.nbytes} bytes of {kind} codes")
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, ids=None, **_kwargs):
+        texts = list(texts)
+        ids = ids or [str(i) for i in range(len(texts))]
+        metadatas = metadatas or [{} for _ in texts]
+        vectors = _normalize_rows(np.asarray(embedding.embed_documents(texts), dtype=np.float32))
+        return cls(embedding, ids, texts, metadatas, vectors)
+
+    def similarity_search(self, query, k=4, **kwargs):
+        return self.similarity_search_by_vector(self.embedding.embed_query(query), k, **kwargs)
+
+    async def asimilarity_search(self, query, k=4, **kwargs):
+        embedding = await self.embedding.aembed_query(query)
+        return await run_in_executor(None, self.similarity_search_by_vector, embedding, k, **kwargs)
+
+    def similarity_search_by_vector(self, embedding, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k, **kwargs)]
+
+    def similarity_search_with_score(self, query, k=4, **kwargs):
+        return self.similarity_search_by_vector_with_score(self.embedding.embed_query(query), k, **kwargs)
+
+    def similarity_search_by_vector_with_score(self, embedding, k=4, **kwargs):
+        if not len(self.ids):
+            return []
+        query = np.asarray(embedding, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1)
+        scores = self.matrix @ query if self.quantizer is None else self.quantizer.scores(query)
+        if where := kwargs.get("filter"):
+            scores = np.where(self._filter_mask(where), scores, -np.inf)
+        if self.quantizer is None:
+            top = self._top_k(scores, k)
+            return [(self._document(i), float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+        shortlist = np.sort([i for i in self._top_k(scores, k * self.rescore_factor) if np.isfinite(scores[i])])
+        if not len(shortlist):
+            return []
+        exact = np.asarray(self.matrix[shortlist]) @ query
+        top = self._top_k(exact, k)
+        return [(self._document(int(shortlist[i])), float(exact[i])) for i in top[:k]]
+
+    def relevance_search_by_vector(self, embedding, k=4, **kwargs):
+        """Return (document, relevance in [0, 1]) pairs for a precomputed query embedding."""
+        relevance = self._select_relevance_score_fn()
+        return [(doc, relevance(score)) for doc, score in self.similarity_search_by_vector_with_score(embedding, k, **kwargs)]
+
+    def relevance_search_by_vectors(self, embeddings, k=4, **kwargs):
+        """Batch `relevance_search_by_vector`, scoring every query against the matrix in one product."""
+        if not len(self.ids):
+            return [[] for _ in embeddings]
+        queries = np.asarray(embeddings, dtype=np.float32).reshape(len(embeddings), -1)
+        if self.quantizer is not None or not len(queries):
+            return [self.relevance_search_by_vector(query, k, **kwargs) for query in queries]
+        scores = (self.matrix @ _normalize_rows(queries).T).T
+        if where := kwargs.get("filter"):
+            scores = np.where(self._filter_mask(where), scores, -np.inf)
+        relevance = self._select_relevance_score_fn()
+        return [
+            [(self._document(i), relevance(float(row[i]))) for i in self._top_k(row, k) if np.isfinite(row[i])]
+            for row in scores
+        ]
+
+    def _select_relevance_score_fn(self):
+        return lambda score: (score + 1) / 2
+
+    @staticmethod
+    def _top_k(scores, k):
+        if k >= len(scores):
+            return np.argsort(-scores)
+        top = np.argpartition(-scores, k)[:k]
+        return top[np.argsort(-scores[top])]
+
+    def _document(self, i):
+        return Document(id=self.ids[i], page_content=self.texts[i], metadata=self.metadatas[i])
+
+    def _filter_mask(self, where):
+        mask = np.ones(len(self.ids), dtype=bool)
+        for field, condition in where.items():
+            if field == "$and":
+                for clause in condition:
+                    mask &= self._filter_mask(clause)
+            elif field == "$or":
+                mask &= np.logical_or.reduce([self._filter_mask(clause) for clause in condition])
+            else:
+                mask &= self._field_mask(field, condition)
+        return mask
+
+    def _field_mask(self, field, condition):
+        column = self._columns.get(field)
+        if column is None:
+            column = np.array([str(metadata.get(field, "")) for metadata in self.metadatas])
+        if isinstance(condition, dict):
+            if "$in" in condition:
+                return np.isin(column, [str(value) for value in condition["$in"]])
+            if "$eq" in condition:
+                return column == str(condition["$eq"])
+            if "$ne" in condition:
+                return column != str(condition["$ne"])
+            raise ValueError(f"Unsupported filter condition for {field}: {condition}")
+        return column == str(condition)
+
+
+class NumpyIndexWriter:
+    """Writes a numpy index without holding every embedding in memory.
+
+    Added batches are normalised and spooled to a scratch file, and rows kept
+    from a previous index are read from its memory-mapped matrix; both are
+    copied into the new matrix `COPY_ROWS` at a time by `write`.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        # Left open across `add` calls and closed by `write`.
+        self._spool = tempfile.TemporaryFile()  # noqa: SIM115
+        self._spooled_rows = 0
+        self._dimension = 0
+        self._kept_matrix = None
+        self._kept_rows = []
+
+    def add(self, embeddings):
+        vectors = _normalize_rows(np.asarray(embeddings, dtype=np.float32).reshape(len(embeddings), -1))
+        self._spool.write(vectors.tobytes())
+        self._spooled_rows += len(vectors)
+        self._dimension = vectors.shape[1]
+
+    def keep(self, matrix, rows):
+        """Carry `rows` of a previous index's `matrix` over, after the added rows."""
+        self._kept_matrix, self._kept_rows = matrix, rows
+        self._dimension = self._dimension or matrix.shape[1]
+
+    def write(self, ids, texts, metadatas):
+        """Write the index, the added rows first; `ids`, `texts` and `metadatas` must follow that order."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        matrix_path = self.directory / EMBEDDINGS_FILE
+        tmp_path = matrix_path.with_name(f"{EMBEDDINGS_FILE}.{os.getpid()}.tmp")
+        shape = (self._spooled_rows + len(self._kept_rows), self._dimension)
+        if shape[0]:
+            matrix = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=shape)
+            self._copy_spooled_rows(matrix)
+            for start in range(0, len(self._kept_rows), COPY_ROWS):
+                rows = self._kept_rows[start:start + COPY_ROWS]
+                matrix[self._spooled_rows + start:self._spooled_rows + start + len(rows)] = self._kept_matrix[rows]
+            matrix.flush()
+            del matrix
+        else:
+            with tmp_path.open("wb") as f:
+                np.save(f, np.zeros(shape, dtype=np.float32))
+        self._spool.close()
+        tmp_path.replace(matrix_path)
+
+        chunks = {"ids": list(ids), "texts": list(texts), "metadatas": [metadata or {} for metadata in metadatas]}
+        chunks_tmp_path = self.directory / f"{CHUNKS_FILE}.{os.getpid()}.tmp"
+        chunks_tmp_path.write_text(json.dumps(chunks), encoding="utf-8")
+        chunks_tmp_path.replace(self.directory / CHUNKS_FILE)
+        logger.info(f"Exported {len(chunks['ids'])} vectors to numpy index {self.directory}")
+        NumpyVectorStore.quantize(self.directory)
+
+    def _copy_spooled_rows(self, matrix):
+        if not self._spooled_rows:
+            return
+        self._spool.flush()
+        spooled = np.memmap(self._spool, dtype=np.float32, mode="r", shape=(self._spooled_rows, self._dimension))
+        for start in range(0, self._spooled_rows, COPY_ROWS):
+            matrix[start:start + COPY_ROWS] = spooled[start:start + COPY_ROWS]
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
@@ -0,0 +1,147 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from config import PQ_SUBSPACES, PQ_TRAIN_ITERATIONS
+
+QUANTIZATION_FILE = "quantization.json"
+# Rows scored per block, bounding the float32 temporaries of int8 scoring
+BLOCK_ROWS = 8192
+
+
+class ScalarQuantizer:
+    """int8 codes with one symmetric scale per dimension; a quarter of the float32 size.
+
+    The inner product with a query is computed from the codes directly as
+    codes @ (query * scale), so vectors are never decoded.
+    """
+
+    kind = "int8"
+
+    def __init__(self, scale, codes):
+        self.scale = scale
+        self.codes = codes
+
+    @classmethod
+    def fit(cls, matrix):
+        scale = np.abs(matrix).max(axis=0) / 127
+        scale[scale == 0] = 1
+        codes = np.clip(np.rint(matrix / scale), -127, 127).astype(np.int8)
+        return cls(scale.astype(np.float32), codes)
+
+    def scores(self, query):
+        weights = (query * self.scale).astype(np.float32)
+        return np.concatenate([
+            self.codes[start:start + BLOCK_ROWS].astype(np.float32) @ weights
+            for start in range(0, len(self.codes), BLOCK_ROWS)
+        ]) if len(self.codes) else np.zeros(0, dtype=np.float32)
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.scale.nbytes
+
+    def save(self, directory):
+        np.save(directory / "int8_codes.npy", self.codes)
+        np.save(directory / "int8_scale.npy", self.scale)
+
+    @classmethod
+    def load(cls, directory):
+        return cls(np.load(directory / "int8_scale.npy"), np.load(directory / "int8_codes.npy", mmap_mode="r"))
+
+
+class ProductQuantizer:
+    """Product quantization: one byte per subspace, scored with per-query lookup tables.
+
+    The vector is split into `subspaces` equal slices and each slice replaced by
+    the nearest of up to 256 k-means centroids trained on the collection. A
+    query's inner product is the sum over subspaces of its product with the
+    chosen centroids, read from a (subspaces x 256) table built once per query.
+    """
+
+    kind = "pq"
+
+    def __init__(self, codebooks, codes):
+        self.codebooks = codebooks
+        self.codes = codes
+
+    @classmethod
+    def fit(cls, matrix, subspaces=PQ_SUBSPACES, iterations=PQ_TRAIN_ITERATIONS, seed=0):
+        dimensions = matrix.shape[1]
+        # Use the largest subspace count up to `subspaces` that divides the dimension evenly.
+        subspaces = max(count for count in range(1, subspaces + 1) if dimensions % count == 0)
+        rng = np.random.default_rng(seed)
+        slices = np.split(np.asarray(matrix, dtype=np.float32), subspaces, axis=1)
+        trained = [_kmeans(part, min(256, len(part)), iterations, rng) for part in slices]
+        codebooks = np.stack([centroids for centroids, _ in trained])
+        codes = np.stack([assignment for _, assignment in trained], axis=1).astype(np.uint8)
+        return cls(codebooks, codes)
+
+    def scores(self, query):
+        subspaces, _, width = self.codebooks.shape
+        tables = np.einsum("scw,sw->sc", self.codebooks, query.reshape(subspaces, width).astype(np.float32))
+        if not len(self.codes):
+            return np.zeros(0, dtype=np.float32)
+        return tables[np.arange(subspaces), self.codes].sum(axis=1)
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.codebooks.nbytes
+
+    def save(self, directory):
+        np.save(directory / "pq_codes.npy", self.codes)
+        np.save(directory / "pq_codebooks.npy", self.codebooks)
+
+    @classmethod
+    def load(cls, directory):
+        return cls(np.load(directory / "pq_codebooks.npy"), np.load(directory / "pq_codes.npy", mmap_mode="r"))
+
+
+QUANTIZERS = {quantizer.kind: quantizer for quantizer in (ScalarQuantizer, ProductQuantizer)}
+
+
+def build_quantizer(kind: str, matrix):
+    """Fit the quantizer named `kind` ("int8" or "pq") to the rows of `matrix`; None for "none"."""
+    if kind in ("", "none"):
+        return None
+    if kind not in QUANTIZERS:
+        raise ValueError(f"Unsupported vector quantization: {kind}. Must be one of: none, {', '.join(QUANTIZERS)}")
+    return QUANTIZERS[kind].fit(matrix)
+
+
+def save_quantizer(directory, quantizer):
+    directory = Path(directory)
+    metadata_path = directory / QUANTIZATION_FILE
+    if quantizer is None:
+        metadata_path.unlink(missing_ok=True)
+        return
+    quantizer.save(directory)
+    metadata_path.write_text(json.dumps({"kind": quantizer.kind}), encoding="utf-8")
+
+
+def load_quantizer(directory):
+    """Return the quantizer exported with the index in `directory`, or None."""
+    metadata_path = Path(directory) / QUANTIZATION_FILE
+    if not metadata_path.exists():
+        return None
+    return QUANTIZERS[json.loads(metadata_path.read_text(encoding="utf-8"))["kind"]].load(Path(directory))
+
+
+def _kmeans(points, clusters, iterations, rng):
+    """Return (centroids, assignment) of a plain Lloyd's k-means on `points`."""
+    centroids = points[rng.choice(len(points), clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = _nearest(points, centroids)
+        counts = np.bincount(assignment, minlength=clusters)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, points)
+        centroids = (sums / np.maximum(counts, 1)[:, None]).astype(np.float32)
+        # Re-seed empty clusters with random points so every code stays in use.
+        empty = counts == 0
+        centroids[empty] = points[rng.integers(len(points), size=int(empty.sum()))]
+    return centroids, _nearest(points, centroids)
+
+
+def _nearest(points, centroids):
+    distances = (centroids ** 2).sum(axis=1) - 2 * points @ centroids.T
+    return distances.argmin(axis=1)
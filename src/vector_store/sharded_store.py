@@ -0,0 +1,168 @@
+import heapq
+import json
+import re
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+
+from config.app_config import (
+    CHROMA_PATH,
+    COLLECTION_NAME,
+    HYBRID_FETCH_K,
+    RAW_DATA_DIR,
+    RETRIEVAL_MODE,
+    RETRIEVER_K,
+    SHARD_BY_VOLUME,
+    VECTOR_STORE_BACKEND,
+)
+from src.llm.model_manager import LLMModelManager
+from src.retrieval.sharded_retriever import ShardedRetriever
+from src.utils.logger import logger
+from src.vector_store.ingest_manifest import IngestManifest, chunk_source, content_hash
+from src.vector_store.vector_store import VectorStore
+
+FILENAME_VOLUME_PATTERN = re.compile(r"vol_(\d+)", re.IGNORECASE)
+UNKNOWN_VOLUME = "other"
+
+
+def volume_of(metadata: dict) -> str:
+    """Return the radar volume of a chunk, falling back to the number in its file name."""
+    if volume := metadata.get("volume"):
+        return str(volume)
+    match = FILENAME_VOLUME_PATTERN.search(chunk_source(metadata))
+    return match.group(1) if match else UNKNOWN_VOLUME
+
+
+def open_vector_store(**kwargs):
+    """Return the configured store: sharded by volume when SHARD_BY_VOLUME is set."""
+    return ShardedVectorStore(**kwargs) if SHARD_BY_VOLUME else VectorStore(**kwargs)
+
+
+class ShardedVectorStore:
+    """One VectorStore collection per radar volume, searched in parallel.
+
+    Offers the same ingestion and retrieval interface as VectorStore. Each
+    volume lives in its own `<collection>_vol_<volume>` collection with its own
+    manifest and indexes, so adding a radar only embeds and indexes that
+    volume's shard while the others stay untouched.
+    """
+
+    def __init__(
+        self,
+        collection_name=COLLECTION_NAME,
+        persist_directory=CHROMA_PATH,
+        backend=VECTOR_STORE_BACKEND,
+        embedding_model=None,
+    ):
+        self.collection_name = collection_name
+        self.persist_directory = persist_directory
+        self.backend = backend
+        self.registry_path = Path(persist_directory) / f"{collection_name}_shards.json"
+        self.source_directory = Path(RAW_DATA_DIR)
+        self.embedding_model = embedding_model or LLMModelManager().get_embedding_model()
+        # Kept across calls so collection_version, read on every request, stays in memory.
+        self._manifests = {}
+        self._volumes = (None, [])
+
+    def shard(self, volume: str) -> VectorStore:
+        store = VectorStore(
+            collection_name=self._shard_collection_name(volume),
+            persist_directory=self.persist_directory,
+            backend=self.backend,
+            embedding_model=self.embedding_model,
+        )
+        store.source_directory = self.source_directory
+        return store
+
+    def volumes(self) -> list[str]:
+        """Return the sharded volumes, re-reading the registry only when it changed."""
+        try:
+            mtime = self.registry_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return []
+        if mtime != self._volumes[0]:
+            self._volumes = (mtime, self._read_registry())
+        return self._volumes[1]
+
+    def _read_registry(self):
+        try:
+            return json.loads(self.registry_path.read_text(encoding="utf-8"))["volumes"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable shard registry {self.registry_path}: {e!s}")
+            return []
+
+    def _shard_collection_name(self, volume):
+        return f"{self.collection_name}_vol_{volume}"
+
+    def create(self, items, **ingest_params):
+        """Reset and fill one shard per volume found in the (chunk ID, document) pairs in `items`."""
+        return self._ingest(items, VectorStore.create, ingest_params)
+
+    def sync(self, items, **ingest_params):
+        """Incrementally sync every volume's shard, see `VectorStore.sync`.
+
+        Shards of volumes no longer present in `items` are dropped, unless
+        their source files still exist and only failed to load.
+        """
+        return self._ingest(items, VectorStore.sync, ingest_params)
+
+    def _ingest(self, items, ingest, ingest_params):
+        """Route each volume's run of items to its shard.
+
+        Items must arrive grouped by volume, as they do when files are loaded in
+        name order, so each shard consumes its run from the stream directly.
+        """
+        volumes = []
+        for volume, shard_items in groupby(items, key=lambda item: volume_of(item[1].metadata)):
+            if volume in volumes:
+                raise ValueError(f"Chunks of volume {volume} are not contiguous; load the files in name order")
+            volumes.append(volume)
+            ingest(self.shard(volume), shard_items, **ingest_params)
+
+        for volume in sorted(set(self.volumes()) - set(volumes)):
+            shard = self.shard(volume)
+            ingest(shard, [], **ingest_params)
+            if shard.manifest.ids():
+                volumes.append(volume)
+                continue
+            logger.info(f"Dropping shard of volume {volume}, which is no longer ingested")
+            shard.drop()
+        self._save_registry(volumes)
+        return volumes
+
+    def _save_registry(self, volumes):
+        self.registry_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.registry_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"volumes": sorted(volumes)}, indent=2), encoding="utf-8")
+        tmp_path.replace(self.registry_path)
+
+    def collection_version(self):
+        versions = "\n".join(f"{volume}:{self._manifest(volume).version()}" for volume in self.volumes())
+        return content_hash(versions)[:16]
+
+    def relevance_search_by_vectors(self, embeddings, k=RETRIEVER_K):
+        """Search every shard with the whole batch of query embeddings and keep each query's `k` best hits."""
+        hits = [[] for _ in embeddings]
+        for volume in self.volumes():
+            for query_hits, shard_hits in zip(hits, self.shard(volume).relevance_search_by_vectors(embeddings, k), strict=True):
+                query_hits.extend(shard_hits)
+        return [heapq.nlargest(k, query_hits, key=itemgetter(1)) for query_hits in hits]
+
+    def _manifest(self, volume):
+        if volume not in self._manifests:
+            self._manifests[volume] = IngestManifest(self.persist_directory, self._shard_collection_name(volume))
+        return self._manifests[volume]
+
+    def get_retriever(self, mode=RETRIEVAL_MODE, k=RETRIEVER_K):
+        """Build a retriever fanning out over every shard, see `VectorStore.get_retriever`."""
+        shards = {volume: self.shard(volume) for volume in self.volumes()}
+        bm25_indexes = None
+        if mode == VectorStore.HYBRID:
+            bm25_indexes = {volume: shard.bm25_index() for volume, shard in shards.items()}
+        return ShardedRetriever(
+            shards={volume: shard.load() for volume, shard in shards.items()},
+            embedding_model=self.embedding_model,
+            bm25_indexes=bm25_indexes,
+            k=k,
+            fetch_k=HYBRID_FETCH_K,
+        )
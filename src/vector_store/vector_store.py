@@ -1,30 +1,260 @@
+import shutil
+from contextlib import suppress
+from pathlib import Path
+
+import chromadb
+from chromadb.errors import NotFoundError
 from langchain_chroma import Chroma
+from langchain_core.documents import Document
+from langchain_core.runnables.config import run_in_executor
 
 from config.app_config import (
     CHROMA_PATH,
     COLLECTION_NAME,
+    HYBRID_FETCH_K,
+    RAW_DATA_DIR,
+    RETRIEVAL_MODE,
+    RETRIEVER_K,
+    VECTOR_STORE_BACKEND,
 )
 from src.llm.model_manager import LLMModelManager
+from src.retrieval.hybrid_retriever import HybridRetriever
+from src.utils.logger import logger
+from src.vector_store.bm25_index import BM25Index
+from src.vector_store.embedding_pipeline import EmbeddingPipeline
+from src.vector_store.index_snapshot import IndexSnapshot
+from src.vector_store.ingest_manifest import IngestManifest, chunk_source
+from src.vector_store.numpy_store import NumpyVectorStore
+
+# Chunks read from the collection at a time when an index is rebuilt from it.
+EXPORT_PAGE_SIZE = 1000
+
+
+class AsyncEmbeddingChroma(Chroma):
+    """Chroma store whose async search embeds the query with the async embedding API.
+
+    Only the local index lookup runs in the executor, so the network call to
+    the embedding provider no longer holds a worker thread.
+    """
+
+    async def asimilarity_search(self, query, k=4, **kwargs):
+        embedding = await self.embeddings.aembed_query(query)
+        return await run_in_executor(None, self.similarity_search_by_vector, embedding, k, **kwargs)
+
+    def relevance_search_by_vector(self, embedding, k=4, **kwargs):
+        """Return (document, relevance in [0, 1]) pairs for a precomputed query embedding."""
+        relevance = self._select_relevance_score_fn()
+        return [
+            (doc, relevance(distance))
+            for doc, distance in self.similarity_search_by_vector_with_relevance_scores(embedding, k, **kwargs)
+        ]
+
+    def relevance_search_by_vectors(self, embeddings, k=4, **kwargs):
+        """Batch `relevance_search_by_vector`, sending every query embedding in one collection query."""
+        if not embeddings:
+            return []
+        results = self._collection.query(
+            query_embeddings=embeddings,
+            n_results=k,
+            where=kwargs.get("filter"),
+            include=["documents", "metadatas", "distances"],
+        )
+        relevance = self._select_relevance_score_fn()
+        return [
+            [
+                (Document(id=chunk_id, page_content=text, metadata=metadata or {}), relevance(distance))
+                for chunk_id, text, metadata, distance in zip(ids, texts, metadatas, distances, strict=True)
+            ]
+            for ids, texts, metadatas, distances in zip(
+                results["ids"], results["documents"], results["metadatas"], results["distances"], strict=True,
+            )
+        ]
 
 
 class VectorStore:
-    def __init__(self, collection_name=COLLECTION_NAME, persist_directory=CHROMA_PATH):
+    CHROMA = "chroma"
+    NUMPY = "numpy"
+    VECTOR = "vector"
+    HYBRID = "hybrid"
+
+    def __init__(
+        self,
+        collection_name=COLLECTION_NAME,
+        persist_directory=CHROMA_PATH,
+        backend=VECTOR_STORE_BACKEND,
+        embedding_model=None,
+    ):
         self.collection_name = collection_name
         self.persist_directory = persist_directory
-        self.embedding_model = LLMModelManager().get_embedding_model()
+        self.backend = backend
+        self.numpy_index_directory = Path(persist_directory) / f"{collection_name}_numpy"
+        self.bm25_index_path = Path(persist_directory) / f"{collection_name}_bm25.json"
+        self.embedding_model = embedding_model or LLMModelManager().get_embedding_model()
+        self.manifest = IngestManifest(persist_directory, collection_name)
+        # Where sync looks for source files that produced no chunks, see `sync`.
+        self.source_directory = Path(RAW_DATA_DIR)
+        self._client = None
 
-    def create(self, documents):
-        db = self.load()
+    def create(self, items, **ingest_params):
+        """Reset the collection and store every (chunk ID, document) pair in `items`."""
+        db = self._chroma()
         db.reset_collection()
-        db.add_documents(documents, embedding=self.embedding_model,
-                        collection_name=self.collection_name,
-                        persist_directory=self.persist_directory,
-                    )
+        sources, snapshot = {}, self._snapshot()
+        self._embed_and_store(self._record_sources(items, sources), snapshot)
+        self.manifest.save(sources, **ingest_params)
+        self._drop_unused_indexes()
+        if snapshot:
+            snapshot.write()
         return db
 
+    def sync(self, items, **ingest_params):
+        """Incrementally bring the collection in line with the (chunk ID, document) pairs in `items`.
+
+        `items` is consumed lazily. Only chunks whose ID is not stored yet are
+        embedded; stored chunks that are no longer produced (changed or removed
+        sources) are deleted. A source file that produced no chunks but is still
+        in `source_directory` failed to load, so its stored chunks are kept.
+        """
+        db = self._chroma()
+        existing_ids = set(db.get(include=[])["ids"])
+        sources, snapshot = {}, self._snapshot()
+        new_items = (
+            (chunk_id, doc)
+            for chunk_id, doc in self._record_sources(items, sources)
+            if chunk_id not in existing_ids
+        )
+        new_count = self._embed_and_store(new_items, snapshot)
+        sources = {**self._unloaded_sources(existing_ids, sources), **sources}
+
+        current_ids = {chunk_id for source_ids in sources.values() for chunk_id in source_ids}
+        stale_ids = sorted(existing_ids - current_ids)
+        logger.info(
+            f"Incremental ingest into {self.collection_name}: {new_count} new, "
+            f"{len(stale_ids)} stale, {len(current_ids) - new_count} unchanged chunks",
+        )
+        if stale_ids:
+            db.delete(ids=stale_ids)
+        changed = new_count or stale_ids or self.manifest.ids() != current_ids
+        if changed:
+            self.manifest.save(sources, **ingest_params)
+            self._drop_unused_indexes()
+        if snapshot and (changed or not snapshot.exists()):
+            if snapshot.keep(existing_ids & current_ids):
+                snapshot.write()
+            else:
+                self.export_indexes(numpy=bool(snapshot.numpy_directory), bm25=bool(snapshot.bm25_path))
+        return db
+
+    def _unloaded_sources(self, existing_ids, sources):
+        """Return the stored chunk IDs of every manifest source missing from `sources` that still exists."""
+        unloaded = {}
+        for source, ids in self.manifest.load().get("sources", {}).items():
+            if source in sources or not (self.source_directory / source).exists():
+                continue
+            logger.warning(f"Keeping the stored chunks of {source}, which exists but was not loaded")
+            unloaded[source] = [chunk_id for chunk_id in ids if chunk_id in existing_ids]
+        return unloaded
+
+    @staticmethod
+    def _record_sources(items, sources):
+        """Pass items through, recording each chunk ID under its source file."""
+        for chunk_id, doc in items:
+            sources.setdefault(chunk_source(doc.metadata), []).append(chunk_id)
+            yield chunk_id, doc
+
+    def drop(self):
+        """Delete the collection together with the indexes and manifest kept next to it."""
+        with suppress(NotFoundError, ValueError):
+            self._get_client().delete_collection(self.collection_name)
+        shutil.rmtree(self.numpy_index_directory, ignore_errors=True)
+        self.bm25_index_path.unlink(missing_ok=True)
+        self.manifest.path.unlink(missing_ok=True)
+
+    def collection_version(self):
+        return self.manifest.version()
+
+    def export_indexes(self, numpy=True, bm25=True):
+        """Rebuild the numpy and BM25 indexes kept next to the collection, reading it a page at a time.
+
+        Seeding keeps the configured indexes up to date from the batches it
+        writes; this is the fallback when an index is missing or out of step.
+        """
+        snapshot = IndexSnapshot(
+            self.numpy_index_directory if numpy else None,
+            self.bm25_index_path if bm25 else None,
+        )
+        collection = self._get_client().get_or_create_collection(self.collection_name)
+        for offset in range(0, collection.count(), EXPORT_PAGE_SIZE):
+            page = collection.get(include=["embeddings", "documents", "metadatas"], limit=EXPORT_PAGE_SIZE, offset=offset)
+            snapshot.add(page["ids"], page["documents"], page["metadatas"], page["embeddings"])
+        snapshot.write()
+
+    def bm25_index(self):
+        if not self.bm25_index_path.exists():
+            self.export_indexes(numpy=False)
+        return BM25Index.load(self.bm25_index_path)
+
+    def _snapshot(self):
+        """Return a builder of the indexes the backend and retrieval mode read, or None when neither is used."""
+        numpy_directory = self.numpy_index_directory if self.backend == VectorStore.NUMPY else None
+        bm25_path = self.bm25_index_path if RETRIEVAL_MODE == VectorStore.HYBRID else None
+        return IndexSnapshot(numpy_directory, bm25_path) if numpy_directory or bm25_path else None
+
+    def _drop_unused_indexes(self):
+        """Delete indexes the configuration does not read, which would go stale; they are rebuilt on first use."""
+        if self.backend != VectorStore.NUMPY:
+            shutil.rmtree(self.numpy_index_directory, ignore_errors=True)
+        if RETRIEVAL_MODE != VectorStore.HYBRID:
+            self.bm25_index_path.unlink(missing_ok=True)
+
+    def get_retriever(self, mode=RETRIEVAL_MODE, k=RETRIEVER_K):
+        """Build the retriever used by the chat chain.
+
+        Args:
+            mode: "vector" for embedding similarity only, "hybrid" to fuse it with BM25.
+            k: Number of chunks to return.
+        """
+        db = self.load()
+        if mode == VectorStore.HYBRID:
+            return HybridRetriever(
+                vector_retriever=db.as_retriever(search_kwargs={"k": HYBRID_FETCH_K}),
+                bm25_index=self.bm25_index(),
+                k=k,
+            )
+        return db.as_retriever(search_kwargs={"k": k})
+
+    def relevance_search_by_vectors(self, embeddings, k=RETRIEVER_K):
+        """Return the (document, relevance in [0, 1]) hits of each query embedding, see `load`."""
+        return self.load().relevance_search_by_vectors(embeddings, k)
+
     def load(self):
-        return Chroma(
+        """Return the store searched at query time, as the backend setting says."""
+        if self.backend == VectorStore.NUMPY:
+            if not self.numpy_index_directory.exists():
+                self.export_indexes(bm25=False)
+            return NumpyVectorStore.load(self.numpy_index_directory, self.embedding_model)
+        return self._chroma()
+
+    def _chroma(self):
+        """Return the Chroma collection, which ingestion always writes through whatever the backend."""
+        return AsyncEmbeddingChroma(
+            client=self._get_client(),
             collection_name=self.collection_name,
-            persist_directory=self.persist_directory,
             embedding_function=self.embedding_model,
         )
+
+    def _embed_and_store(self, items, snapshot=None):
+        collection = self._get_client().get_or_create_collection(self.collection_name)
+
+        def write_batch(ids, documents, vectors):
+            texts, metadatas = [doc.page_content for doc in documents], [doc.metadata or None for doc in documents]
+            collection.upsert(ids=ids, embeddings=vectors, metadatas=metadatas, documents=texts)
+            if snapshot:
+                snapshot.add(ids, texts, metadatas, vectors)
+
+        return EmbeddingPipeline(self.embedding_model).run(items, write_batch)
+
+    def _get_client(self):
+        if self._client is None:
+            self._client = chromadb.PersistentClient(path=str(self.persist_directory))
+        return self._client
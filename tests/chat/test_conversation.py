@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import SystemMessage
+
+from src.chat.conversation import ConversationMemory, ConversationStore, QueryRewriter, history_turns
+from src.chat.query_router import QueryRouter
+from src.utils.token_counter import estimate_tokens
+from src.vector_store.blip_index import BlipIndex
+
+
+def blip(name, ring, volume):
+    return {
+        "number": "1", "name": name, "quadrant": "Tools", "ring": ring, "volume": volume,
+        "title": f"Technology Radar Vol {volume}",
+    }
+
+
+@pytest.fixture
+def blip_index():
+    return BlipIndex([
+        blip("Backstage", "Trial", "31"),
+        blip("Backstage", "Adopt", "32"),
+        blip("Renovate", "Adopt", "32"),
+    ])
+
+
+@pytest.fixture
+def rewriter(blip_index):
+    return QueryRewriter(blip_index)
+
+
+def test_follow_up_is_rewritten_with_the_last_blip_and_previous_volume(rewriter, blip_index):
+    memory = ConversationMemory()
+    rewriter.rewrite("Which ring is Backstage in Vol 32?", memory)
+    memory.add_turn("Which ring is Backstage in Vol 32?", "Backstage is in Adopt.")
+
+    query = rewriter.rewrite("and what about its ring last volume?", memory)
+
+    assert query == "and what about the ring of Backstage in Vol 31?"
+    assert QueryRouter(blip_index).route(query) == "Backstage is in Trial for Tools in Technology Radar Vol 31."
+
+
+def test_pronoun_is_replaced_by_the_last_blip(rewriter):
+    memory = ConversationMemory()
+    rewriter.rewrite("What is Renovate?", memory)
+
+    assert rewriter.rewrite("Who should use it?", memory) == "Who should use Renovate?"
+
+
+def test_standalone_questions_are_left_alone(rewriter):
+    memory = ConversationMemory()
+    rewriter.rewrite("What is Renovate?", memory)
+
+    assert rewriter.rewrite("Which tools are in Adopt?", memory) == "Which tools are in Adopt?"
+    assert rewriter.rewrite("What is Backstage?", memory) == "What is Backstage?"
+
+
+def test_unresolved_follow_up_uses_the_model_or_the_previous_question():
+    memory = ConversationMemory()
+    memory.add_turn("Tell me about platform engineering", "It is about internal developer platforms.")
+
+    assert QueryRewriter().rewrite("and why does it matter?", memory) == (
+        "Tell me about platform engineering and why does it matter?"
+    )
+    llm = FakeListChatModel(responses=["Why does platform engineering matter?"])
+    rewriter = QueryRewriter(llm=llm)
+    assert asyncio.run(rewriter.arewrite("and why does it matter?", memory)) == "Why does platform engineering matter?"
+
+
+def test_rephrased_follow_ups_share_the_context_key(rewriter):
+    assert rewriter.context_key("What is Backstage?") == rewriter.context_key("Who should use backstage")
+    assert rewriter.context_key("What is Backstage?") != rewriter.context_key("Backstage in Vol 31")
+
+
+def test_history_is_compacted_into_a_bounded_summary():
+    memory = ConversationMemory(token_budget=100, summary_budget=60)
+    for i in range(20):
+        memory.add_turn(f"Question {i} about a blip?", f"Answer {i}. " + "Details follow here. " * 10)
+
+    messages = memory.messages()
+    assert isinstance(messages[0], SystemMessage)
+    assert "Question 19" not in messages[0].content
+    assert sum(estimate_tokens(message.content) for message in messages) < 100 + 60 + 20
+    assert memory.turns[-1][0] == "Question 19 about a blip?"
+
+
+def test_context_cache_is_bounded():
+    memory = ConversationMemory(context_cache_size=2)
+    for key in ("a", "b", "c"):
+        memory.cache_context(key, f"context {key}")
+
+    assert memory.cached_context("a") is None
+    assert memory.cached_context("c") == "context c"
+
+
+def test_sessions_are_kept_apart_and_seeded_from_history(rewriter):
+    store = ConversationStore(max_sessions=2, rewriter=rewriter)
+    history = [
+        {"role": "user", "content": "What is Renovate?"},
+        {"role": "assistant", "content": "Renovate keeps dependencies up to date."},
+    ]
+
+    first = store.get("first", history)
+    assert store.get("first") is first
+    assert first.subject == "renovate"
+    assert len(first.turns) == 1
+    assert store.get("second") is not first
+
+    store.get("third")
+    assert len(store) == 2
+    assert store.get("first") is not first
+
+
+def test_history_turns_accepts_message_and_pair_formats():
+    assert history_turns([["hi", "hello"]]) == [("hi", "hello")]
+    assert history_turns([
+        {"role": "user", "content": "hi"},
+        {"role": "assistant", "content": {"path": "image.png"}},
+        {"role": "assistant", "content": "hello"},
+    ]) == [("hi", "hello")]
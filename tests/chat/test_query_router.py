@@ -0,0 +1,66 @@
+import pytest
+
+from src.chat.query_router import QueryRouter
+from src.vector_store.blip_index import BlipIndex
+
+BLIPS = [
+    {"number": 1, "name": "1% canary", "quadrant": "Techniques", "ring": "Adopt", "volume": "31", "title": "Technology Radar Vol 31"},
+    {"number": 45, "name": "Renovate", "quadrant": "Tools", "ring": "Trial", "volume": "31", "title": "Technology Radar Vol 31"},
+    {"number": 50, "name": "Renovate", "quadrant": "Tools", "ring": "Adopt", "volume": "32", "title": "Technology Radar Vol 32"},
+    {"number": 60, "name": "Dependabot", "quadrant": "Tools", "ring": "Hold", "volume": "32", "title": "Technology Radar Vol 32"},
+    {"number": 61, "name": "Structured output from LLMs", "quadrant": "Techniques", "ring": "Trial", "volume": "32", "title": "Technology Radar Vol 32"},
+]
+
+
+@pytest.fixture
+def router(tmp_path):
+    BlipIndex(BLIPS).save(tmp_path / "blip_index.json")
+    return QueryRouter(BlipIndex.load(tmp_path / "blip_index.json"))
+
+
+def test_ring_lookup_for_specific_volume(router):
+    assert router.route("Which ring is Renovate in vol 31?") == "Renovate is in Trial for Tools in Technology Radar Vol 31."
+
+
+def test_ring_lookup_across_volumes_lists_latest_first(router):
+    assert router.route("what ring is renovate in?") == (
+        "Renovate is in Adopt for Tools in Technology Radar Vol 32.\n"
+        "Renovate is in Trial for Tools in Technology Radar Vol 31."
+    )
+
+
+def test_ring_lookup_with_fuzzy_name(router):
+    assert router.route("Which ring is structured outputs from LLM?") == (
+        "Structured output from LLMs is in Trial for Techniques in Technology Radar Vol 32."
+    )
+
+
+def test_listing_defaults_to_latest_volume(router):
+    assert router.route("list Hold tools") == "Hold Tools blips in Technology Radar Vol 32:\n- Dependabot"
+    assert router.route("show adopt blips in volume 31") == "Adopt blips in Technology Radar Vol 31:\n- 1% canary (Techniques)"
+
+
+def test_open_ended_questions_fall_back(router):
+    assert router.route("Why should I use Renovate?") is None
+    assert router.route("Which ring is Kubernetes in?") is None
+
+
+@pytest.mark.parametrize("question", [
+    "What are good tools for testing microservices?",
+    "What are the risks of putting a platform on hold?",
+    "Show me how to adopt trunk-based development",
+    "List the trade-offs of techniques in Trial",
+    "Which ring is best for Renovate and why did it move?",
+    "What does the ring of Renovate say about its maturity?",
+])
+def test_open_ended_questions_mentioning_rings_or_quadrants_fall_back(router, question):
+    assert router.route(question) is None
+
+
+def test_lookups_with_filler_words_are_still_routed(router):
+    assert router.route("List all the Hold tools in the latest radar, please") == (
+        "Hold Tools blips in Technology Radar Vol 32:\n- Dependabot"
+    )
+    assert router.route("And what about the ring of Renovate in Vol 31?") == (
+        "Renovate is in Trial for Tools in Technology Radar Vol 31."
+    )
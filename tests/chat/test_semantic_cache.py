@@ -0,0 +1,58 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.chat.semantic_cache import SemanticCache
+
+
+class KeywordEmbedding:
+    """Embeds a question as counts of a few radar keywords."""
+
+    keywords = ["adopt", "tools", "hold", "platforms"]
+
+    def embed_query(self, text):
+        words = text.lower().replace("?", "").split()
+        return [float(words.count(keyword)) for keyword in self.keywords]
+
+
+@pytest.fixture
+def version():
+    return {"value": "v1"}
+
+
+@pytest.fixture
+def cache(version):
+    return SemanticCache(KeywordEmbedding(), lambda: version["value"], similarity_threshold=0.9, ttl_seconds=60, max_entries=2)
+
+
+def test_similar_question_hits_cache(cache):
+    cache.store("What is in adopt for tools?", "Answer about adopt tools")
+
+    assert cache.lookup("what's in Adopt for Tools") == "Answer about adopt tools"
+    assert cache.lookup("What is on hold for platforms?") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_entries_expire_after_ttl(cache):
+    with patch('src.chat.semantic_cache.time.monotonic', return_value=1000.0):
+        cache.store("adopt tools", "cached")
+    with patch('src.chat.semantic_cache.time.monotonic', return_value=1061.0):
+        assert cache.lookup("adopt tools") is None
+
+
+def test_least_recently_used_entry_is_evicted(cache):
+    cache.store("adopt", "a")
+    cache.store("tools", "t")
+    cache.lookup("adopt")
+    cache.store("hold", "h")
+
+    assert cache.lookup("adopt") == "a"
+    assert cache.lookup("tools") is None
+    assert cache.lookup("hold") == "h"
+
+
+def test_new_collection_version_clears_cache(cache, version):
+    cache.store("adopt tools", "stale answer")
+    version["value"] = "v2"
+
+    assert cache.lookup("adopt tools") is None
@@ -158,5 +158,73 @@ software versions, while reducing risk through incremental rollout to selected u
             self.assertEqual(item_data["volume"], base_metadata["volume"])
             self.assertEqual(item_data["period"], base_metadata["period"])
 
+    def test_process_metadata_uses_first_listing_and_tolerates_split_numbers(self):
+        cleaned_text = """Tools
+Adopt
+75. dbt
+Trial
+7 7. CAP
+78. CARLA
+Assess
+Hold
+79. Kedro
+
+Tools
+Adopt
+75. dbt described again
+"""
+        result = self.processor._process_metadata(cleaned_text, {"volume": "31"})
+
+        self.assertEqual(list(result), ["75. dbt", "7. CAP", "78. CARLA", "79. Kedro"])
+        self.assertEqual(result["7. CAP"], {"volume": "31", "quadrant": "Tools", "ring": "Trial"})
+        self.assertEqual(result["79. Kedro"]["ring"], "Hold")
+
+    def test_extract_blips(self):
+        text = """Languages and \nFrameworks
+Adopt
+90. Svelte
+Trial
+91. Tamagui
+Assess
+92. PydanticAI
+Hold
+93. Node overload
+"""
+        test_doc = Document(page_content=text, metadata=self.sample_metadata)
+
+        blips = self.processor.extract_blips([test_doc])
+
+        self.assertEqual([blip["name"] for blip in blips], ["Svelte", "Tamagui", "PydanticAI", "Node overload"])
+        self.assertEqual(blips[2], {
+            "number": 92,
+            "name": "PydanticAI",
+            "quadrant": "Languages and Frameworks",
+            "ring": "Assess",
+            "volume": "32",
+            "title": "Technology Radar Vol 32",
+        })
+
+    def test_iter_chunks_collects_blips_in_the_same_pass(self):
+        text = """Languages and \nFrameworks
+Adopt
+90. Svelte
+Trial
+91. Tamagui
+Assess
+92. PydanticAI
+Hold
+93. Node overload
+"""
+        test_doc = Document(page_content=text, metadata=self.sample_metadata)
+        expected = self.processor.extract_blips([test_doc])
+        blips = []
+
+        with patch.object(self.processor, "_process_metadata", wraps=self.processor._process_metadata) as process_metadata:
+            chunks = list(self.processor.iter_chunks([test_doc], blips=blips))
+
+        self.assertTrue(chunks)
+        self.assertEqual(blips, expected)
+        process_metadata.assert_called_once()
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,30 @@
+import logging
+
+import pytest
+
+from config import RAW_DATA_DIR
+from src.data_ingestion.document_loader import DocumentLoader
+
+
+def test_errors_in_parallel_workers_are_logged(tmp_path, caplog):
+    for volume in ("31", "32"):
+        (tmp_path / f"tr_technology_radar_vol_{volume}_en.pdf").write_bytes(b"not a pdf at all")
+    loader = DocumentLoader(str(tmp_path), max_workers=2, text_cache_dir=None)
+
+    with caplog.at_level(logging.INFO), pytest.raises(ValueError, match="not successful"):
+        loader.load_radar_files(parallel=True)
+
+    worker_errors = [record for record in caplog.records if record.message.startswith("Error validating PDF")]
+    assert sorted(record.message.split()[3].rsplit("/", 1)[-1] for record in worker_errors) == [
+        "tr_technology_radar_vol_31_en.pdf:", "tr_technology_radar_vol_32_en.pdf:",
+    ]
+
+
+def test_parallel_loading_matches_serial_loading():
+    loader = DocumentLoader(str(RAW_DATA_DIR), max_workers=2, text_cache_dir=None)
+
+    serial = loader.load_radar_files()
+    parallel = loader.load_radar_files(parallel=True)
+
+    assert [doc.metadata["source"] for doc in serial] == sorted(str(path) for path in RAW_DATA_DIR.glob("*.pdf"))
+    assert parallel == serial
@@ -0,0 +1,86 @@
+from unittest.mock import patch
+
+from langchain_core.documents import Document
+
+from src.data_ingestion.document_loader import DocumentLoader
+from src.data_ingestion.pdf_text_cache import PdfTextCache
+
+FILENAME = "tr_technology_radar_vol_32_en.pdf"
+
+
+def fake_pdf_loader(calls):
+    class FakePyPDFLoader:
+        def __init__(self, path, mode):
+            self.path = path
+
+        def load(self):
+            calls.append(self.path)
+            return [Document(page_content="1. Backstage\nAdopt", metadata={"source": self.path, "total_pages": 46})]
+
+    return FakePyPDFLoader
+
+
+def test_unchanged_pdf_is_parsed_once(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / FILENAME).write_bytes(b"%PDF-1.7 radar")
+    calls = []
+
+    with patch("src.data_ingestion.document_loader.PyPDFLoader", fake_pdf_loader(calls)):
+        loader = DocumentLoader(str(data_dir), text_cache_dir=tmp_path / "cache")
+        first = loader.load_radar_files()
+        second = loader.load_radar_files(parallel=True)
+
+    assert len(calls) == 1
+    assert second == first
+    assert second[0].metadata == {"source": str(data_dir / FILENAME), "total_pages": 46}
+
+
+def test_changed_pdf_is_parsed_again(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    pdf = data_dir / FILENAME
+    pdf.write_bytes(b"%PDF-1.7 radar")
+    calls = []
+
+    with patch("src.data_ingestion.document_loader.PyPDFLoader", fake_pdf_loader(calls)):
+        loader = DocumentLoader(str(data_dir), text_cache_dir=tmp_path / "cache")
+        loader.load_radar_files()
+        pdf.write_bytes(b"%PDF-1.7 radar, updated")
+        loader.load_radar_files()
+
+    assert len(calls) == 2
+
+
+def test_cached_text_is_not_served_for_invalid_files(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / FILENAME).write_bytes(b"%PDF-1.7 radar")
+    (data_dir / "meeting_notes.pdf").write_bytes(b"%PDF-1.7 radar")
+
+    with patch("src.data_ingestion.document_loader.PyPDFLoader", fake_pdf_loader([])):
+        loader = DocumentLoader(str(data_dir), text_cache_dir=tmp_path / "cache")
+        loader.load_radar_files()
+        docs = loader.load_radar_files()
+
+    assert [doc.metadata["source"] for doc in docs] == [str(data_dir / FILENAME)]
+
+
+def test_unreadable_pdf_does_not_abort_loading(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / FILENAME).write_bytes(b"%PDF-1.7 radar")
+    unreadable = data_dir / "tr_technology_radar_vol_33_en.pdf"
+    unreadable.write_bytes(b"%PDF-1.7 radar 33")
+    key = PdfTextCache.key
+
+    def failing_key(filepath):
+        if filepath == unreadable:
+            raise PermissionError(f"Permission denied: {filepath}")
+        return key(filepath)
+
+    with patch("src.data_ingestion.document_loader.PyPDFLoader", fake_pdf_loader([])), \
+        patch.object(PdfTextCache, "key", staticmethod(failing_key)):
+        docs = DocumentLoader(str(data_dir), text_cache_dir=tmp_path / "cache").load_radar_files()
+
+    assert [doc.metadata["source"] for doc in docs] == [str(data_dir / FILENAME)]
@@ -0,0 +1,11 @@
+import pytest
+
+from src.llm.model_manager import LLMModelManager
+
+
+@pytest.fixture(autouse=True)
+def clear_llm_clients():
+    """Keep memoized clients (possibly mocks) from leaking between tests."""
+    LLMModelManager.clear_clients()
+    yield
+    LLMModelManager.clear_clients()
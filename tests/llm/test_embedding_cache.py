@@ -0,0 +1,108 @@
+import asyncio
+import threading
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.llm.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+
+class CountingEmbedding(DeterministicFakeEmbedding):
+    calls: list = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return super().embed_documents(texts)
+
+    def embed_query(self, text):
+        self.calls.append([text])
+        return super().embed_query(text)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EmbeddingCache(tmp_path / "embeddings.sqlite3", max_entries=3)
+
+
+@pytest.fixture
+def embeddings(cache):
+    return CachedEmbeddings(CountingEmbedding(size=4, calls=[]), "test-alias", cache)
+
+
+def test_embed_documents_only_embeds_missing_texts(embeddings, cache):
+    first = embeddings.embed_documents(["adopt", "trial"])
+    second = embeddings.embed_documents(["adopt", "hold", "trial"])
+
+    assert embeddings.embeddings.calls == [["adopt", "trial"], ["hold"]]
+    assert second[0] == pytest.approx(first[0], rel=1e-6)
+    assert second[2] == pytest.approx(first[1], rel=1e-6)
+    assert cache.stats() == {"hits": 2, "misses": 3, "entries": 3}
+
+
+def test_embed_query_is_cached(embeddings, cache):
+    first = embeddings.embed_query("what is in adopt?")
+    second = embeddings.embed_query("what is in adopt?")
+
+    assert embeddings.embeddings.calls == [["what is in adopt?"]]
+    assert second == pytest.approx(first, rel=1e-6)
+    assert cache.stats()["hits"] == 1
+
+
+def test_cache_is_keyed_by_model_alias(embeddings, cache):
+    embeddings.embed_query("assess")
+    other = CachedEmbeddings(CountingEmbedding(size=4, calls=[]), "other-alias", cache)
+    other.embed_query("assess")
+
+    assert other.embeddings.calls == [["assess"]]
+
+
+def test_least_recently_used_entries_are_evicted(embeddings, cache):
+    embeddings.embed_documents(["a", "b", "c"])
+    embeddings.embed_query("a")
+    embeddings.embed_query("d")
+
+    assert cache.stats()["entries"] == 3
+    vectors = cache.get_many("test-alias", ["a", "b", "c", "d"])
+    assert [vector is not None for vector in vectors] == [True, False, True, True]
+
+
+def test_async_embeddings_use_cache(embeddings):
+    asyncio.run(embeddings.aembed_documents(["platforms"]))
+    asyncio.run(embeddings.aembed_query("platforms"))
+
+    assert embeddings.embeddings.calls == [["platforms"]]
+
+
+def test_cache_hits_write_their_use_times_in_batches(tmp_path):
+    cache = EmbeddingCache(tmp_path / "embeddings.sqlite3", max_entries=10, touch_batch_size=2)
+    cache.put_many("test-alias", ["a", "b"], [[1.0], [2.0]])
+    changes = cache._conn.total_changes
+
+    cache.get_many("test-alias", ["a"])
+    assert cache._conn.total_changes == changes
+    cache.get_many("test-alias", ["b"])
+    assert cache._conn.total_changes == changes + 2
+
+
+def test_entry_count_survives_reopening(tmp_path, embeddings, cache):
+    embeddings.embed_documents(["a", "b", "a"])
+    embeddings.embed_documents(["b", "c"])
+
+    assert cache.stats()["entries"] == 3
+    assert EmbeddingCache(tmp_path / "embeddings.sqlite3").stats()["entries"] == 3
+
+
+def test_async_embeddings_read_the_cache_off_the_event_loop(embeddings, cache):
+    threads = []
+    get_many = cache.get_many
+
+    def recording_get_many(*args):
+        threads.append(threading.current_thread())
+        return get_many(*args)
+
+    cache.get_many = recording_get_many
+    asyncio.run(embeddings.aembed_query("platforms"))
+    asyncio.run(embeddings.aembed_documents(["platforms"]))
+
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
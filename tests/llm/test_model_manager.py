@@ -1,6 +1,12 @@
+import asyncio
+import json
+import logging
 import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
 from unittest.mock import patch
 from src.llm.model_manager import LLMModelManager
+from src.llm.model_router import RoutedChatModel
 import os
 
 @pytest.fixture
@@ -100,3 +106,66 @@ def test_override_parameters_in_completion(env_vars):
         assert call_args['temperature'] == 0.9
         assert call_args['max_tokens'] == 100
 
+
+def test_achat_completion_uses_async_completion(env_vars):
+    """Test that async chat completion awaits litellm's async completion"""
+    messages = [{"role": "user", "content": "Hello"}]
+
+    with patch.dict(os.environ, {'MODEL_NAME': 'gpt-5-mini', **env_vars}), \
+        patch('src.llm.model_manager.acompletion') as mock_acompletion:
+
+        mock_acompletion.return_value = {'choices': [{'message': {'content': 'test-response'}}]}
+        manager = LLMModelManager()
+        response = asyncio.run(manager.achat_completion(messages))
+
+        assert response['choices'][0]['message']['content'] == 'test-response'
+        call_args = mock_acompletion.call_args[1]
+        assert call_args['model'] == 'gpt-5-mini-2025-08-07'
+        assert call_args['messages'] == messages
+
+
+def test_clients_are_shared_across_managers(env_vars):
+    """Test that repeated construction reuses the registered chat and embedding clients"""
+    with patch.dict(os.environ, {'MODEL_NAME': 'ollama-mistral', 'EMBEDDING_MODEL_NAME': 'ollama-nominic', **env_vars}), \
+        patch('src.llm.model_manager.ChatLiteLLM', side_effect=lambda **_: object()) as mock_chat_model, \
+        patch('src.llm.model_manager.OllamaEmbeddings', side_effect=lambda **_: object()) as mock_embeddings:
+
+        first = LLMModelManager()
+        second = LLMModelManager()
+
+        assert first.get_chat_model() is second.get_chat_model()
+        assert first.get_embedding_model(cached=False) is second.get_embedding_model(cached=False)
+        assert first.get_chat_model(temperature=0.1) is not first.get_chat_model()
+        assert mock_chat_model.call_count == 2
+        mock_embeddings.assert_called_once()
+
+
+def test_litellm_callbacks_log_one_structured_record(caplog):
+    """Test that each LLM call is logged as a single JSON record"""
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    end = start + timedelta(milliseconds=250)
+    response = SimpleNamespace(usage=SimpleNamespace(prompt_tokens=120, completion_tokens=30))
+
+    with caplog.at_level(logging.INFO, logger="tech_radar"):
+        LLMModelManager._log_success({'litellm_call_id': 'call-1', 'model': 'gpt-5-mini'}, response, start, end)
+        LLMModelManager._log_failure({'litellm_call_id': 'call-2', 'model': 'gpt-5-mini'}, "timeout", start, end)
+
+    success, failure = [json.loads(record.getMessage().removeprefix("llm_call ")) for record in caplog.records]
+    assert success == {
+        'call_id': 'call-1', 'model': 'gpt-5-mini', 'stream': False,
+        'duration_ms': 250.0, 'prompt_tokens': 120, 'completion_tokens': 30,
+    }
+    assert failure['error'] == "timeout"
+    assert caplog.records[1].levelno == logging.ERROR
+
+
+def test_fallback_models_are_wrapped_in_a_router(env_vars):
+    """Test that FALLBACK_MODELS routes across the configured model and the known fallbacks"""
+    with patch.dict(os.environ, {'MODEL_NAME': 'ollama-mistral', **env_vars}), \
+        patch('src.llm.model_manager.FALLBACK_MODELS', ['gpt-5-mini', 'no-such-model', 'ollama-mistral']), \
+        patch('src.llm.model_manager.ChatLiteLLM', side_effect=lambda **params: params['model_alias']):
+        chat_model = LLMModelManager().get_chat_model()
+
+        assert isinstance(chat_model, RoutedChatModel)
+        assert chat_model.router.models == {'ollama-mistral': 'ollama-mistral', 'gpt-5-mini': 'gpt-5-mini'}
+        assert LLMModelManager().get_chat_model() is chat_model
@@ -0,0 +1,219 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from src.llm.model_router import RESPONSE, ModelRouter, ProviderStats, RoutedChatModel
+
+
+class StubChatModel(BaseChatModel):
+    """Answers with a fixed reply after a delay, or fails like an unreachable provider."""
+
+    reply: str
+    delay: float = 0.0
+    fail: bool = False
+    calls: int = 0
+
+    @property
+    def _llm_type(self):
+        return "stub"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError(f"{self.reply} is down")
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.reply))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError(f"{self.reply} is down")
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.reply))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError(f"{self.reply} is down")
+        for word in self.reply.split(" "):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=f"{word} "))
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError(f"{self.reply} is down")
+        for word in self.reply.split(" "):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=f"{word} "))
+
+
+@pytest.fixture
+def fast_hedging():
+    with patch("src.llm.model_router.HEDGE_DEFAULT_DELAY_SECONDS", 0.05), \
+        patch("src.llm.model_router.HEDGE_MIN_DELAY_SECONDS", 0.01):
+        yield
+
+
+def routed(**models):
+    return RoutedChatModel(router=ModelRouter(models))
+
+
+def test_primary_answers_without_hedging(fast_hedging):
+    primary, backup = StubChatModel(reply="primary"), StubChatModel(reply="backup")
+    llm = routed(primary=primary, backup=backup)
+
+    assert llm.invoke("hi").content == "primary"
+    assert backup.calls == 0
+
+
+def test_slow_primary_is_hedged_and_first_answer_wins(fast_hedging):
+    primary, backup = StubChatModel(reply="primary", delay=0.5), StubChatModel(reply="backup")
+    llm = routed(primary=primary, backup=backup)
+
+    start = time.perf_counter()
+    assert llm.invoke("hi").content == "backup"
+    assert time.perf_counter() - start < 0.4
+    assert asyncio.run(llm.ainvoke("hi")).content == "backup"
+
+
+def test_failed_model_fails_over_to_the_next(fast_hedging):
+    llm = routed(primary=StubChatModel(reply="primary", fail=True), backup=StubChatModel(reply="backup"))
+
+    assert llm.invoke("hi").content == "backup"
+    assert asyncio.run(llm.ainvoke("hi")).content == "backup"
+    assert llm.router.stats["primary"].error_rate() == 1.0
+
+
+def test_last_error_is_raised_when_every_model_fails(fast_hedging):
+    llm = routed(primary=StubChatModel(reply="primary", fail=True), backup=StubChatModel(reply="backup", fail=True))
+
+    with pytest.raises(ConnectionError, match="backup is down"):
+        llm.invoke("hi")
+
+
+def test_stream_races_on_the_first_chunk(fast_hedging):
+    primary, backup = StubChatModel(reply="slow answer", delay=0.5), StubChatModel(reply="fast answer")
+    llm = routed(primary=primary, backup=backup)
+
+    async def collect():
+        return "".join([chunk.content async for chunk in llm.astream("hi")])
+
+    assert asyncio.run(collect()).strip() == "fast answer"
+
+
+def test_stream_fails_over_before_the_first_chunk(fast_hedging):
+    llm = routed(primary=StubChatModel(reply="primary", fail=True), backup=StubChatModel(reply="backup answer"))
+
+    assert "".join(chunk.content for chunk in llm.stream("hi")).strip() == "backup answer"
+
+
+class TrackedStream:
+    """Chunk iterator that, like a provider's HTTP stream, is only released by `close()`."""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.chunks)
+
+    def close(self):
+        self.closed = True
+
+
+def test_stream_closes_the_losing_model_stream(fast_hedging):
+    streams = {}
+
+    def open_stream(model):
+        time.sleep(model.delay)
+        streams[model.reply] = TrackedStream([model.reply, "more"])
+        return streams[model.reply]
+
+    router = ModelRouter({"primary": StubChatModel(reply="slow", delay=0.3), "backup": StubChatModel(reply="fast")})
+
+    assert list(router.stream(open_stream)) == ["fast", "more"]
+    assert streams["fast"].closed
+    deadline = time.monotonic() + 2
+    while "slow" not in streams or not streams["slow"].closed:
+        assert time.monotonic() < deadline, "losing stream was never closed"
+        time.sleep(0.01)
+
+
+class TrackedAsyncStream:
+    """Async chunk iterator that awaits `gate()` before its first chunk and records `aclose()`."""
+
+    def __init__(self, chunks, gate):
+        self.chunks = iter(chunks)
+        self.gate = gate
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.gate:
+            await self.gate()
+            self.gate = None
+        try:
+            return next(self.chunks)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_astream_closes_streams_that_finish_together_with_the_winner(fast_hedging):
+    streams = []
+
+    async def collect():
+        backup_started = asyncio.Event()
+
+        async def start_backup():
+            backup_started.set()
+
+        def open_stream(model):
+            gate = backup_started.wait if model.reply == "primary" else start_backup
+            streams.append(TrackedAsyncStream([model.reply], gate))
+            return streams[-1]
+
+        router = ModelRouter({"primary": StubChatModel(reply="primary"), "backup": StubChatModel(reply="backup")})
+        return [chunk async for chunk in router.astream(open_stream)]
+
+    assert asyncio.run(collect()) in (["primary"], ["backup"])
+    assert len(streams) == 2
+    assert all(stream.closed for stream in streams)
+
+
+def test_repeated_failures_eject_a_model_until_the_cooldown_passes():
+    stats = ProviderStats("primary")
+    with patch("src.llm.model_router.ROUTER_MAX_CONSECUTIVE_FAILURES", 2), \
+        patch("src.llm.model_router.ROUTER_COOLDOWN_SECONDS", 60):
+        stats.record_failure()
+        assert stats.is_healthy()
+        stats.record_failure()
+        assert not stats.is_healthy()
+
+    router = ModelRouter({"backup": StubChatModel(reply="backup"), "primary": StubChatModel(reply="primary")})
+    router.stats["backup"] = stats
+    assert router.candidates() == ["primary", "backup"]
+
+
+def test_deadline_follows_the_p95_latency():
+    router = ModelRouter({"primary": StubChatModel(reply="primary")})
+    with patch("src.llm.model_router.HEDGE_DEFAULT_DELAY_SECONDS", 10), \
+        patch("src.llm.model_router.HEDGE_MIN_DELAY_SECONDS", 0.1), \
+        patch("src.llm.model_router.ROUTER_MIN_SAMPLES", 20):
+        assert router.deadline("primary") == 10
+        for latency in range(1, 21):
+            router.stats["primary"].record_success(RESPONSE, latency / 10)
+        assert router.deadline("primary") == pytest.approx(1.9)
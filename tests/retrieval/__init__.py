@@ -0,0 +1 @@
+"""Retrieval tests package."""
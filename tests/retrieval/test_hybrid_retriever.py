@@ -0,0 +1,54 @@
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from src.retrieval.hybrid_retriever import HybridRetriever, reciprocal_rank_fusion
+from src.vector_store.bm25_index import BM25Index
+
+IDS = ["c1", "c2", "c3", "c4"]
+TEXTS = [
+    "1. Backstage\nAdopt\nBackstage is an open platform for building developer portals.",
+    "2. DORA metrics\nAdopt\nThe four key metrics measure delivery performance.",
+    "3. Renovate\nTrial\nRenovate keeps dependencies up to date.",
+    "4. Developer portals\nAssess\nInternal developer platforms and portals.",
+]
+
+
+class StaticRetriever(BaseRetriever):
+    documents: list[Document]
+
+    def _get_relevant_documents(self, query, *, run_manager):
+        return self.documents
+
+
+def make_doc(index):
+    return Document(id=IDS[index], page_content=TEXTS[index])
+
+
+def test_bm25_ranks_exact_term_first(tmp_path):
+    index = BM25Index.build(IDS, TEXTS, [{} for _ in IDS])
+    index.save(tmp_path / "bm25.json")
+    loaded = BM25Index.load(tmp_path / "bm25.json")
+
+    results = loaded.search("DORA metrics", k=2)
+
+    assert results[0][0].id == "c2"
+    assert all(score > 0 for _, score in results)
+    assert loaded.search("kubernetes") == []
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([[make_doc(0), make_doc(1)], [make_doc(1), make_doc(2)]], k=3)
+
+    assert [doc.id for doc in fused] == ["c2", "c1", "c3"]
+
+
+def test_hybrid_retriever_promotes_keyword_match():
+    retriever = HybridRetriever(
+        vector_retriever=StaticRetriever(documents=[make_doc(3), make_doc(0), make_doc(2)]),
+        bm25_index=BM25Index.build(IDS, TEXTS, [{} for _ in IDS]),
+        k=2,
+    )
+
+    docs = retriever.invoke("Backstage")
+
+    assert [doc.id for doc in docs] == ["c1", "c4"]
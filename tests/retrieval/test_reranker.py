@@ -0,0 +1,68 @@
+import asyncio
+
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from src.retrieval.reranker import (
+    LexicalScorer,
+    RerankingRetriever,
+    format_context,
+)
+from src.utils.token_counter import estimate_tokens
+
+BACKSTAGE = "1. Backstage\nBackstage is an open platform for building developer portals."
+DORA = "2. DORA metrics\nThe four key metrics measure software delivery performance."
+RENOVATE = "3. Renovate\nRenovate keeps dependencies up to date automatically."
+
+
+class StaticRetriever(BaseRetriever):
+    documents: list[Document]
+
+    def _get_relevant_documents(self, query, *, run_manager):
+        return self.documents
+
+
+def make_retriever(*texts, **kwargs):
+    documents = [Document(id=f"c{index}", page_content=text) for index, text in enumerate(texts)]
+    return RerankingRetriever(base_retriever=StaticRetriever(documents=documents), scorer=LexicalScorer(), **kwargs)
+
+
+def test_lexical_scorer_ranks_matching_chunk_first():
+    retriever = make_retriever(BACKSTAGE, DORA, RENOVATE, k=2)
+
+    results = retriever.invoke("How do teams use DORA metrics?")
+
+    assert results[0].page_content == DORA
+    assert results[0].metadata["rerank_score"] > results[1].metadata["rerank_score"]
+
+
+def test_duplicates_are_dropped():
+    retriever = make_retriever(DORA, DORA + " ", RENOVATE, k=3)
+
+    results = retriever.invoke("DORA metrics")
+
+    assert [doc.page_content for doc in results] == [DORA, RENOVATE]
+
+
+def test_context_is_trimmed_to_token_budget():
+    long_chunk = "DORA metrics " * 200
+    retriever = make_retriever(long_chunk, DORA, RENOVATE, k=3, token_budget=40)
+
+    results = asyncio.run(retriever.ainvoke("DORA metrics"))
+
+    assert results[0].page_content.startswith("DORA metrics")
+    assert len(results) == 1
+    assert estimate_tokens(format_context(results)) <= 40
+
+
+def test_min_score_drops_unrelated_chunks_but_keeps_best():
+    retriever = make_retriever(BACKSTAGE, DORA, RENOVATE, k=3, min_score=0.1)
+
+    assert [doc.page_content for doc in retriever.invoke("DORA metrics")] == [DORA]
+    assert len(retriever.invoke("kubernetes")) == 1
+
+
+def test_format_context_includes_radar_placement():
+    doc = Document(page_content=DORA, metadata={"title": "Technology Radar Vol 32", "quadrant": "Techniques", "ring": "Adopt"})
+
+    assert format_context([doc]).startswith("[Technology Radar Vol 32 | Techniques | Adopt]\n2. DORA metrics")
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models import FakeListChatModel
+
+from src.chat.chatbot import ChatBot
+from src.scripts.batch_questions import BatchAnswerer, read_questions
+from src.vector_store.ingest_manifest import iter_chunk_ids
+from src.vector_store.vector_store import VectorStore
+
+INGEST_PARAMS = {"processor_type": "vector_basic", "chunk_size": 1000, "chunk_overlap": 200}
+TEXTS = ["1. Backstage", "2. DORA metrics", "3. Renovate"]
+
+
+class FailingChatModel(FakeListChatModel):
+    def _call(self, messages, *args, **kwargs):
+        if "DORA" in messages[-1].content:
+            raise RuntimeError("model unavailable")
+        return super()._call(messages, *args, **kwargs)
+
+
+@pytest.fixture
+def chatbot(tmp_path):
+    store = VectorStore(
+        collection_name="test_batch",
+        persist_directory=str(tmp_path),
+        embedding_model=DeterministicFakeEmbedding(size=8),
+    )
+    docs = [Document(page_content=text, metadata={"source": "data/tr_technology_radar_vol_32_en.pdf"}) for text in TEXTS]
+    store.sync(iter_chunk_ids(docs, **INGEST_PARAMS), **INGEST_PARAMS)
+    chatbot = ChatBot(vector_store=store, llm=FailingChatModel(responses=["an answer"]))
+    chatbot.query_router = None
+    return chatbot
+
+
+def test_batch_answers_are_written_in_input_order(chatbot, tmp_path):
+    questions = tmp_path / "questions.jsonl"
+    questions.write_text(
+        '{"question": "1. Backstage"}\n\n{"id": "renovate", "question": "3. Renovate"}\n{"question": "2. DORA metrics"}\n',
+        encoding="utf-8",
+    )
+    output = tmp_path / "answers.jsonl"
+
+    BatchAnswerer(chatbot, max_workers=2).run(read_questions(questions), output)
+
+    results = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [result["id"] for result in results] == [1, "renovate", 4]
+    assert [result["answer"] for result in results[:2]] == ["an answer", "an answer"]
+    assert results[0]["chunk_ids"]
+    assert "generation_ms" in results[0]["timings"]
+    assert results[2]["error"] == "model unavailable"
+
+
+def test_questions_need_a_question_string(tmp_path):
+    questions = tmp_path / "questions.jsonl"
+    questions.write_text('{"prompt": "What is Backstage?"}\n', encoding="utf-8")
+
+    with pytest.raises(ValueError, match="questions.jsonl:1"):
+        read_questions(questions)
@@ -0,0 +1,27 @@
+import subprocess
+import sys
+import tomllib
+
+import pytest
+
+from config import ROOT_DIR
+
+PYPROJECT = tomllib.loads((ROOT_DIR / "pyproject.toml").read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("name", sorted(PYPROJECT["project"]["scripts"]))
+def test_console_script_resolves_from_the_installed_packages(name, tmp_path):
+    # Only the packaged directories are importable, as in an installed wheel; main.py is not.
+    for package in PYPROJECT["tool"]["setuptools"]["packages"]:
+        (tmp_path / package).symlink_to(ROOT_DIR / package)
+    module, _, attribute = PYPROJECT["project"]["scripts"][name].partition(":")
+
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-I", "-c", f"import sys; sys.path.insert(0, {str(tmp_path)!r}); from {module} import {attribute}"],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert result.returncode == 0, result.stderr
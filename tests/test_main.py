@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models import FakeListChatModel
+
+from main import create_server
+from src.chat.chatbot import FIRST_TOKEN_LATENCY, ChatBot
+from src.llm.model_router import ModelRouter, RoutedChatModel
+from src.vector_store.ingest_manifest import iter_chunk_ids
+from src.vector_store.vector_store import VectorStore
+
+INGEST_PARAMS = {"processor_type": "vector_basic", "chunk_size": 1000, "chunk_overlap": 200}
+
+
+class UnreachableChatModel(FakeListChatModel):
+    failures: int = 1_000
+
+    def _call(self, *args, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("connection refused")
+        return super()._call(*args, **kwargs)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = VectorStore(
+        collection_name="test_main",
+        persist_directory=str(tmp_path),
+        embedding_model=DeterministicFakeEmbedding(size=8),
+    )
+    docs = [Document(page_content="1. Backstage", metadata={"source": "data/tr_technology_radar_vol_32_en.pdf"})]
+    store.sync(iter_chunk_ids(docs, **INGEST_PARAMS), **INGEST_PARAMS)
+    return store
+
+
+def test_warm_up_reports_every_component_ready(store):
+    chatbot = ChatBot(vector_store=store, llm=FakeListChatModel(responses=["OK"]))
+    client = TestClient(create_server(chatbot))
+
+    chatbot.warm_up()
+
+    response = client.get("/ready")
+    assert response.status_code == 200
+    components = response.json()["components"]
+    assert set(components) == {"prompt", "embedding_model", "vector_store", "llm"}
+    assert all(component["status"] == "ready" for component in components.values())
+    assert client.get("/health").json() == {"status": "ok"}
+
+
+def test_server_is_not_ready_while_a_model_is_unreachable(store):
+    chatbot = ChatBot(vector_store=store, llm=UnreachableChatModel(responses=[]))
+    client = TestClient(create_server(chatbot))
+
+    chatbot.warm_up()
+
+    response = client.get("/ready")
+    assert response.status_code == 503
+    llm = response.json()["components"]["llm"]
+    assert (llm["status"], llm["error"]) == ("failed", "connection refused")
+    assert response.json()["components"]["vector_store"]["status"] == "ready"
+    assert client.get("/health").status_code == 200
+
+
+def test_component_failing_at_startup_becomes_ready_on_retry(store):
+    chatbot = ChatBot(vector_store=store, llm=UnreachableChatModel(responses=["OK"], failures=1))
+    client = TestClient(create_server(chatbot))
+
+    chatbot.warm_up()
+    assert client.get("/ready").status_code == 503
+
+    chatbot.readiness.retry_failed()
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["components"]["llm"]["status"] == "ready"
+
+
+def test_routed_models_are_ready_once_one_has_warmed_up(store):
+    router = ModelRouter({
+        "primary": FakeListChatModel(responses=["OK"]),
+        "backup": UnreachableChatModel(responses=[]),
+    })
+    chatbot = ChatBot(vector_store=store, llm=RoutedChatModel(router=router))
+
+    chatbot.warm_up()
+
+    status = TestClient(create_server(chatbot)).get("/ready").json()
+    assert status["ready"]
+    assert status["components"]["llm:backup"]["status"] == "failed"
+
+
+@pytest.mark.parametrize("asynchronous", [False, True])
+def test_streamed_answer_grows_in_order_and_records_time_to_first_token(store, asynchronous):
+    answer = "Backstage sits in Adopt."
+    chatbot = ChatBot(vector_store=store, llm=FakeListChatModel(responses=[answer], sleep=0.001))
+    chatbot.answer_cache = None
+    question = "Why would a team standardise on a developer portal?"
+    first_tokens = FIRST_TOKEN_LATENCY.count
+
+    if asynchronous:
+        async def collect():
+            return [partial async for partial in chatbot.astream_chat(question, [])]
+        partials = asyncio.run(collect())
+    else:
+        partials = list(chatbot.stream_chat(question, []))
+
+    assert len(partials) == len(answer)
+    assert partials == [answer[:i] for i in range(1, len(answer) + 1)]
+    assert FIRST_TOKEN_LATENCY.count == first_tokens + 1
+    assert FIRST_TOKEN_LATENCY.quantiles()[0.5] > 0
@@ -0,0 +1,53 @@
+import math
+
+from src.utils.metrics import Histogram, MetricsRegistry
+
+
+def test_histogram_reports_quantiles_sum_and_count():
+    registry = MetricsRegistry(prefix="test_")
+    histogram = registry.histogram("latency_seconds", "Request latency")
+    for value in range(1, 101):
+        histogram.observe(value / 100)
+
+    quantiles = histogram.quantiles()
+
+    assert quantiles == {0.5: 0.5, 0.95: 0.95, 0.99: 0.99}
+    assert histogram.count == 100
+    assert math.isclose(histogram.sum, 50.5)
+
+
+def test_histogram_window_keeps_recent_observations():
+    histogram = Histogram("latency_seconds", window_size=10)
+    for value in [100.0] * 10 + [1.0] * 10:
+        histogram.observe(value)
+
+    assert histogram.quantiles()[0.99] == 1.0
+    assert histogram.count == 20
+
+
+def test_render_prometheus_text():
+    registry = MetricsRegistry(prefix="test_")
+    registry.counter("requests_total", "Requests received").inc(3)
+    with registry.histogram("stage_seconds").time():
+        pass
+    registry.histogram("empty_seconds")
+    registry.register_callback("cache_hits_total", "Cache hits", lambda: 7)
+
+    text = registry.render()
+
+    assert "# HELP test_requests_total Requests received\n# TYPE test_requests_total counter\ntest_requests_total 3\n" in text
+    assert "# TYPE test_stage_seconds summary" in text
+    assert 'test_stage_seconds{quantile="0.99"}' in text
+    assert "test_stage_seconds_count 1" in text
+    assert 'test_empty_seconds{quantile="0.5"} NaN' in text
+    assert "test_cache_hits_total 7" in text
+
+
+def test_registry_returns_same_metric_for_name(tmp_path):
+    registry = MetricsRegistry(prefix="test_")
+    registry.counter("requests_total").inc()
+    registry.counter("requests_total").inc()
+
+    registry.dump(tmp_path / "metrics.prom")
+
+    assert "test_requests_total 2" in (tmp_path / "metrics.prom").read_text()
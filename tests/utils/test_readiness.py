@@ -0,0 +1,64 @@
+from src.utils.readiness import FAILED, PENDING, READY, Readiness
+
+
+def test_ready_once_every_expected_component_is_warm():
+    readiness = Readiness()
+    readiness.expect(["embedding_model", "llm"])
+
+    assert readiness.check("embedding_model", lambda: [0.1, 0.2]) == [0.1, 0.2]
+    assert not readiness.ready
+    assert readiness.status()["components"]["llm"] == {"status": PENDING}
+
+    readiness.check("llm", lambda: "OK")
+    status = readiness.status()
+    assert status["ready"]
+    assert status["components"]["llm"]["status"] == READY
+    assert status["components"]["llm"]["seconds"] >= 0
+
+
+def test_failed_warm_up_is_reported_and_keeps_the_server_unready():
+    readiness = Readiness()
+    readiness.expect(["llm"])
+
+    def fail():
+        raise ConnectionError("connection refused")
+
+    assert readiness.check("llm", fail) is None
+    component = readiness.status()["components"]["llm"]
+    assert component["status"] == FAILED
+    assert component["error"] == "connection refused"
+    assert not readiness.ready
+
+
+def test_failed_warm_up_is_retried_until_it_succeeds():
+    readiness = Readiness()
+    readiness.expect(["embedding_model"])
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise TimeoutError("model still loading")
+        return [0.1]
+
+    readiness.check("embedding_model", flaky)
+    assert not readiness.retry_failed()
+
+    readiness.retry_until_ready(backoff=0, max_delay=0)
+    assert readiness.ready
+    assert len(attempts) == 3
+    assert readiness.retry_failed()
+
+
+def test_one_ready_member_of_a_group_is_enough():
+    readiness = Readiness()
+    readiness.expect(["llm:primary", "llm:backup"], group="llm")
+
+    def fail():
+        raise KeyError("BACKUP_API_KEY")
+
+    readiness.check("llm:backup", fail)
+    assert not readiness.ready
+    readiness.check("llm:primary", lambda: "OK")
+    assert readiness.ready
+    assert readiness.status()["components"]["llm:backup"]["status"] == FAILED
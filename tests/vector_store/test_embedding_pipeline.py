@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+from langchain_core.documents import Document
+
+from src.vector_store.embedding_pipeline import EmbeddingPipeline
+
+
+class FlakyEmbedding:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.batch_sizes = []
+        self.lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        with self.lock:
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("temporary failure")
+            self.batch_sizes.append(len(texts))
+        return [[float(len(text))] for text in texts]
+
+
+def make_items(count):
+    return ((f"id-{i}", Document(page_content="x" * i)) for i in range(count))
+
+
+def test_run_writes_every_item_in_batches():
+    embedding = FlakyEmbedding()
+    written = {}
+
+    def write_batch(ids, documents, vectors):
+        assert len(ids) == len(documents) == len(vectors)
+        written.update(zip(ids, vectors))
+
+    count = EmbeddingPipeline(embedding, batch_size=4, max_concurrency=2).run(make_items(10), write_batch)
+
+    assert count == 10
+    assert sorted(embedding.batch_sizes) == [2, 4, 4]
+    assert written["id-7"] == [7.0]
+
+
+def test_transient_failures_are_retried():
+    embedding = FlakyEmbedding(failures=2)
+    written = []
+
+    EmbeddingPipeline(embedding, batch_size=5, max_retries=2, retry_backoff=0).run(
+        make_items(5), lambda ids, documents, vectors: written.extend(ids),
+    )
+
+    assert len(written) == 5
+
+
+def test_failure_after_retries_is_raised():
+    embedding = FlakyEmbedding(failures=3)
+
+    with pytest.raises(ConnectionError):
+        EmbeddingPipeline(embedding, batch_size=5, max_retries=1, retry_backoff=0).run(
+            make_items(5), lambda ids, documents, vectors: None,
+        )
@@ -0,0 +1,63 @@
+import asyncio
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.vector_store.numpy_store import NumpyVectorStore
+
+TEXTS = ["1. Backstage", "2. DORA metrics", "3. Renovate", "4. Structured output"]
+METADATAS = [
+    {"quadrant": "Platforms", "ring": "Adopt", "volume": "31"},
+    {"quadrant": "Techniques", "ring": "Adopt", "volume": "32"},
+    {"quadrant": "Tools", "ring": "Trial", "volume": "32"},
+    {"quadrant": "Techniques", "ring": "Hold", "volume": "32"},
+]
+
+
+@pytest.fixture
+def embedding():
+    return DeterministicFakeEmbedding(size=16)
+
+
+@pytest.fixture
+def store(tmp_path, embedding):
+    ids = [f"chunk-{i}" for i in range(len(TEXTS))]
+    NumpyVectorStore.export(tmp_path, ids, TEXTS, METADATAS, embedding.embed_documents(TEXTS))
+    return NumpyVectorStore.load(tmp_path, embedding)
+
+
+def test_load_memory_maps_normalized_matrix(store):
+    assert isinstance(store.matrix, np.memmap)
+    assert store.matrix.dtype == np.float32
+    assert np.allclose(np.linalg.norm(store.matrix, axis=1), 1.0, atol=1e-5)
+
+
+def test_similarity_search_returns_exact_match_first(store):
+    results = store.similarity_search_with_score("3. Renovate", k=2)
+
+    assert results[0][0].page_content == "3. Renovate"
+    assert results[0][0].id == "chunk-2"
+    assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+    assert len(results) == 2
+
+
+def test_metadata_filters(store):
+    retriever = store.as_retriever(search_kwargs={"k": 4, "filter": {"$and": [{"quadrant": "Techniques"}, {"volume": "32"}]}})
+    assert sorted(doc.page_content for doc in retriever.invoke("anything")) == ["2. DORA metrics", "4. Structured output"]
+
+    docs = store.similarity_search("anything", k=4, filter={"ring": {"$in": ["Trial", "Hold"]}})
+    assert sorted(doc.metadata["ring"] for doc in docs) == ["Hold", "Trial"]
+
+
+def test_async_retriever(store):
+    docs = asyncio.run(store.as_retriever(search_kwargs={"k": 1}).ainvoke("1. Backstage"))
+    assert [doc.page_content for doc in docs] == ["1. Backstage"]
+
+
+def test_empty_index_returns_no_results(tmp_path, embedding):
+    NumpyVectorStore.export(tmp_path, [], [], [], [])
+    store = NumpyVectorStore.load(tmp_path, embedding)
+
+    assert store.similarity_search("1. Backstage", k=4, filter={"ring": "Adopt"}) == []
+    assert store.relevance_search_by_vectors(embedding.embed_documents(TEXTS[:2]), k=4) == [[], []]
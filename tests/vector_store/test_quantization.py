@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from src.vector_store.numpy_store import NumpyVectorStore
+from src.vector_store.quantization import ProductQuantizer, ScalarQuantizer, build_quantizer, load_quantizer
+
+
+@pytest.fixture
+def matrix():
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((2000, 32)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def recall(quantizer, matrix, k=10, shortlist=40):
+    queries = matrix[:20] + 0.1
+    hits = 0
+    for query in queries:
+        exact = set(np.argsort(-(matrix @ query))[:k])
+        hits += len(exact & set(np.argsort(-quantizer.scores(query))[:shortlist]))
+    return hits / (k * len(queries))
+
+
+@pytest.mark.parametrize(("kind", "minimum"), [("int8", 0.99), ("pq", 0.9)])
+def test_shortlist_from_codes_keeps_the_exact_neighbours(matrix, kind, minimum):
+    quantizer = build_quantizer(kind, matrix)
+
+    assert quantizer.nbytes < matrix.nbytes / 3
+    assert recall(quantizer, matrix) >= minimum
+
+
+def test_product_quantizer_uses_a_subspace_count_dividing_the_dimension(matrix):
+    quantizer = ProductQuantizer.fit(matrix[:, :30], subspaces=16)
+
+    assert quantizer.codebooks.shape[0] == 15
+    assert quantizer.codes.shape == (2000, 15)
+
+
+def test_unknown_quantization_is_rejected(matrix):
+    assert build_quantizer("none", matrix) is None
+    with pytest.raises(ValueError, match="Unsupported vector quantization"):
+        build_quantizer("binary", matrix)
+
+
+@pytest.mark.parametrize("kind", ["int8", "pq"])
+def test_quantized_store_rescores_the_shortlist_exactly(tmp_path, matrix, kind):
+    ids = [f"chunk-{i}" for i in range(len(matrix))]
+    texts = [f"text {i}" for i in range(len(matrix))]
+    metadatas = [{"volume": str(30 + i % 3)} for i in range(len(matrix))]
+    NumpyVectorStore.export(tmp_path, ids, texts, metadatas, matrix)
+    NumpyVectorStore.quantize(tmp_path, kind)
+    store = NumpyVectorStore.load(tmp_path, embedding=None)
+
+    assert load_quantizer(tmp_path).kind == kind
+    results = store.similarity_search_by_vector_with_score(matrix[7], k=3)
+    assert results[0][0].id == "chunk-7"
+    assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+
+    filtered = store.similarity_search_by_vector_with_score(matrix[7], k=3, filter={"volume": "30"})
+    assert all(doc.metadata["volume"] == "30" for doc, _ in filtered)
+
+
+def test_exporting_without_quantization_removes_stale_codes(tmp_path, matrix):
+    NumpyVectorStore.export(tmp_path, ["a", "b"], ["a", "b"], [{}, {}], matrix[:2])
+    NumpyVectorStore.quantize(tmp_path, "int8")
+    assert isinstance(load_quantizer(tmp_path), ScalarQuantizer)
+
+    NumpyVectorStore.export(tmp_path, ["a", "b"], ["a", "b"], [{}, {}], matrix[:2])
+    assert load_quantizer(tmp_path) is None
@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.vector_store.ingest_manifest import iter_chunk_ids
+from src.vector_store.sharded_store import ShardedVectorStore, volume_of
+from src.vector_store.vector_store import VectorStore
+
+INGEST_PARAMS = {"processor_type": "vector_basic", "chunk_size": 1000, "chunk_overlap": 200}
+
+
+def make_docs(volume, *contents):
+    source = f"data/tr_technology_radar_vol_{volume}_en.pdf"
+    return [Document(page_content=content, metadata={"source": source}) for content in contents]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ShardedVectorStore(
+        collection_name="test_shards",
+        persist_directory=str(tmp_path),
+        embedding_model=DeterministicFakeEmbedding(size=8),
+    )
+    store.source_directory = tmp_path
+    return store
+
+
+@pytest.fixture
+def radar_docs():
+    return make_docs("31", "1. Backstage", "2. DORA metrics") + make_docs("32", "1. Renovate", "2. Dagger")
+
+
+def test_volume_of_prefers_metadata_and_falls_back_to_file_name():
+    assert volume_of({"volume": "31", "source": "data/tr_technology_radar_vol_32_en.pdf"}) == "31"
+    assert volume_of({"source": "data/tr_technology_radar_vol_32_en.pdf"}) == "32"
+    assert volume_of({"source": "data/notes.pdf"}) == "other"
+
+
+def test_sync_builds_one_shard_per_volume(store, radar_docs):
+    store.sync(iter_chunk_ids(radar_docs, **INGEST_PARAMS), **INGEST_PARAMS)
+
+    assert store.volumes() == ["31", "32"]
+    assert store.shard("31").collection_name == "test_shards_vol_31"
+    assert len(store.shard("31").manifest.ids()) == 2
+    assert len(store.shard("32").manifest.ids()) == 2
+
+
+def test_adding_a_volume_leaves_other_shards_untouched(store, radar_docs):
+    store.sync(iter_chunk_ids(radar_docs, **INGEST_PARAMS), **INGEST_PARAMS)
+    versions = {volume: store.shard(volume).collection_version() for volume in store.volumes()}
+    collection_version = store.collection_version()
+
+    docs = radar_docs + make_docs("33", "1. Pulumi")
+    store.sync(iter_chunk_ids(docs, **INGEST_PARAMS), **INGEST_PARAMS)
+
+    assert store.volumes() == ["31", "32", "33"]
+    assert {volume: store.shard(volume).collection_version() for volume in ("31", "32")} == versions
+    assert store.collection_version() != collection_version
+
+
+def test_sync_drops_shards_of_removed_volumes(store, radar_docs):
+    store.sync(iter_chunk_ids(radar_docs, **INGEST_PARAMS), **INGEST_PARAMS)
+    store.sync(iter_chunk_ids(make_docs("32", "1. Renovate"), **INGEST_PARAMS), **INGEST_PARAMS)
+
+    assert store.volumes() == ["32"]
+    assert not store.shard("31").manifest.path.exists()
+    assert not store.shard("31").bm25_index_path.exists()
+
+
+def test_sync_keeps_shards_of_volumes_that_failed_to_load(store, tmp_path):
+    pdf = tmp_path / "tr_technology_radar_vol_31_en.pdf"
+    pdf.write_bytes(b"%PDF-1.7 radar")
+    docs = [Document(page_content="1. Backstage", metadata={"source": str(pdf)}), *make_docs("32", "1. Renovate")]
+    store.sync(iter_chunk_ids(docs, **INGEST_PARAMS), **INGEST_PARAMS)
+    store.sync(iter_chunk_ids(make_docs("32", "1. Renovate"), **INGEST_PARAMS), **INGEST_PARAMS)
+
+    assert store.volumes() == ["31", "32"]
+    assert len(store.shard("31").manifest.ids()) == 1
+
+
+def test_sync_rejects_volumes_that_are_not_contiguous(store):
+    docs = make_docs("31", "1. Backstage") + make_docs("32", "1. Renovate") + make_docs("31", "2. DORA metrics")
+    with pytest.raises(ValueError, match="not contiguous"):
+        store.sync(iter_chunk_ids(docs, **INGEST_PARAMS), **INGEST_PARAMS)
+
+
+@pytest.mark.parametrize("backend", [VectorStore.CHROMA, VectorStore.NUMPY])
+def test_retriever_merges_the_best_hits_across_shards(store, radar_docs, backend):
+    store.sync(iter_chunk_ids(radar_docs, **INGEST_PARAMS), **INGEST_PARAMS)
+    store.backend = backend
+    retriever = store.get_retriever(mode=VectorStore.VECTOR, k=3)
+
+    docs = retriever.invoke("1. Renovate")
+
+    assert len(docs) == 3
+    assert docs[0].page_content == "1. Renovate"
+    assert [doc.page_content for doc in asyncio.run(retriever.ainvoke("1. Renovate"))] == [
+        doc.page_content for doc in docs
+    ]
+
+
+@pytest.mark.parametrize("mode", [VectorStore.VECTOR, VectorStore.HYBRID])
+def test_retriever_routes_questions_naming_a_volume_to_its_shard(store, radar_docs, mode):
+    store.sync(iter_chunk_ids(radar_docs, **INGEST_PARAMS), **INGEST_PARAMS)
+    retriever = store.get_retriever(mode=mode, k=4)
+
+    assert retriever.route("What is Renovate in Vol 32?") == ["32"]
+    assert retriever.route("What is Renovate?") == ["31", "32"]
+    docs = retriever.invoke("What about Backstage in volume 31?")
+    assert {doc.page_content for doc in docs} == {"1. Backstage", "2. DORA metrics"}
+
+
+@pytest.mark.parametrize("backend", [VectorStore.CHROMA, VectorStore.NUMPY])
+def test_batch_search_matches_one_query_at_a_time(store, radar_docs, backend):
+    store.sync(iter_chunk_ids(radar_docs, **INGEST_PARAMS), **INGEST_PARAMS)
+    store.backend = backend
+    queries = ["1. Renovate", "2. DORA metrics", "1. Backstage"]
+
+    hits = store.relevance_search_by_vectors(store.embedding_model.embed_documents(queries), k=2)
+
+    assert [[doc.page_content for doc, _ in query_hits][0] for query_hits in hits] == queries
+    assert all(query_hits[0][1] >= query_hits[1][1] for query_hits in hits)
+    retriever = store.get_retriever(mode=VectorStore.VECTOR, k=2)
+    assert [[doc.id for doc, _ in query_hits] for query_hits in hits] == [
+        [doc.id for doc in retriever.invoke(query)] for query in queries
+    ]
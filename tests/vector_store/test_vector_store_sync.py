@@ -0,0 +1,187 @@
+import asyncio
+
+import pytest
+from unittest.mock import patch
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.vector_store.ingest_manifest import chunk_ids, iter_chunk_ids
+from src.vector_store.numpy_store import NumpyVectorStore
+from src.vector_store.vector_store import VectorStore
+
+INGEST_PARAMS = {"processor_type": "vector_basic", "chunk_size": 1000, "chunk_overlap": 200}
+
+
+class RecordingEmbedding(DeterministicFakeEmbedding):
+    embedded_texts: list = []
+
+    def embed_documents(self, texts):
+        self.embedded_texts.extend(texts)
+        return super().embed_documents(texts)
+
+
+def make_docs(*contents, source="data/tr_technology_radar_vol_32_en.pdf"):
+    return [Document(page_content=content, metadata={"source": source}) for content in contents]
+
+
+@pytest.fixture
+def store(tmp_path):
+    with patch('src.vector_store.vector_store.LLMModelManager') as mock_manager:
+        embedding = RecordingEmbedding(size=8, embedded_texts=[])
+        mock_manager.return_value.get_embedding_model.return_value = embedding
+        store = VectorStore(collection_name="test_sync", persist_directory=str(tmp_path))
+        store.source_directory = tmp_path
+        yield store
+
+
+def test_chunk_ids_are_stable_and_unique():
+    docs = make_docs("1. Backstage", "1. Backstage", "2. DORA metrics")
+    ids = chunk_ids(docs, **INGEST_PARAMS)
+    assert ids == chunk_ids(docs, **INGEST_PARAMS)
+    assert len(set(ids)) == 3
+    assert ids != chunk_ids(docs, processor_type="vector_with_metadata", chunk_size=1000, chunk_overlap=200)
+
+
+def test_sync_only_embeds_new_chunks_and_deletes_stale(store):
+    docs = make_docs("1. Backstage", "2. DORA metrics")
+    store.sync(iter_chunk_ids(docs, **INGEST_PARAMS), **INGEST_PARAMS)
+    version = store.collection_version()
+
+    updated_docs = make_docs("1. Backstage", "3. Renovate")
+    updated_ids = chunk_ids(updated_docs, **INGEST_PARAMS)
+    store.embedding_model.embedded_texts.clear()
+    db = store.sync(iter_chunk_ids(updated_docs, **INGEST_PARAMS), **INGEST_PARAMS)
+
+    assert store.embedding_model.embedded_texts == ["3. Renovate"]
+    assert sorted(db.get(include=[])["ids"]) == sorted(updated_ids)
+    assert store.collection_version() != version
+    assert store.manifest.ids() == set(updated_ids)
+
+
+def test_noop_sync_keeps_version(store):
+    docs = make_docs("1. Backstage")
+    store.sync(iter_chunk_ids(docs, **INGEST_PARAMS), **INGEST_PARAMS)
+    version = store.collection_version()
+
+    store.embedding_model.embedded_texts.clear()
+    store.sync(iter_chunk_ids(docs, **INGEST_PARAMS), **INGEST_PARAMS)
+
+    assert store.embedding_model.embedded_texts == []
+    assert store.collection_version() == version
+
+
+def test_sync_keeps_chunks_of_sources_that_failed_to_load(store, tmp_path):
+    loaded, failed = tmp_path / "tr_technology_radar_vol_31_en.pdf", tmp_path / "tr_technology_radar_vol_32_en.pdf"
+    loaded.write_bytes(b"%PDF-1.7 radar 31")
+    failed.write_bytes(b"%PDF-1.7 radar 32")
+    docs = make_docs("1. Backstage", source=str(loaded)) + make_docs("1. Renovate", source=str(failed))
+    store.sync(iter_chunk_ids(docs, **INGEST_PARAMS), **INGEST_PARAMS)
+
+    db = store.sync(iter_chunk_ids(docs[:1], **INGEST_PARAMS), **INGEST_PARAMS)
+    assert sorted(db.get(include=[])["ids"]) == sorted(chunk_ids(docs, **INGEST_PARAMS))
+    assert set(store.manifest.load()["sources"]) == {loaded.name, failed.name}
+
+    failed.unlink()
+    db = store.sync(iter_chunk_ids(docs[:1], **INGEST_PARAMS), **INGEST_PARAMS)
+    assert db.get(include=[])["ids"] == chunk_ids(docs[:1], **INGEST_PARAMS)
+    assert set(store.manifest.load()["sources"]) == {loaded.name}
+
+
+def test_chunk_ids_do_not_depend_on_where_the_files_are(store, tmp_path):
+    first, second = tmp_path / "checkout", tmp_path / "moved"
+    pdf_name = "tr_technology_radar_vol_32_en.pdf"
+    docs = make_docs("1. Backstage", "2. DORA metrics", source=str(first / pdf_name))
+    moved_docs = make_docs("1. Backstage", "2. DORA metrics", source=str(second / pdf_name))
+    assert chunk_ids(moved_docs, **INGEST_PARAMS) == chunk_ids(docs, **INGEST_PARAMS)
+
+    store.sync(iter_chunk_ids(docs, **INGEST_PARAMS), **INGEST_PARAMS)
+    store.embedding_model.embedded_texts.clear()
+    store.source_directory = second
+    db = store.sync(iter_chunk_ids(moved_docs, **INGEST_PARAMS), **INGEST_PARAMS)
+
+    assert store.embedding_model.embedded_texts == []
+    assert sorted(db.get(include=[])["ids"]) == sorted(chunk_ids(docs, **INGEST_PARAMS))
+
+
+def test_collection_version_rereads_manifest_only_when_it_changes(store, tmp_path):
+    docs = make_docs("1. Backstage")
+    store.sync(iter_chunk_ids(docs, **INGEST_PARAMS), **INGEST_PARAMS)
+    version = store.collection_version()
+
+    with patch.object(store.manifest, "load", wraps=store.manifest.load) as load:
+        assert store.collection_version() == version
+        assert load.call_count == 0
+
+    other = VectorStore(collection_name="test_sync", persist_directory=str(tmp_path))
+    other.sync(iter_chunk_ids(make_docs("3. Renovate"), **INGEST_PARAMS), **INGEST_PARAMS)
+
+    assert store.collection_version() == other.collection_version() != version
+
+
+def test_async_search_uses_async_query_embedding(store):
+    docs = make_docs("1. Backstage", "2. DORA metrics")
+    store.sync(iter_chunk_ids(docs, **INGEST_PARAMS), **INGEST_PARAMS)
+
+    results = asyncio.run(store.load().as_retriever(search_kwargs={"k": 1}).ainvoke("1. Backstage"))
+
+    assert [doc.page_content for doc in results] == ["1. Backstage"]
+
+
+def test_sync_exports_index_for_numpy_backend(store):
+    docs = make_docs("1. Backstage", "2. DORA metrics")
+    store.sync(iter_chunk_ids(docs, **INGEST_PARAMS), **INGEST_PARAMS)
+    store.backend = VectorStore.NUMPY
+
+    results = store.load().similarity_search("2. DORA metrics", k=1)
+
+    assert [doc.page_content for doc in results] == ["2. DORA metrics"]
+
+
+@pytest.mark.parametrize("seed", [VectorStore.create, VectorStore.sync])
+def test_seeding_a_numpy_backend_writes_through_chroma(store, seed):
+    store.backend = VectorStore.NUMPY
+    seed(store, iter_chunk_ids(make_docs("1. Backstage", "2. DORA metrics"), **INGEST_PARAMS), **INGEST_PARAMS)
+    store.sync(iter_chunk_ids(make_docs("1. Backstage", "3. Renovate"), **INGEST_PARAMS), **INGEST_PARAMS)
+
+    results = store.load().similarity_search("3. Renovate", k=1)
+
+    assert isinstance(store.load(), NumpyVectorStore)
+    assert [doc.page_content for doc in results] == ["3. Renovate"]
+
+
+def test_seeding_writes_only_the_configured_indexes(store):
+    with patch("src.vector_store.vector_store.RETRIEVAL_MODE", VectorStore.VECTOR):
+        store.sync(iter_chunk_ids(make_docs("1. Backstage"), **INGEST_PARAMS), **INGEST_PARAMS)
+
+    assert not store.numpy_index_directory.exists()
+    assert not store.bm25_index_path.exists()
+
+
+def test_incremental_sync_updates_the_indexes_without_rereading_the_collection(store):
+    store.backend = VectorStore.NUMPY
+    with patch("src.vector_store.vector_store.RETRIEVAL_MODE", VectorStore.HYBRID):
+        store.sync(iter_chunk_ids(make_docs("1. Backstage", "2. DORA metrics"), **INGEST_PARAMS), **INGEST_PARAMS)
+        with patch.object(store, "export_indexes", side_effect=AssertionError("collection re-read")):
+            db = store.sync(iter_chunk_ids(make_docs("1. Backstage", "3. Renovate"), **INGEST_PARAMS), **INGEST_PARAMS)
+
+    stored_ids = sorted(db.get(include=[])["ids"])
+    assert sorted(store.load().ids) == stored_ids
+    assert sorted(store.bm25_index().ids) == stored_ids
+    assert [doc.page_content for doc in store.load().similarity_search("1. Backstage", k=1)] == ["1. Backstage"]
+    assert [doc.page_content for doc, _ in store.bm25_index().search("Renovate", k=1)] == ["3. Renovate"]
+
+
+def test_sync_records_sources_from_a_generator(store):
+    docs = make_docs(*(f"{i}. Blip {i}" for i in range(1, 6)))
+    consumed = []
+
+    def produce():
+        for chunk_id, doc in iter_chunk_ids(docs, **INGEST_PARAMS):
+            consumed.append(chunk_id)
+            yield chunk_id, doc
+
+    store.sync(produce(), **INGEST_PARAMS)
+
+    assert len(consumed) == 5
+    assert store.manifest.ids() == set(consumed)
+    assert store.manifest.load()["chunk_count"] == 5